@@ -1,5 +1,4 @@
-__all__ = ["dictionary"]
+__all__ = ["dictionary", "async_dictionary", "pipeline", "validate", "export"]
 
 from src.dict.dictionary import Dictionary
-
-
+from src.dict.async_dictionary import AsyncDictionary
@@ -0,0 +1,192 @@
+import asyncio
+import concurrent.futures
+import typing
+
+import src.dict.dictionary as dc
+
+
+class AsyncDictionary:
+    """
+    Asyncio facade of a Dictionary for event loop based services
+
+    Long queries, i.e. batches, multisegments and searches, run in a bounded executor, so that they do not
+    block the event loop. Identical long queries that are in flight at the same time are computed
+    once and every caller gets its own copy of the result. At most max_pending distinct queries
+    are submitted to the executor, further callers wait for a free slot. Single word queries take
+    microseconds, less than a switch to an executor thread, so they run directly in the event loop
+    unless offload_all is set or a modification of the dictionary is in progress.
+
+    The synchronous API of the wrapped dictionary stays available as AsyncDictionary.dictionary.
+
+        Args:
+            dictionary (Dictionary): wrapped dictionary
+            max_workers (int): number of executor threads, queries hold the GIL, so more than one
+                               thread only helps when they are mixed with blocking I/O
+            max_pending (int): maximal number of distinct queries submitted to the executor at once
+            executor (concurrent.futures.Executor): executor used instead of an own thread pool,
+                                                    it is not shut down by close
+            offload_all (bool): run single word queries in the executor as well
+
+        Attributes:
+            requests (int): number of awaited queries
+            coalesced (int): number of queries answered by an identical query that was already in flight
+    """
+
+    def __init__(self, dictionary, max_workers=1, max_pending=64, executor=None, offload_all=False):
+        if max_pending <= 0:
+            raise ValueError("Number of pending queries must be positive, got {}".format(max_pending))
+
+        self.dictionary = dictionary
+        self.own_executor = executor is None
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers) if executor is None else executor
+        self.max_pending = max_pending
+        self.pending = asyncio.Semaphore(max_pending)
+        self.offload_all = offload_all
+        self.modifying = 0
+        self.in_flight = {}
+        self.requests = 0
+        self.coalesced = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Function that shuts down the own executor, waiting for submitted queries
+        """
+        if self.own_executor:
+            self.executor.shutdown(wait=True)
+
+    async def __run__(self, method, *args):
+        async with self.pending:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, method, *args)
+
+    async def __query__(self, name, *args):
+        """
+        Function that runs a query of the wrapped dictionary, joining an identical query in flight
+
+            Args:
+                name (str): name of the Dictionary method
+                args: hashable arguments of the method
+
+            Returns:
+                result: copy of the result of the method
+        """
+        self.requests += 1
+        key = (name,) + args
+        future = self.in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self.__run__(getattr(self.dictionary, name), *args))
+            self.in_flight[key] = future
+            future.add_done_callback(lambda done: self.__forget__(key, done))
+        else:
+            self.coalesced += 1
+        return dc.copy_result(await asyncio.shield(future))
+
+    def __forget__(self, key, future):
+        if self.in_flight.get(key) is future:
+            del self.in_flight[key]
+
+    async def __short_query__(self, name, *args):
+        if self.offload_all or self.modifying:
+            return await self.__query__(name, *args)
+        self.requests += 1
+        return getattr(self.dictionary, name)(*args)
+
+    async def __modify__(self, name, *args):
+        # queries awaited after a modification must not join the ones started before it
+        self.requests += 1
+        self.in_flight.clear()
+        self.modifying += 1
+        try:
+            return await self.__run__(getattr(self.dictionary, name), *args)
+        finally:
+            self.modifying -= 1
+
+    def stats(self):
+        """
+        Function that returns counters of the facade
+
+            Returns:
+                stats (dict): awaited and coalesced queries, distinct queries in flight and their limit
+        """
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "in_flight": len(self.in_flight),
+            "max_pending": self.max_pending,
+        }
+
+    async def get_parent(self, word: str) -> (str, str, typing.Sequence[str]):
+        return await self.__short_query__("get_parent", word)
+
+    async def get_children(self, word: str) -> typing.List[str]:
+        return await self.__short_query__("get_children", word)
+
+    async def get_parent_many(self, words: typing.Iterable[str], infinitives=False) -> typing.List[tuple]:
+        parents = await self.__query__("get_parent_many", tuple(words), infinitives)
+        return [dc.copy_result(parent) for parent in parents]
+
+    async def get_children_many(self, words: typing.Iterable[str]) -> typing.List[typing.List[str]]:
+        children = await self.__query__("get_children_many", tuple(words))
+        return [dc.copy_result(forms) for forms in children]
+
+    async def complete(self, prefix: str, limit=10, lemmas_only=False) -> typing.List[tuple]:
+        completions = await self.__query__("complete", prefix, limit, lemmas_only)
+        return [dc.copy_result(completion) for completion in completions]
+
+    async def find_similar(self, word: str, max_distance=1, limit=10) -> typing.List[tuple]:
+        similar = await self.__query__("find_similar", word, max_distance, limit)
+        return [dc.copy_result(form) for form in similar]
+
+    async def get_form(self, word: str, case=None, gender=None) -> typing.List[str]:
+        return await self.__short_query__("get_form", word, case, gender)
+
+    async def find_forms(self, case=None, gender=None, limit=None) -> typing.List[tuple]:
+        return await self.__query__("find_forms", case, gender, limit)
+
+    async def get_parent_multisegmented(self, multi_word):
+        return await self.__query__("get_parent_multisegmented", multi_word)
+
+    async def get_children_multisegmented(self, multi_word):
+        return await self.__query__("get_children_multisegmented", multi_word)
+
+    async def get_word_by_relationship(self, relationship_name, word):
+        return await self.__short_query__("get_word_by_relationship", relationship_name, word)
+
+    async def get_all_relationships(self):
+        return await self.__short_query__("get_all_relationships")
+
+    async def add_multisegmented(self, files):
+        await self.__modify__("add_multisegmented", files)
+
+    async def add_gradation_relationship(self, file):
+        await self.__modify__("add_gradation_relationship", file)
+
+    async def add_im_norm_relationship(self, file):
+        await self.__modify__("add_im_norm_relationship", file)
+
+    async def add_generic_relationship(self, file, relationship_name):
+        await self.__modify__("add_generic_relationship", file, relationship_name)
+
+    async def pin_paradigms(self, words):
+        return await self.__modify__("pin_paradigms", tuple(words))
+
+    async def add_lexeme(self, line):
+        await self.__modify__("add_lexeme", line)
+
+    async def remove_lexeme(self, infinitive, label=None):
+        await self.__modify__("remove_lexeme", infinitive, label)
+
+    async def update_lexeme(self, line):
+        await self.__modify__("update_lexeme", line)
+
+    async def dump(self, f, output_format="sgjp", relationships=True):
+        return await self.__run__(self.dictionary.dump, f, output_format, relationships)
+
+    async def compact(self):
+        # compaction builds without the lock, but publishing the result takes it for writing
+        await self.__modify__("compact")
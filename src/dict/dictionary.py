@@ -1,11 +1,523 @@
 import marisa_trie
+import array
 import codecs
 import typing
-import itertools
 import src.dict.subclasses.graph as gr
 import src.dict.subclasses.multisegmented as mlt
 import src.dict.subclasses.exceptions as ex
+import src.dict.subclasses.storage as st
+import src.dict.subclasses.cache as ch
+import src.dict.subclasses.locks as lk
+import src.dict.subclasses.overlay as ov
+import src.dict.subclasses.search as sr
+import src.dict.subclasses.paradigms as pr
+import src.dict.subclasses.metrics as mt
+import src.dict.subclasses.parser as ps
+import src.dict.subclasses.writers as wr
+from time import perf_counter
+import concurrent.futures
+import functools
+import itertools
+import math
+import os
 import pickle
+import struct
+
+# approximate number of bytes of a basic file parsed by a single worker of a parallel build
+SHARD_SIZE = 1 << 22
+
+# struct formats available for the packed ids, from the narrowest one
+ID_FORMATS = ["<H", "<I", "<Q"]
+ID_TYPECODES = {"<H": "H", "<I": "I", "<Q": "Q"}
+
+
+def select_id_format(forms_count: int) -> str:
+    """
+    Function that returns the narrowest id format able to address all word forms,
+    and their number, which ends the packed offsets of the forms
+
+        Args:
+            forms_count (int): number of word forms in the dictionary
+
+        Returns:
+            id_format (str): struct format of a single packed id
+    """
+    for id_format in ID_FORMATS:
+        if forms_count < 1 << (8 * struct.calcsize(id_format)):
+            return id_format
+    raise OverflowError("Too many word forms: {}".format(forms_count))
+
+
+def modifies_dictionary(method):
+    """
+    Decorator of Dictionary methods that change data returned by queries,
+    holds the write lock of the dictionary and clears the result cache
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        metrics = self.metrics
+        start = perf_counter() if metrics is not None else None
+        self.lock.acquire_write()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            if self.cache is not None:
+                self.cache.clear()
+            self.lock.release_write()
+            if metrics is not None:
+                metrics.observe_call(method.__name__, perf_counter() - start)
+
+    return wrapper
+
+
+def reads_dictionary(method):
+    """
+    Decorator of Dictionary methods that only read its data, holds the read lock of the dictionary
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        metrics = self.metrics
+        start = perf_counter() if metrics is not None else None
+        self.lock.acquire_read()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.lock.release_read()
+            if metrics is not None:
+                metrics.observe_call(method.__name__, perf_counter() - start)
+
+    return wrapper
+
+
+def copy_result(result):
+    """
+    Function that copies lists in a query result, so that cached results cannot be modified by callers
+    """
+    if isinstance(result, list):
+        return list(result)
+    if isinstance(result, tuple):
+        return tuple(list(item) if isinstance(item, list) else item for item in result)
+    return result
+
+
+# lines of basic files are parsed and checked by the parser module
+parse_line = ps.parse_line
+
+
+class RelationshipEdges:
+    """
+    Edges of a relationship collected before they are added to the graph at once
+
+        Attributes:
+            sources (array): first vertex of every edge
+            targets (array): second vertex of every edge
+    """
+
+    def __init__(self):
+        self.sources = array.array("q")
+        self.targets = array.array("q")
+
+    def extend(self, from_v, to_vs):
+        self.sources.extend(itertools.repeat(from_v, len(to_vs)))
+        self.targets.extend(to_vs)
+
+
+def read_relationship_file(file):
+    """
+    Function that reads a relationship file line by line, skipping blank lines
+
+        Args:
+            file (str): name of the file with words separated with colons, every line ends with a colon
+
+        Returns:
+            lines (generator([str])): stripped words of every line
+    """
+    with open(file, "r", encoding="utf8") as f:
+        for line in f:
+            if line.isspace():
+                continue
+            words = line.split(":")[:-1]
+            if " " in line or "\t" in line:
+                words = [word.strip() for word in words]
+            yield words
+
+
+class LexemeBuffer:
+    """
+    Compact, single pass representation of the basic files used to build a Dictionary
+
+        Attributes:
+            keys ([str]): all word forms, position in this list is the positional id of the form
+            slots (array): position of every form in its line, 0 for an infinitive
+            labels ([str]): distinct flexographic labels
+            label_ids (array): index in labels of every lexeme
+            sizes (array): number of forms of every lexeme
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.slots = array.array("H")
+        self.labels = []
+        self.label_ids = array.array("H")
+        self.sizes = array.array("H")
+        self.__label_index__ = {}
+
+    def add_line(self, line):
+        infinitive, label, derivatives = ps.parse_line(line)
+        self.add_lexeme(infinitive, label, derivatives)
+
+    def add_lines(self, lines, file=None, first_line=1):
+        """
+        Function that adds lines of a basic file, skipping blank lines
+
+            Raises:
+                Parse_error: malformed line, with its location
+        """
+        for infinitive, label, derivatives in ps.parse_lines(lines, file, first_line):
+            self.add_lexeme(infinitive, label, derivatives)
+
+    def add_lexeme(self, infinitive, label, derivatives):
+        if label not in self.__label_index__:
+            self.__label_index__[label] = len(self.labels)
+            self.labels.append(label)
+
+        self.keys.append(infinitive)
+        self.slots.append(0)
+        size = 1
+        for slot, derivative in enumerate(derivatives, 1):
+            if derivative != "##" and derivative != "#":
+                self.keys.append(derivative)
+                self.slots.append(slot)
+                size += 1
+
+        self.label_ids.append(self.__label_index__[label])
+        self.sizes.append(size)
+
+    def add_slots(self, label, forms, slots):
+        """
+        Function that adds a lexeme given by its forms and their positions in the line
+
+            Args:
+                label (str): flexographic label
+                forms ([str]): infinitive followed by the present derivatives
+                slots ([int]): position of every form in its line, 0 for the infinitive
+
+            Returns:
+                None
+        """
+        if label not in self.__label_index__:
+            self.__label_index__[label] = len(self.labels)
+            self.labels.append(label)
+
+        self.keys += forms
+        self.slots += array.array("H", slots)
+        self.label_ids.append(self.__label_index__[label])
+        self.sizes.append(len(forms))
+
+    def extend(self, other):
+        """
+        Function that appends lexemes of another buffer after the lexemes of this one
+
+            Args:
+                other (LexemeBuffer): buffer with the following lines of the basic files
+
+            Returns:
+                None
+        """
+        for label in other.labels:
+            if label not in self.__label_index__:
+                self.__label_index__[label] = len(self.labels)
+                self.labels.append(label)
+        label_map = [self.__label_index__[label] for label in other.labels]
+
+        self.keys += other.keys
+        self.slots += other.slots
+        self.label_ids += array.array("H", [label_map[label_id] for label_id in other.label_ids])
+        self.sizes += other.sizes
+
+    def __len__(self):
+        return len(self.sizes)
+
+
+CASES = [case for case in gr.Cases]
+GENDERS = [gender for gender in gr.Genders]
+
+
+def inflection_members(gender, case):
+    """
+    Function that converts names of a gender and a case into members of gr.Genders and gr.Cases
+
+        Args:
+            gender (gr.Genders or str): gender or its name, e.g. "FEMININE", None for any
+            case (gr.Cases or str): case or its name, e.g. "GENITIVE", None for any
+
+        Raises:
+            ValueError: unknown name
+
+        Returns:
+            gender (gr.Genders): gender or None
+            case (gr.Cases): case or None
+    """
+    try:
+        if isinstance(gender, str):
+            gender = gr.Genders[gender.upper()]
+        if isinstance(case, str):
+            case = gr.Cases[case.upper()]
+    except KeyError as error:
+        raise ValueError("Unknown gender or case {}".format(error))
+    return gender, case
+
+
+def add_lexeme_vertices(word_graph, lexem_id, label, slots):
+    """
+    Function that adds vertices and edges of a single lexeme to a graph
+
+        Args:
+            word_graph (gr.CompactGraph or gr.Graph): graph with free ids lexem_id..lexem_id + len(slots)
+            lexem_id (int): id of the infinitive, the derivatives get the following ids
+            label (str): flexographic label
+            slots (iterable(int)): position of every derivative in its line
+
+        Returns:
+            None
+    """
+    word_type = label.strip("*")[0]
+    has_gender = word_type in ["A", "C", "D"]
+
+    gender_parent_id = lexem_id
+    if has_gender:
+        word_graph.add_gender_vertex(lexem_id, label, CASES[0], GENDERS[0])
+    else:
+        word_graph.add_vertex(lexem_id, label)
+
+    for word_id, slot in enumerate(slots, lexem_id + 1):
+        if has_gender:
+            if word_type in ["C", "D"] and slot > 34:
+                continue
+
+            word_graph.add_gender_vertex(word_id, None, CASES[slot % 7], GENDERS[slot // 7])
+            if slot % 7 == 0:
+                gender_parent_id = word_id
+            else:
+                word_graph.add_gender_edge(gender_parent_id, word_id)
+        else:
+            word_graph.add_vertex(word_id, None)
+
+        word_graph.add_edge(lexem_id, word_id)
+
+
+def lexeme_template(label, slots):
+    """
+    Function that builds the vertices and edges of a lexeme with a given label and slots of derivatives once,
+    to be shared by all such lexemes
+
+        Args:
+            label (str): flexographic label
+            slots (tuple(int)): position of every derivative in its line
+
+        Returns:
+            template (gr.ParadigmTemplate): template of the lexeme
+    """
+    template_graph = gr.CompactGraph(len(slots) + 1)
+    add_lexeme_vertices(template_graph, 0, label, slots)
+    return gr.ParadigmTemplate.from_graph(label, slots, template_graph)
+
+
+def join_agreeing_forms(segments):
+    """
+    Function that aligns forms of the segments of a multisegment by their gender and case
+
+    Rows follow the forms of the inflected segment with the most forms, every other inflected segment gives
+    its form with the same gender and case. Rows with a gender and case missing in any inflected segment
+    are left out.
+
+        Args:
+            segments (list): id of every segment that is not inflected, the (offset, index) of its gender
+                             children from gr.gender_children_by_inflection otherwise
+
+        Returns:
+            rows ([[int]]): id of a form of every segment, in the order of the forms of the longest segment
+    """
+    indexes = [(position, segment) for position, segment in enumerate(segments) if isinstance(segment, tuple)]
+    if not indexes:
+        return [list(segments)]
+
+    _, driver = max((segment for _, segment in indexes),
+                    key=lambda segment: sum(map(len, segment[1].values())))
+    rows = []
+    for inflection, forms in driver.items():
+        for occurrence, driver_position in enumerate(forms):
+            single_form = list(segments)
+            for position, (offset, index) in indexes:
+                agreeing = index.get(inflection)
+                if agreeing is None:
+                    break
+                single_form[position] = offset + agreeing[occurrence % len(agreeing)]
+            else:
+                rows.append((driver_position, single_form))
+    # positions of the driver are distinct, the forms are never compared
+    rows.sort()
+    return [single_form for _, single_form in rows]
+
+
+def build_graph(lexemes):
+    """
+    Function that builds the graph of parsed lexemes over their positional ids
+
+        Args:
+            lexemes (LexemeBuffer): parsed lines of the basic files
+
+        Returns:
+            word_graph (gr.TemplateGraph): graph with a vertex for every form of every lexeme
+    """
+    word_graph = gr.TemplateGraph()
+
+    slots = lexemes.slots
+    lexem_id = 0
+    for label_id, size in zip(lexemes.label_ids, lexemes.sizes):
+        label, lexeme_slots = lexemes.labels[label_id], tuple(slots[lexem_id + 1:lexem_id + size])
+        template_id = word_graph.template_id(label, lexeme_slots)
+        if template_id is None:
+            template_id = word_graph.add_template(lexeme_template(label, lexeme_slots))
+        word_graph.add_lexeme(template_id)
+        lexem_id += size
+    return word_graph
+
+
+def build_tries(keys, id_format=None):
+    """
+    Function that builds the trie and the packed mappings between positional ids and trie key ids
+
+        Args:
+            keys ([str]): all word forms in the order of their positional ids
+            id_format (str): struct format of the packed ids, by default the narrowest one that fits
+
+        Raises:
+            OverflowError: id_format is too narrow to address all word forms
+
+        Returns:
+            id_format (str): struct format of the packed ids
+            trie (marisa_trie.Trie): all distinct word forms
+            key_ids (array): trie key id of every word form, indexed by its positional id
+            form_offsets (array): form_ids[form_offsets[key_id]:form_offsets[key_id + 1]] are the ids of a key
+            form_ids (array): positional ids grouped by trie key id, in the order of the keys
+    """
+    if id_format is None:
+        id_format = select_id_format(len(keys))
+    elif len(keys) >= 1 << (8 * struct.calcsize(id_format)):
+        raise OverflowError("Id format {} cannot address {} word forms".format(id_format, len(keys)))
+
+    typecode = ID_TYPECODES[id_format]
+    trie = marisa_trie.Trie(keys)
+    key_ids = array.array(typecode, map(trie.key_id, keys))
+
+    counts = [0] * (len(trie) + 1)
+    for key_id in key_ids:
+        counts[key_id + 1] += 1
+    for key_id in range(len(trie)):
+        counts[key_id + 1] += counts[key_id]
+    form_offsets = array.array(typecode, counts)
+
+    form_ids = array.array(typecode, bytes(key_ids.itemsize * len(keys)))
+    fill = counts[:-1]
+    for form_id, key_id in enumerate(key_ids):
+        form_ids[fill[key_id]] = form_id
+        fill[key_id] += 1
+    return id_format, trie, key_ids, form_offsets, form_ids
+
+
+def split_into_shards(file, shard_size):
+    """
+    Function that splits a basic file into byte ranges made of whole lines
+
+        Args:
+            file (str): name of the basic file
+            shard_size (int): approximate number of bytes in a range
+
+        Returns:
+            shards ([(str, int, int)]): file name, first byte and end of every range, in the order of the file
+    """
+    shards = []
+    with open(file, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        start = 0
+        while start < file_size:
+            f.seek(min(start + shard_size, file_size))
+            f.readline()
+            end = min(f.tell(), file_size)
+            shards.append((file, start, end))
+            start = end
+    return shards
+
+
+def build_shard(shard):
+    """
+    Function that parses a byte range of a basic file and builds its graph, run by the workers of a parallel build
+
+        Args:
+            shard ((str, int, int)): file name, first byte and end of the range
+
+        Raises:
+            Parse_error: malformed line, with its line number in the file
+
+        Returns:
+            lexemes (LexemeBuffer): parsed lines of the range
+            word_graph (gr.TemplateGraph): graph of the range over ids counted from the beginning of the range
+    """
+    file, start, end = shard
+    with open(file, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    lexemes = LexemeBuffer()
+    try:
+        lexemes.add_lines(data.decode("utf8").splitlines(True), file)
+    except ex.Parse_error as error:
+        # numbers of lines before the range are counted only when they are reported
+        raise ex.Parse_error(error.message, file, error.line_number + ps.line_number_at(file, start) - 1) from None
+    return lexemes, build_graph(lexemes)
+
+
+def read_basic_files(basic_files, workers=None, shard_size=SHARD_SIZE, metrics=None):
+    """
+    Function that parses basic files and builds their graph, optionally in parallel
+
+    A parallel build splits the files into shards of whole lines, every worker parses a shard and builds
+    its graph, then the shards are concatenated in the order of the files, so the result is the same
+    as the one of a sequential build.
+
+        Args:
+            basic_files ([str]): names of the basic files
+            workers (int): number of worker processes, None or 1 builds everything in this process
+            shard_size (int): approximate number of bytes handled by a worker at once
+            metrics (mt.Metrics): records the times of the "parse" and "graph" phases, or of the "shards"
+                                  phase of a parallel build, None records nothing
+
+        Raises:
+            Parse_error: malformed line of a basic file, see ps.validate to find all of them at once
+
+        Returns:
+            lexemes (LexemeBuffer): parsed lines of all files, in the order of the files
+            word_graph (gr.TemplateGraph): graph over the positional ids of the forms
+    """
+    lexemes = LexemeBuffer()
+    if workers is None or workers <= 1:
+        with mt.phase(metrics, "parse"):
+            for file in basic_files:
+                with codecs.open(file, "r", encoding="utf8") as openned_file:
+                    lexemes.add_lines(openned_file, file)
+        with mt.phase(metrics, "graph"):
+            return lexemes, build_graph(lexemes)
+
+    word_graph = gr.TemplateGraph()
+    shards = [shard for file in basic_files for shard in split_into_shards(file, shard_size)]
+    with mt.phase(metrics, "shards"), concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for shard_lexemes, shard_graph in executor.map(build_shard, shards):
+            lexemes.extend(shard_lexemes)
+            word_graph.extend(shard_graph)
+    return lexemes, word_graph
 
 
 class Dictionary:
@@ -32,111 +544,305 @@ class Dictionary:
                                 <derivatives separeted with colon> are word forms arranged in a fixed order
                                                                    depending on the part of speech that is
                                                                    defined by the first letter of the label.
+            id_format (str): struct format of the packed ids ("<H", "<I" or "<Q"),
+                             by default the narrowest one that fits the number of word forms
+            cache_size (int): number of results of get_parent, get_children and get_word_by_relationship
+                              kept in the result cache, 0 disables the cache
+            cache_policy (str): eviction policy of the result cache, "lru" or "fifo"
+            workers (int): number of processes parsing the basic files and building their graph, by default
+                           everything is built in the current process; the result does not depend on it
+            instrument (bool): record call counts, latencies and build phase times, see enable_metrics
 
         Attributes:
-            multisegmented (mlt.multisegmented_module):
+            multisegmented (mlt.multisegmented_module): multisegments indexed by the ids of their segments
             lexical_relationships (dict):
-            main_trie (marisa_trie.RecordTrie):
-            reverse_trie (marisa_trie.Trie):
-            translation_array ([int]):
-            word_graph (gr.Graph):
+            trie (marisa_trie.Trie): all distinct word forms
+            key_ids (array): trie key id of every word form, indexed by its positional id
+            form_offsets (array): form_ids[form_offsets[key_id]:form_offsets[key_id + 1]] are the ids of a key
+            form_ids (array): positional ids grouped by trie key id, in the order of the basic files
+            alphabet (str): characters of the word forms, used by find_similar
+            word_graph (gr.TemplateGraph or ov.Overlay): static graph, or the overlay over it
+                                                         after lexemes were added or removed
+            overlay (ov.Overlay): lexemes added or removed since the last build, None if there are none
+            paradigms (pr.ParadigmStore): pre-joined derivatives of infinitives chosen by pin_paradigms or None
+            cache (ch.ResultCache): result cache or None
+            metrics (mt.Metrics): recorded instrumentation or None if it is disabled
+            lock (lk.ReadersWriterLock): lock of the data changed by add_* and remove_* methods
+
+        Concurrency:
+            Any number of threads can query the dictionary at once. Methods that add or remove lexemes,
+            multisegments or relationships hold the lock for writing and queries hold it for reading,
+            so every query sees the dictionary either before or after a whole change.
     """
 
-    def __init__(self, basic_files):
+    def __init__(self, basic_files, id_format=None, cache_size=0, cache_policy="lru", workers=None, instrument=False):
+        self.multisegmented = mlt.multisegmented_module()
+        self.lexical_relationships = {}
+        self.overlay = None
+        self.paradigms = None
+        self.cache = ch.ResultCache(cache_size, cache_policy) if cache_size else None
+        self.metrics = mt.Metrics() if instrument else None
+        self.lock = lk.ReadersWriterLock()
+
         try:
-            self.multisegmented = mlt.multisegmented_module()
-            keys = []
-            values = []
-            last_index = 0
-            for file in basic_files:
-                with codecs.open(file, "r", encoding="utf8") as openned_file:
-                    new_keys = []
-                    for line in openned_file:
-                        line_split = line.split(":")
-                        if line_split[1].strip("* \t")[0] in ["C", "D"]:
-                            line_split = [line_split[0]] + line_split[3:9] + line_split[16:-3]
-                        else:
-                            line_split = [line_split[0]] + line_split[3:-1]
-                        new_keys += [token.strip() for token in line_split
-                                     if token.strip() != "##" and token.strip() != "#"]
-
-                    keys += new_keys
-                    values += [(current_index + last_index,) for current_index in range(len(new_keys))]
-                    last_index += len(new_keys)
-
-            content_format = "<H"
-            self.lexical_relationships = {}
-            self.main_trie = marisa_trie.RecordTrie(content_format, zip(keys, values))
-            self.reverse_trie = marisa_trie.Trie(keys)
-            self.translation_array = [-1 for i in range(len(keys))]
+            lexemes, self.word_graph = read_basic_files(basic_files, workers, metrics=self.metrics)
         except FileNotFoundError:
             print("File not found")
             raise
 
-        self.word_graph = gr.Graph()
-        shift_dict = {}
-        cases = [case for case in gr.Cases]
-        genders = [gender for gender in gr.Genders]
-
-        for file in basic_files:
-            with codecs.open(file, "r", encoding="utf8") as openned_file:
-                for line in openned_file.readlines():
-                    line_split = line.split(":")
-                    if line_split[1].strip("* \t")[0] in ["C", "D"]:
-                        line_split = line_split[0:2] + line_split[3:9] + line_split[16:-3]
-                    else:
-                        line_split = line_split[0:2] + line_split[3:-1]
-                    tmp = [x.strip() for x in line_split]
-
-                    trie_main_id = self.main_trie.get(tmp[0])[0][0]
-
-                    if trie_main_id not in shift_dict:
-                        shift_dict[trie_main_id] = 0
-
-                    lexem_id = self.main_trie[tmp[0]][shift_dict[trie_main_id]][0]
-                    shift_dict[trie_main_id] += 1
-
-                    word_type = tmp[1].strip("*")[0]
-                    gender_parent_id = None
-
-                    if word_type in ["A", "C", "D"]:
-                        self.word_graph.add_gender_vertex(lexem_id, tmp[1], cases[0], genders[0])
-                        gender_parent_id = lexem_id
-                    else:
-                        self.word_graph.add_vertex(lexem_id, tmp[1])
-
-                    self.translation_array[lexem_id] = self.reverse_trie[tmp[0]]
-
-                    for idx, word in enumerate(tmp[2:]):
-                        if word != "##" and word != "#":
-                            trie_main_id = self.main_trie.get(word)[0][0]
-                            if trie_main_id not in shift_dict:
-                                shift_dict[trie_main_id] = 0
-
-                            child_id = self.main_trie.get(word)[shift_dict[trie_main_id]][0]
-                            shift_dict[trie_main_id] += 1
-
-                            if word_type in ["A", "C", "D"]:
-                                if word_type in ["C", "D"] and idx + 1 > 34:
-                                    continue
-
-                                self.word_graph.add_gender_vertex(child_id, None, cases[(idx + 1) % 7],
-                                                                  genders[(idx + 1) // 7])
-                                if (idx + 1) % 7 == 0:
-                                    gender_parent_id = child_id
-                                else:
-                                    self.word_graph.add_gender_edge(gender_parent_id, child_id)
-                            else:
-                                self.word_graph.add_vertex(child_id, None)
-
-                            self.word_graph.add_edge(lexem_id, child_id)
-                            self.translation_array[child_id] = self.reverse_trie[word]
+        with mt.phase(self.metrics, "tries"):
+            self.id_format, self.trie, self.key_ids, self.form_offsets, self.form_ids = build_tries(lexemes.keys,
+                                                                                                  id_format)
+            self.alphabet = sr.alphabet(lexemes.keys)
+
+    @reads_dictionary
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop("__mapping__", None)
+        state.pop("lock")
+        for name in ["key_ids", "form_offsets", "form_ids"]:
+            state[name] = st.to_array(state[name])
+        return state
+
+    def __setstate__(self, state):
+        state.setdefault("metrics", None)
+        self.__dict__.update(state)
+        self.lock = lk.ReadersWriterLock()
+
+    def __ids__(self, word):
+        """
+        Function that returns positional ids of all occurrences of a word form
+
+            Args:
+                word (str): word form
+
+            Returns:
+                ids ([int]): ids in the order of the basic files, None if the word is unknown
+        """
+        start = perf_counter() if self.metrics is not None else None
+        key_id = self.trie.get(word)
+        if self.overlay is not None:
+            base_ids = [] if key_id is None else list(self.form_ids[self.form_offsets[key_id]:
+                                                                     self.form_offsets[key_id + 1]])
+            ids = self.overlay.ids(word, base_ids)
+        elif key_id is None:
+            ids = None
+        else:
+            ids = list(self.form_ids[self.form_offsets[key_id]:self.form_offsets[key_id + 1]])
+
+        if start is not None:
+            self.metrics.observe_step("trie_lookup", start)
+        return ids
+
+    def __word__(self, word_id):
+        """
+        Function that returns the word form with a given positional id
+
+            Args:
+                word_id (int): positional id
+
+            Returns:
+                word (str): word form
+        """
+        start = perf_counter() if self.metrics is not None else None
+        if word_id >= len(self.key_ids):
+            word = self.overlay.word(word_id)
+        else:
+            word = self.trie.restore_key(self.key_ids[word_id])
+
+        if start is not None:
+            self.metrics.observe_step("decode", start)
+        return word
+
+    def __distinct_words__(self, ids):
+        """
+        Function that returns word forms of positional ids without repetitions
+
+            Args:
+                ids (iterable(int)): positional ids
+
+            Returns:
+                words ([str]): word forms, those of the static dictionary first
+        """
+        start = perf_counter() if self.metrics is not None else None
+        ids = list(ids)
+        base_size = len(self.key_ids)
+        words = [self.trie.restore_key(key_id) for key_id in {self.key_ids[x] for x in ids if x < base_size}]
+        for word in [self.overlay.word(x) for x in ids if x >= base_size]:
+            if word not in words:
+                words.append(word)
+
+        if start is not None:
+            self.metrics.observe_step("decode", start, len(words))
+        return words
+
+    def save(self, path: str):
+        """
+        Function that stores the dictionary in a directory in the memory-mappable format read by open
+
+        Lexemes added or removed since the last build are compacted first.
+
+            Args:
+                path (str): Name of the directory, created if it does not exist
+
+            Returns:
+                None
+        """
+        self.compact()
+        while not self.__save__(path):
+            self.compact()
+
+    @reads_dictionary
+    def __save__(self, path):
+        if self.overlay is not None:
+            return False
+
+        os.makedirs(path, exist_ok=True)
+        self.trie.save(os.path.join(path, "forms.marisa"))
+
+        buffers, graph_meta = self.word_graph.to_buffers()
+        buffers["key_ids"] = self.key_ids
+        buffers["form_offsets"] = self.form_offsets
+        buffers["form_ids"] = self.form_ids
+        if self.paradigms is not None:
+            buffers.update(self.paradigms.to_buffers())
+            self.paradigms.save(path)
+        multisegmented_buffers, multisegmented = self.multisegmented.to_buffers()
+        buffers.update(multisegmented_buffers)
+        layout = st.write_arrays(path, buffers)
+
+        st.write_meta(path, {
+            "id_format": self.id_format,
+            "alphabet": self.alphabet,
+            "layout": layout,
+            "graph": graph_meta,
+            "lexical_relationships": self.lexical_relationships,
+            "multisegmented": multisegmented,
+            "paradigms": self.paradigms is not None,
+        })
+        return True
+
+    @classmethod
+    def open(cls, path: str, cache_size=0, cache_policy="lru", instrument=False):
+        """
+        Function that memory-maps a dictionary stored by save
+
+        The trie and arrays are not copied into the process, so the pages are shared between
+        all processes that open the same directory and only the pages used by queries are read.
+        Relationships are decoded per vertex when they are queried and multisegments are searched
+        in the mapped arrays.
+
+            Args:
+                path (str): Name of the directory with the stored dictionary
+                cache_size (int): number of results kept in the result cache, 0 disables the cache
+                cache_policy (str): eviction policy of the result cache, "lru" or "fifo"
+                instrument (bool): record call counts and latencies, see enable_metrics
+
+            Raises:
+                Unsupported_format: directory does not contain a dictionary in the current format
+
+            Returns:
+                dictionary (Dictionary): Dictionary backed by the stored files
+        """
+        start = perf_counter()
+        meta = st.read_meta(path)
+        mapping, buffers = st.map_arrays(path, meta["layout"])
+
+        dictionary = cls.__new__(cls)
+        dictionary.__mapping__ = mapping
+        dictionary.cache = ch.ResultCache(cache_size, cache_policy) if cache_size else None
+        dictionary.metrics = None
+        dictionary.lock = lk.ReadersWriterLock()
+        dictionary.id_format = meta["id_format"]
+        dictionary.trie = marisa_trie.Trie().mmap(os.path.join(path, "forms.marisa"))
+        dictionary.key_ids = buffers["key_ids"]
+        dictionary.form_offsets = buffers["form_offsets"]
+        dictionary.form_ids = buffers["form_ids"]
+        if "alphabet" in meta:
+            dictionary.alphabet = meta["alphabet"]
+        else:
+            dictionary.alphabet = sr.alphabet(dictionary.trie.iterkeys())
+        dictionary.word_graph = gr.TemplateGraph.from_buffers(buffers, meta["graph"])
+        dictionary.lexical_relationships = meta["lexical_relationships"]
+        dictionary.overlay = None
+        dictionary.paradigms = pr.ParadigmStore.open(path, buffers) if meta.get("paradigms") else None
+        dictionary.multisegmented = mlt.multisegmented_module.from_buffers(buffers, meta["multisegmented"])
+        if instrument:
+            dictionary.enable_metrics()
+            dictionary.metrics.add_phase("open", perf_counter() - start)
+        return dictionary
 
     def __eq__(self, other):
-        return self.main_trie == other.main_trie \
-               and self.reverse_trie == other.reverse_trie \
-               and self.translation_array == other.translation_array
+        return self.trie == other.trie and self.key_ids == other.key_ids
+
+    def __cached_query__(self, key, query, *args):
+        """
+        Function that returns the result of a query from the result cache, computing it on a miss
+
+            Args:
+                key (tuple): name of the query and its arguments
+                query (callable): function computing the result
+                args: arguments of query
+
+            Returns:
+                result: copy of the cached result
+        """
+        found, result = self.cache.get(key)
+        if not found:
+            result = query(*args)
+            self.cache.put(key, result)
+        return copy_result(result)
+
+    def cache_stats(self):
+        """
+        Function that returns counters of the result cache
+
+            Returns:
+                stats (dict): hits, misses, evictions, invalidations and hit rate, None if the cache is disabled
+        """
+        return None if self.cache is None else self.cache.stats()
+
+    def enable_metrics(self):
+        """
+        Function that starts recording call counts, latencies, query steps and multisegment candidates
+
+        While disabled, instrumentation costs a comparison per call. Steps are the trie lookups ("trie_lookup")
+        and the decoding of positional ids into word forms ("decode"), the rest of a call is spent in the graph.
+        Enabling twice keeps the recorded values.
+
+            Returns:
+                metrics (mt.Metrics): recorded instrumentation
+        """
+        if self.metrics is None:
+            self.metrics = mt.Metrics()
+        return self.metrics
 
+    def disable_metrics(self):
+        self.metrics = None
+
+    def metrics_stats(self):
+        """
+        Function that returns the recorded instrumentation
+
+            Returns:
+                stats (dict): calls, steps, multisegment candidates and build phases, see mt.Metrics.to_dict,
+                              None if instrumentation is disabled
+        """
+        return None if self.metrics is None else self.metrics.to_dict()
+
+    def metrics_text(self, prefix="dictionary"):
+        """
+        Function that returns the recorded instrumentation in the Prometheus text exposition format
+
+            Args:
+                prefix (str): prefix of the metric names
+
+            Returns:
+                text (str): metrics, None if instrumentation is disabled
+        """
+        return None if self.metrics is None else self.metrics.to_prometheus(prefix)
+
+    @reads_dictionary
     def get_parent(self, word: str) -> (str, str, typing.Sequence[str]):
         """
         Function that returns an infinitive of a word
@@ -149,20 +855,45 @@ class Dictionary:
                 flexographic_labels (str): Sequence of capital letters, optionally with an asterisk at the beginning
                 possible_matches ():
         """
-        word_id = self.main_trie.get(word)[0][0]
-        check_also = [x[0] for x in self.main_trie.get(word)[1:]]
+        if self.cache is not None:
+            return self.__cached_query__(("get_parent", word), self.__get_parent__, word)
+        return self.__get_parent__(word)
 
-        parent_id = self.word_graph.get_parent(word_id)
+    def __get_parent__(self, word):
+        ids = self.__ids__(word)
+        if ids is None:
+            raise ex.Key_Missing(word)
+        return self.__parent_of_ids__(ids, {})
+
+    def __parent_of_ids__(self, ids, decoded_parents, infinitives=False):
+        """
+        Function that returns the result of get_parent for positional ids of a word
+
+            Args:
+                ids ([int]): positional ids of all occurrences of the word
+                decoded_parents (dict): parent id -> (infinitive, label), filled and reused between calls
+                infinitives (bool): return an infinitive itself instead of (None, None, None)
+
+            Returns:
+                infinitive (str): Infinitive of word
+                flexographic_labels (str): Sequence of capital letters, optionally with an asterisk at the beginning
+                possible_matches ():
+        """
+        parent_id = self.word_graph.get_parent(ids[0])
         if parent_id is None:
-            return None, None, None
+            if not infinitives or self.word_graph.get_label(ids[0]) is None:
+                return None, None, None
+            parent_id = ids[0]
 
-        parent_word_id = self.translation_array[parent_id]
-        parents = {self.word_graph.get_parent(x) for x in check_also}
-        possible_ids = {self.translation_array[x] for x in parents if x != parent_id}
-        possible_matches = [self.reverse_trie.restore_key(x) for x in possible_ids]
+        parents = {self.word_graph.get_parent(x) for x in ids[1:]}
+        possible_matches = self.__distinct_words__(x for x in parents if x != parent_id and x is not None)
 
-        return self.reverse_trie.restore_key(parent_word_id), self.word_graph.get_label(parent_id), possible_matches
+        if parent_id not in decoded_parents:
+            decoded_parents[parent_id] = (self.__word__(parent_id), self.word_graph.get_label(parent_id))
+        infinitive, label = decoded_parents[parent_id]
+        return infinitive, label, possible_matches
 
+    @reads_dictionary
     def get_children(self, word: str) -> typing.List[str]:
         """
         Function that returns all known derivatives of a word
@@ -173,66 +904,318 @@ class Dictionary:
             Returns:
                 children_strings ([str]): Array of derivatives of a given word
         """
-
-        word_id = self.main_trie.get(word)[0][0]
+        if self.cache is not None:
+            return self.__cached_query__(("get_children", word), self.__get_children__, word)
+        return self.__get_children__(word)
+
+    def __get_children__(self, word):
+        if self.paradigms is not None and self.overlay is None:
+            forms = self.paradigms.get(word)
+            if forms is not None:
+                return forms
+        ids = self.__ids__(word)
+        if ids is None:
+            raise ex.Key_Missing(word)
+        return self.__children_of_id__(ids[0])
+
+    def __children_of_id__(self, word_id):
         children = self.word_graph.get_children(word_id)
 
         if children is None:
             return None
-        children_strings = []
-        for child in children:
-            child_word_id = self.translation_array[child]
-            children_strings.append(self.reverse_trie.restore_key(child_word_id))
+        if self.overlay is not None:
+            return [self.__word__(child) for child in children]
+
+        start = perf_counter() if self.metrics is not None else None
+        restore_key, key_ids = self.trie.restore_key, self.key_ids
+        words = [restore_key(key_ids[child]) for child in children]
+        if start is not None:
+            self.metrics.observe_step("decode", start, len(words))
+        return words
+
+    @reads_dictionary
+    def get_parent_many(self, words: typing.Iterable[str], infinitives=False) -> typing.List[tuple]:
+        """
+        Function that returns infinitives of many words at once
+
+        Every distinct word is looked up once and every infinitive is decoded once per call,
+        so repeated words share the same result tuple.
+
+            Args:
+                words (iterable(str)): derivatives, e.g. tokens of a document
+                infinitives (bool): return an infinitive with its own label instead of (None, None, None),
+                                    as needed to lemmatize a text
+
+            Returns:
+                parents ([tuple]): get_parent result for every word, (None, None, None) for unknown words
+        """
+        results = {}
+        decoded_parents = {}
+        parents = []
+        for word in words:
+            result = results.get(word)
+            if result is None:
+                ids = self.__ids__(word)
+                result = (None, None, None) if ids is None else self.__parent_of_ids__(ids, decoded_parents,
+                                                                                        infinitives)
+                results[word] = result
+            parents.append(result)
+        return parents
+
+    @reads_dictionary
+    def get_children_many(self, words: typing.Iterable[str]) -> typing.List[typing.List[str]]:
+        """
+        Function that returns derivatives of many words at once
+
+        Every distinct word is looked up once, so repeated words share the same result list.
+
+            Args:
+                words (iterable(str)): infinitives
+
+            Returns:
+                children ([[str]]): get_children result for every word, None for unknown words
+        """
+        results = {}
+        children = []
+        for word in words:
+            if word not in results:
+                results[word] = self.__get_children_or_none__(word)
+            children.append(results[word])
+        return children
+
+    def __get_children_or_none__(self, word):
+        try:
+            return self.__get_children__(word)
+        except ex.Key_Missing:
+            return None
+
+    @reads_dictionary
+    def get_form(self, word: str, case=None, gender=None) -> typing.List[str]:
+        """
+        Function that returns forms of an infinitive with a given case and gender
+
+        Case and gender are the ones assigned by the graph, see get_inflection,
+        forms of words without gender never match.
+
+            Args:
+                word (str): infinitive
+                case (gr.Cases or str): case or its name, None for any
+                gender (gr.Genders or str): gender or its name, None for any
+
+            Raises:
+                Key_Missing: word is not an infinitive
+                ValueError: unknown name of a case or gender
+
+            Returns:
+                forms ([str]): matching forms of every lexeme of the infinitive, in the order of the basic files
+        """
+        gender, case = inflection_members(gender, case)
+        lexem_ids = [word_id for word_id in self.__ids__(word) or [] if self.word_graph.get_label(word_id) is not None]
+        if not lexem_ids:
+            raise ex.Key_Missing(word)
 
-        return children_strings
+        return [self.__word__(word_id) for lexem_id in lexem_ids
+                for word_id in self.word_graph.get_lexeme_vertices_with_inflection(lexem_id, gender, case)]
 
+    @reads_dictionary
+    def find_forms(self, case=None, gender=None, limit=None) -> typing.List[tuple]:
+        """
+        Function that returns all forms with a given case and gender
+
+        Forms are taken from an index of the packed inflections, so the time depends on the number
+        of returned forms, not on the size of the dictionary.
+
+            Args:
+                case (gr.Cases or str): case or its name, None for any
+                gender (gr.Genders or str): gender or its name, None for any
+                limit (int): maximal number of returned forms, None for all
+
+            Raises:
+                ValueError: unknown name of a case or gender
+
+            Returns:
+                forms ([(str, str, str)]): form, its infinitive and label, ordered by gender, case and
+                                           the order of the basic files, added lexemes last
+        """
+        gender, case = inflection_members(gender, case)
+        forms = []
+        for word_id in itertools.islice(self.word_graph.get_vertices_with_inflection(gender, case), limit):
+            lexem_id = word_id
+            if self.word_graph.get_label(word_id) is None:
+                lexem_id = self.word_graph.get_parent(word_id)
+            forms.append((self.__word__(word_id), self.__word__(lexem_id), self.word_graph.get_label(lexem_id)))
+        return forms
+
+    @modifies_dictionary
+    def pin_paradigms(self, words: typing.Iterable[str]):
+        """
+        Function that keeps derivatives of chosen infinitives, e.g. the most frequently queried ones,
+        as pre-joined strings, so that get_children and get_children_many do not decode them form by form
+
+        The stored paradigms are saved with the dictionary. They are not used while lexemes added
+        or removed since the last build are not compacted, compact stores them again.
+
+            Args:
+                words (iterable(str)): infinitives, unknown words and words without derivatives are skipped
+
+            Returns:
+                count (int): number of stored paradigms
+        """
+        paradigms = {}
+        if self.paradigms is not None:
+            paradigms = {word: self.paradigms.get(word) for word in self.paradigms.words()}
+        for word in words:
+            if word not in paradigms:
+                forms = self.__get_children_or_none__(word)
+                if forms is not None:
+                    paradigms[word] = forms
+        self.paradigms = pr.ParadigmStore(paradigms) if paradigms else None
+        return len(paradigms)
+
+    @reads_dictionary
+    def complete(self, prefix: str, limit=10, lemmas_only=False) -> typing.List[tuple]:
+        """
+        Function that returns word forms starting with a prefix, the shortest ones first
+
+            Args:
+                prefix (str): beginning of the word forms, e.g. typed by a user
+                limit (int): maximal number of returned word forms
+                lemmas_only (bool): return only infinitives
+
+            Returns:
+                completions ([tuple]): word form followed by its get_parent result for every completion,
+                                       ordered by length and then alphabetically; for lemmas_only
+                                       the infinitive is the form itself, the label is the one of its
+                                       first lexeme and possible_matches has the form once more if
+                                       other lexemes have the same infinitive
+        """
+        forms = self.trie.keys(prefix)
+        if self.overlay is not None:
+            forms += [form for form in self.overlay.forms if form.startswith(prefix) and form not in self.trie]
+
+        completions = []
+        decoded_parents = {}
+        for form in sr.shortest_first(forms):
+            if len(completions) >= limit:
+                break
+            ids = self.__ids__(form)
+            if ids is None:
+                # all occurrences were removed
+                continue
+            if not lemmas_only:
+                completions.append((form,) + self.__parent_of_ids__(ids, decoded_parents))
+                continue
+            lexem_ids = [x for x in ids if self.word_graph.get_label(x) is not None]
+            if lexem_ids:
+                completions.append((form, form, self.word_graph.get_label(lexem_ids[0]),
+                                    self.__distinct_words__(lexem_ids[1:])))
+        return completions
+
+    @reads_dictionary
+    def find_similar(self, word: str, max_distance=1, limit=10) -> typing.List[tuple]:
+        """
+        Function that returns word forms within a Levenshtein distance of a word, e.g. to correct OCR errors
+
+        The trie is walked only along prefixes that can still lead to a close enough form,
+        so the time depends on the length of the word and max_distance, not on the size of the dictionary;
+        it grows quickly with max_distance, which should be kept small.
+
+            Args:
+                word (str): misspelled word
+                max_distance (int): maximal number of inserted, deleted or substituted characters
+                limit (int): maximal number of returned word forms
+
+            Raises:
+                ValueError: max_distance is negative
+
+            Returns:
+                similar ([tuple]): word form and its distance to word followed by its get_parent result
+                                   for every close form, the closest ones first, then alphabetically
+        """
+        if max_distance < 0:
+            raise ValueError("Distance must not be negative, got {}".format(max_distance))
+
+        candidates = sr.similar_keys(self.trie, word, max_distance, self.alphabet)
+        if self.overlay is not None:
+            for form in self.overlay.forms:
+                if form not in self.trie and abs(len(form) - len(word)) <= max_distance:
+                    form_distance = sr.distance(form, word)
+                    if form_distance <= max_distance:
+                        candidates.append((form, form_distance))
+
+        similar = []
+        decoded_parents = {}
+        for form, form_distance in sorted(candidates, key=lambda candidate: (candidate[1], candidate[0])):
+            if len(similar) >= limit:
+                break
+            ids = self.__ids__(form)
+            if ids is not None:
+                similar.append((form, form_distance) + self.__parent_of_ids__(ids, decoded_parents))
+        return similar
+
+    def __segment_ids__(self, words, stable_list, segment_ids):
+        """
+        Function that returns the id of every segment of a multisegment, the first occurrence of a stable word
+        and the first infinitive with gender of an inflected one
+
+            Args:
+                words ([str]): segments
+                stable_list ([bool]): True for every segment that is not inflected
+                segment_ids (dict): (word, stable) -> id of the segments already looked up, filled by this function
+
+            Raises:
+                Key_Missing: word not present in the dictionary, or an inflected word without an infinitive with gender
+
+            Returns:
+                ids (tuple(int)): id of every segment
+        """
+        ids = []
+        for word, stable in zip(words, stable_list):
+            segment_id = segment_ids.get((word, stable))
+            if segment_id is None:
+                possible_ids = self.__ids__(word)
+                if possible_ids is None:
+                    raise ex.Key_Missing(word)
+                for word_id in possible_ids:
+                    if stable or (self.word_graph.has_gender(word_id)
+                                  and self.word_graph.get_gender_parent(word_id) is None):
+                        segment_id = segment_ids[(word, stable)] = word_id
+                        break
+                else:
+                    raise ex.Key_Missing(word)
+            ids.append(segment_id)
+        return tuple(ids)
+
+    @modifies_dictionary
     def add_multisegmented(self, files):
         """
         Function that adds multisegment to dictionary
 
+        All files are read before anything is added, a file with an error adds no multisegments.
+        The multisegments are indexed at once, together with the ones added before.
+
             Args:
                 files ([str]): Array of files names with multisegments
+
+            Raises:
+                Parse_error: malformed line, with its location
+                Key_Missing: word of a multisegment not present in the dictionary
+
+            Returns:
+                None
         """
+        multisegments = []
+        segment_ids = {}
         for file in files:
             with open(file, "r", encoding="utf8") as f:
-                for line in f.readlines():
-                    tokens = [x.strip() for x in line.split(";")[:-1]]
-
-                    interchangeable = None
-                    if tokens[3] != "":
-                        interchangeable = [int(tokens[3][0]), int(tokens[3][1])]
-
-                    stable_list = []
-                    for char in tokens[1]:
-                        if char == "*":
-                            stable_list.append(False)
-                        if char == "-":
-                            stable_list.append(True)
-
-                    segment = tokens[0].strip("# ").split(" ")
-                    segment_lst = []
-                    index = 0
-                    for word in segment:
-                        if "*" in word:
-                            continue
-
-                        possible_ids = self.main_trie.get(word, default=None)
-                        if possible_ids is None:
-                            raise ex.Key_Missing
-
-                        for word_id in possible_ids:
-                            if not stable_list[index] and (
-                                    not self.word_graph.has_gender(word_id[0]) or self.word_graph.get_gender_parent(
-                                word_id[0]) is not None):
-                                continue
-                            segment_lst.append(word_id[0])
-                            break
-                        if len(segment_lst) == 0 or (segment_lst[-1],) not in possible_ids:
-                            raise ex.Key_Missing
-
-                    key_tuple = tuple(segment_lst)
-                    self.multisegmented.add_multisegmented(key_tuple, stable_list, interchangeable)
+                for words, stable_list, interchangeable in ps.parse_multisegmented_lines(f, file):
+                    multisegments.append((self.__segment_ids__(words, stable_list, segment_ids), stable_list,
+                                          interchangeable))
+
+        self.multisegmented.add_multisegmented_many(multisegments)
+        self.multisegmented.build()
 
+    @reads_dictionary
     def get_parent_multisegmented(self, multi_word):
         """
         Function that returns infinitive of multisegment
@@ -243,95 +1226,87 @@ class Dictionary:
 
         possible_ids_list = []
         for word in multi_word.split():
-            possible_ids = self.main_trie.get(word, default=None)
+            possible_ids = self.__ids__(word)
 
             if possible_ids is None:
                 raise ex.Key_Missing
 
-            parents = {self.word_graph.get_gender_parent(word_id[0]) for word_id
-                       in possible_ids if self.word_graph.has_gender(word_id[0])}
-            parents.update({word_id[0] for word_id
-                            in possible_ids if not self.word_graph.has_gender(word_id[0])})
+            parents = {self.word_graph.get_gender_parent(word_id) for word_id
+                       in possible_ids if self.word_graph.has_gender(word_id)}
+            parents.update({word_id for word_id
+                            in possible_ids if not self.word_graph.has_gender(word_id)})
             possible_ids_list.append(parents)
 
-        all_combinations = itertools.product(*possible_ids_list)
-        for combination in all_combinations:
-            if self.multisegmented.is_multisegmented(combination):
-                translated_ids = [self.translation_array[x] for x in combination]
-                return " ".join([self.reverse_trie.restore_key(x) for x in
-                                 translated_ids]), self.multisegmented.get_multitsegmented_info(combination)
+        if self.metrics is not None:
+            self.metrics.observe_candidates("get_parent_multisegmented", math.prod(map(len, possible_ids_list)))
+        combination, info = self.multisegmented.find_multisegmented_info(possible_ids_list)
+        if combination is not None:
+            return " ".join([self.__word__(x) for x in combination]), info
 
+    @reads_dictionary
     def get_children_multisegmented(self, multi_word):
         """
         Function that returns infinitive of multisegment
 
+        Inflected segments are joined by gender and case, see join_agreeing_forms.
+
             Args:
                 multi_word ([str]): Array of words in multisegment
         """
 
         possible_ids_list = []
         for word in multi_word.split():
-            possible_ids = self.main_trie.get(word, default=None)
+            possible_ids = self.__ids__(word)
 
             if possible_ids is None:
                 raise ex.Key_Missing
 
-            parents = ({word_id[0] for word_id in possible_ids
-                        if self.word_graph.has_gender(word_id[0]) and self.word_graph.get_gender_parent(
-                    word_id[0]) is None})
-            parents.update({word_id[0] for word_id in possible_ids
-                            if not self.word_graph.has_gender(word_id[0]) and self.word_graph.get_parent(
-                    word_id[0]) is None})
+            parents = {word_id for word_id in possible_ids
+                       if (self.word_graph.get_gender_parent(word_id) if self.word_graph.has_gender(word_id)
+                           else self.word_graph.get_parent(word_id)) is None}
 
             possible_ids_list.append(parents)
 
-        all_combinations = itertools.product(*possible_ids_list)
-        for combination in all_combinations:
-            if self.multisegmented.is_multisegmented(combination):
-                possible_forms = []
-                stable = self.multisegmented.get_multitsegmented_info(combination)[0]
-
-
-                for combination_position,word_id in enumerate(combination):
-                    if stable[combination_position]:
-                        possible_forms.append([word_id])
-                    else:
-                        possible_forms.append(self.word_graph.get_gender_children(word_id))
-
-                children_forms = []
-
-                for index in range(max([len(id_list) for id_list in possible_forms])):
-                    single_form = []
-                    current_flexion = None
-                    for position, current_possible_id_list in enumerate(possible_forms):
-                        if not stable[position]:
-                            current = current_possible_id_list[index % len(current_possible_id_list)]
-                            if current_flexion is None:
-                                single_form.append(current)
-                            else:
-                                num = index
-                                while self.word_graph.get_inflection(current) != current_flexion:
-                                    num += 1
-                                    current = current_possible_id_list[num % len(current_possible_id_list)]
-                                    if num == max([len(id_list) for id_list in possible_forms]):
-                                        break
-                                single_form.append(current)
-                        else:
-                            single_form.append(current_possible_id_list[index % len(current_possible_id_list)])
-
-                    children_forms.append(single_form)
-
-                translated_ids = [[self.translation_array[x] for x in combination] for combination in children_forms]
-
-                interchangeable = self.multisegmented.get_multitsegmented_info(combination)[1]
-                if interchangeable:
-                    changed_ids = [child.copy() for child in translated_ids]
-                    for list in changed_ids:
-                        list[interchangeable[0]-1],list[interchangeable[1]-1] = list[interchangeable[1]-1],list[interchangeable[0]-1]
-                    translated_ids += changed_ids
-
-                return [" ".join([self.reverse_trie.restore_key(x) for x in translated_ids_item]) for translated_ids_item in translated_ids]
+        if self.metrics is not None:
+            self.metrics.observe_candidates("get_children_multisegmented", math.prod(map(len, possible_ids_list)))
+        combination, info = self.multisegmented.find_multisegmented_info(possible_ids_list)
+        if combination is not None:
+            stable, interchangeable = info
+            segments = []
+            for combination_position, word_id in enumerate(combination):
+                offset, index = (0, None) if stable[combination_position] else (
+                    self.word_graph.get_gender_children_by_inflection(word_id))
+                segments.append(word_id if index is None else (offset, index))
+            children_forms = join_agreeing_forms(segments)
+
+            translated_ids = [[self.__word__(x) for x in combination] for combination in children_forms]
+
+            if interchangeable:
+                changed_ids = [child.copy() for child in translated_ids]
+                for list in changed_ids:
+                    list[interchangeable[0]-1],list[interchangeable[1]-1] = list[interchangeable[1]-1],list[interchangeable[0]-1]
+                translated_ids += changed_ids
+
+            return [" ".join(translated_ids_item) for translated_ids_item in translated_ids]
+
+    @reads_dictionary
+    def get_multisegmented_starts(self):
+        """
+        Function that returns word forms that can begin a multisegment found by get_parent_multisegmented
 
+            Returns:
+                words (set(str)): first words of the multisegments, empty if no multisegments were added
+                length (int): number of words of the longest multisegment
+        """
+        words = set()
+        for segment_id in self.multisegmented.first_segments():
+            if self.word_graph.has_gender(segment_id):
+                words.update(self.__word__(x) for x in self.word_graph.get_gender_children(segment_id) or [])
+            else:
+                words.add(self.__word__(segment_id))
+        return words, self.multisegmented.max_length()
+
+    @reads_dictionary
     def get_all_relationships(self):
         """
         Function that returns all relationships name present in dictionary
@@ -364,6 +1339,45 @@ class Dictionary:
             max_ind = 0
         self.lexical_relationships[relationship_name] = max_ind + 1
 
+    def __first_ids__(self, words, first_ids):
+        """
+        Function that returns the first positional id of every word, as used by relationships
+
+            Args:
+                words ([str]): word forms
+                first_ids (dict): word -> first id of the words already looked up, filled by this function
+
+            Raises:
+                Key_Missing: word not present in the dictionary
+
+            Returns:
+                ids ([int]): first id of every word
+        """
+        ids = list(map(first_ids.get, words))
+        if None in ids:
+            for position, word in enumerate(words):
+                if ids[position] is None:
+                    word_ids = self.__ids__(word)
+                    if word_ids is None:
+                        raise ex.Key_Missing(word)
+                    ids[position] = first_ids[word] = word_ids[0]
+        return ids
+
+    def __add_relationship_edges__(self, edges):
+        """
+        Function that adds edges of relationships read from a file, indexing every relationship once
+
+            Args:
+                edges (dict): relationship name -> RelationshipEdges
+
+            Returns:
+                None
+        """
+        for relationship_name, relationship_edges in edges.items():
+            self.word_graph.add_relationship_edges(self.lexical_relationships[relationship_name],
+                                                   relationship_edges.sources, relationship_edges.targets)
+
+    @modifies_dictionary
     def add_gradation_relationship(self, file):
         """
         Function that adds gradation relationship
@@ -381,29 +1395,19 @@ class Dictionary:
 
         # hr - stands for 2 degree of gradation
         # hst - stands for 3 degree of gradation
+        edges = {"hr": RelationshipEdges(), "hst": RelationshipEdges()}
+        first_ids = {}
+        for words in read_relationship_file(file):
+            eq_degree, hr_degree, hst_degree = self.__first_ids__(words[:3], first_ids)
+            edges["hr"].extend(eq_degree, [hr_degree])
+            edges["hst"].extend(eq_degree, [hst_degree])
+
         if "hr" not in self.lexical_relationships.keys():
             self.__add_new_relationship__("hr")
             self.__add_new_relationship__("hst")
+        self.__add_relationship_edges__(edges)
 
-        with codecs.open(file, "r", encoding="utf8") as f:
-            for line in f.readlines():
-                words = [word.strip() for word in line.split(":")[:-1]]
-
-                eq_degree = self.main_trie.get(words[0])[0]
-                if eq_degree is None:
-                    raise ex.Key_Missing
-
-                hr_degree = self.main_trie.get(words[1])[0]
-                if hr_degree is None:
-                    raise ex.Key_Missing
-
-                hst_degree = self.main_trie.get(words[2])[0]
-                if hst_degree is None:
-                    raise ex.Key_Missing
-
-                self.word_graph.add_relationship_edge(eq_degree[0], hr_degree[0], self.lexical_relationships["hr"])
-                self.word_graph.add_relationship_edge(eq_degree[0], hst_degree[0], self.lexical_relationships["hst"])
-
+    @modifies_dictionary
     def add_im_norm_relationship(self, file):
         """
         Function that adds gradation relationship
@@ -420,32 +1424,26 @@ class Dictionary:
         rel_name = "imieslow"
         rel2_name = "rzeczownik"
 
+        edges = {rel_name: RelationshipEdges(), rel2_name: RelationshipEdges()}
+        first_ids = {}
+        for words in read_relationship_file(file):
+            root_id, = self.__first_ids__(words[:1], first_ids)
+            edges[rel_name].extend(root_id, self.__first_ids__([word for word in words[2:-1]
+                                                                 if word != "#" and word != "*"], first_ids))
+
+            # nouns missing from the dictionary are skipped
+            noun_ids = self.__ids__(words[-1])
+            if noun_ids is not None:
+                edges[rel2_name].extend(root_id, noun_ids[:1])
+
         if rel_name not in self.lexical_relationships.keys():
             self.__add_new_relationship__(rel_name)
 
         if rel2_name not in self.lexical_relationships.keys():
             self.__add_new_relationship__(rel2_name)
+        self.__add_relationship_edges__(edges)
 
-        with codecs.open(file, "r", encoding="utf8") as f:
-            for line in f.readlines():
-                words = [word.strip() for word in line.split(":")[:-1]]
-                root_id = self.main_trie.get(words[0])[0][0]
-
-                for word in words[2:-1]:
-                    if word != "#" and word != "*":
-                        try:
-                            other_id = self.main_trie.get(word)[0][0]
-                            self.word_graph.add_relationship_edge(root_id, other_id,
-                                                                  self.lexical_relationships[rel_name])
-                        except:
-                            raise ex.Key_Missing(word)
-
-                try:
-                    noun_id = self.main_trie.get(words[-1])[0][0]
-                    self.word_graph.add_relationship_edge(root_id, noun_id, self.lexical_relationships[rel2_name])
-                except:
-                    ex.Key_Missing(words[-1])
-
+    @modifies_dictionary
     def add_generic_relationship(self, file, relationship_name):
         """
         Function that adds gradation relationship
@@ -460,19 +1458,17 @@ class Dictionary:
                 None
         """
 
+        edges = RelationshipEdges()
+        first_ids = {}
+        for words in read_relationship_file(file):
+            root_id, = self.__first_ids__(words[:1], first_ids)
+            edges.extend(root_id, self.__first_ids__([word for word in words[2:] if word != "#"], first_ids))
+
         if relationship_name not in self.lexical_relationships.keys():
             self.__add_new_relationship__(relationship_name)
+        self.__add_relationship_edges__({relationship_name: edges})
 
-        with codecs.open(file, "r", encoding="utf8") as f:
-            for line in f.readlines():
-                words = [word.strip() for word in line.split(":")[:-1]]
-                root_id = self.main_trie.get(words[0])[0]
-                for word in words[2:]:
-                    if word != "#":
-                        other_id = self.main_trie.get(word)[0]
-                        self.word_graph.add_relationship_edge(root_id, other_id,
-                                                              self.lexical_relationships[relationship_name])
-
+    @reads_dictionary
     def get_word_by_relationship(self, relationship_name, word):
         """
         Function that returns base form of given word
@@ -489,37 +1485,355 @@ class Dictionary:
                 flexographic_labels (str): Sequence of capital letters, optionally with an asterisk at the beginning
                 possible_matches ():
         """
+        if self.cache is not None:
+            return self.__cached_query__(("get_word_by_relationship", relationship_name, word),
+                                         self.__get_word_by_relationship__, relationship_name, word)
+        return self.__get_word_by_relationship__(relationship_name, word)
 
+    def __get_word_by_relationship__(self, relationship_name, word):
         try:
             rel_index = self.lexical_relationships[relationship_name]
         except:
             raise ex.Relationship_not_found("Relationship by which you are trying to search does not exist yet")
 
-        word_id = self.main_trie.get(word)[0][0]
-        check_also = [x[0] for x in self.main_trie.get(word)[1:]]
+        ids = self.__ids__(word)
+        if ids is None:
+            raise ex.Key_Missing(word)
+        word_id = ids[0]
+        check_also = ids[1:]
 
         parent_id = self.word_graph.get_parent(word_id)
         if parent_id is None:
             parent_id = word_id
 
+        parents = set()
+        for x in check_also:
+            other_parent_id = self.word_graph.get_parent(x)
+            parents.add(x if other_parent_id is None else other_parent_id)
 
-        parents = {self.word_graph.get_parent(x) for x in check_also}
-        rel_id = self.word_graph.get_word_by_relationship(parent_id, rel_index)[0]
-        if rel_id is None:
+        related_ids = self.word_graph.get_word_by_relationship(parent_id, rel_index)
+        if not related_ids:
             for x in parents:
-                rel_id = self.word_graph.get_word_by_relationship(x, rel_index)[0]
-                if x is not None:
+                related_ids = self.word_graph.get_word_by_relationship(x, rel_index)
+                if related_ids:
                     break
-            if rel_id is None:
+            if not related_ids:
                 return None, None, None
+        rel_id = related_ids[0]
 
-        possible_rel_ids = {self.word_graph.get_word_by_relationship(x, rel_index) for x in parents}
-        possible_ids = {self.translation_array[x] for x in possible_rel_ids if x != rel_id}
-        possible_matches = [self.reverse_trie.restore_key(x) for x in possible_ids]
+        possible_rel_ids = {related_id for x in parents
+                            for related_id in self.word_graph.get_word_by_relationship(x, rel_index) or []}
+        possible_matches = self.__distinct_words__(x for x in possible_rel_ids if x != rel_id)
 
-        return self.reverse_trie.restore_key(self.translation_array[rel_id]), \
+        return self.__word__(rel_id), \
                self.word_graph.get_label(rel_id), possible_matches
 
+    @modifies_dictionary
+    def add_lexeme(self, line):
+        """
+        Function that adds a lexeme without rebuilding the dictionary
+
+        The lexeme is kept in the overlay of the dictionary until compact is called.
+
+            Args:
+                line (str): lexeme in the format of the basic files
+
+            Returns:
+                None
+        """
+        self.__add_lexeme__(*parse_line(line))
+
+    @modifies_dictionary
+    def remove_lexeme(self, infinitive, label=None):
+        """
+        Function that removes lexemes without rebuilding the dictionary
+
+            Args:
+                infinitive (str): infinitive of the removed lexemes
+                label (str): flexographic label of the removed lexemes, lexemes with any label by default
+
+            Raises:
+                Key_Missing: no lexeme has the given infinitive and label
+
+            Returns:
+                None
+        """
+        if not self.__remove_lexeme__(infinitive, label):
+            raise ex.Key_Missing(infinitive)
+
+    @modifies_dictionary
+    def update_lexeme(self, line):
+        """
+        Function that replaces lexemes with the same infinitive and label by a new one, or adds it
+
+            Args:
+                line (str): lexeme in the format of the basic files
+
+            Returns:
+                None
+        """
+        infinitive, label, derivatives = parse_line(line)
+        self.__remove_lexeme__(infinitive, label)
+        self.__add_lexeme__(infinitive, label, derivatives)
+
+    def __start_overlay__(self):
+        if self.overlay is None:
+            self.word_graph = ov.Overlay(self.word_graph, len(self.key_ids))
+            self.overlay = self.word_graph
+
+    def __add_lexeme__(self, infinitive, label, derivatives):
+        self.__start_overlay__()
+        lexemes = LexemeBuffer()
+        lexemes.add_lexeme(infinitive, label, derivatives)
+        add_lexeme_vertices(self.overlay, self.overlay.next_id(), label, lexemes.slots[1:])
+        self.overlay.add_forms(infinitive, label, derivatives, lexemes.keys)
+
+    def __remove_lexeme__(self, infinitive, label):
+        lexem_ids = [word_id for word_id in self.__ids__(infinitive) or []
+                     if self.word_graph.get_label(word_id) is not None
+                     and (label is None or self.word_graph.get_label(word_id) == label)]
+        if not lexem_ids:
+            return False
+
+        self.__start_overlay__()
+        self.overlay.remove_ids([word_id for lexem_id in lexem_ids
+                                 for word_id in range(lexem_id, lexem_id + self.overlay.lexeme_size(lexem_id))])
+        return True
+
+    def compact(self):
+        """
+        Function that folds lexemes added or removed since the last build into a fresh static build
+
+        The new build is made without holding the lock, so compact can run in a background thread
+        while the dictionary is queried, only its result is published under the lock. Positional ids
+        change, relationships and multisegments are carried over. If lexemes are added or removed
+        in the meantime, the build starts again.
+
+            Returns:
+                None
+        """
+        while True:
+            self.lock.acquire_read()
+            try:
+                overlay = self.overlay
+                if overlay is None:
+                    return
+                version = overlay.version
+                lexemes = dict(overlay.lexemes)
+                removed = overlay.removed
+                base = overlay.base, self.trie, self.key_ids, self.id_format
+            finally:
+                self.lock.release_read()
+
+            with mt.phase(self.metrics, "compact"):
+                built = self.__build_compacted__(overlay, lexemes, removed, *base)
+            pinned = self.__publish_compacted__(overlay, version, *built)
+            if pinned is not None:
+                if pinned:
+                    self.pin_paradigms(pinned)
+                return
+
+    @staticmethod
+    def __build_compacted__(overlay, lexemes, removed, base_graph, trie, key_ids, id_format):
+        """
+        Function that builds the static part of a dictionary from the static part and the overlay of another one
+
+            Returns:
+                id_map (array): new positional id of every old one, -1 for removed forms
+                word_graph (gr.TemplateGraph): graph without relationships
+                tries (tuple): result of build_tries
+        """
+        words = [None] * len(trie)
+        for key, key_id in trie.iteritems():
+            words[key_id] = key
+
+        new_lexemes = LexemeBuffer()
+        id_map = array.array(gr.index_typecode(overlay.next_id()), [-1]) * overlay.next_id()
+        new_id = 0
+        for lexem_id, label, slots in base_graph.lexemes():
+            size = len(slots) + 1
+            if lexem_id not in removed:
+                new_lexemes.add_slots(label, [words[key_ids[word_id]] for word_id in range(lexem_id, lexem_id + size)],
+                                      [0] + slots)
+                id_map[lexem_id:lexem_id + size] = array.array(id_map.typecode, range(new_id, new_id + size))
+                new_id += size
+
+        for lexem_id, (infinitive, label, derivatives) in lexemes.items():
+            if lexem_id not in removed:
+                new_lexemes.add_lexeme(infinitive, label, derivatives)
+                size = overlay.lexeme_size(lexem_id)
+                id_map[lexem_id:lexem_id + size] = array.array(id_map.typecode, range(new_id, new_id + size))
+                new_id += size
+
+        if len(new_lexemes.keys) >= 1 << (8 * struct.calcsize(id_format)):
+            id_format = select_id_format(len(new_lexemes.keys))
+        return id_map, build_graph(new_lexemes), build_tries(new_lexemes.keys, id_format)
+
+    @modifies_dictionary
+    def __publish_compacted__(self, overlay, version, id_map, word_graph, tries):
+        """
+        Function that replaces the static part of the dictionary with a compacted build, unless the overlay
+        changed since the build started
+
+            Returns:
+                pinned ([str]): words pinned by pin_paradigms when the build is published, also the ones pinned
+                                while it was made, their paradigms are dropped and must be pinned again;
+                                None if the build is out of date
+        """
+        if self.overlay is not overlay or overlay.version != version:
+            return None
+
+        for relationship_id, vertices in overlay.relationships.items():
+            mapped = {}
+            for index, targets in vertices.items():
+                targets = [id_map[target] for target in targets if id_map[target] >= 0]
+                if id_map[index] >= 0 and targets:
+                    mapped[id_map[index]] = targets
+            word_graph.relationships[relationship_id] = gr.ArrayGraph.relationship_index.from_mapping(mapped)
+
+        multisegmented = mlt.multisegmented_module()
+        for ids, info in self.multisegmented.entries():
+            mapped = tuple(id_map[word_id] for word_id in ids)
+            if min(mapped) >= 0:
+                multisegmented.add_entry(mapped, info)
+        multisegmented.build()
+
+        self.id_format, self.trie, self.key_ids, self.form_offsets, self.form_ids = tries
+        self.alphabet = sr.alphabet(overlay.words, self.alphabet)
+        self.word_graph = word_graph
+        self.multisegmented = multisegmented
+        pinned = [] if self.paradigms is None else self.paradigms.words()
+        self.overlay = None
+        self.paradigms = None
+        self.__dict__.pop("__mapping__", None)
+        return pinned
+
+    @staticmethod
+    def validate(basic_files, max_errors=None):
+        """
+        Function that checks basic files without building a dictionary, a build of files without problems
+        does not fail on their format
+
+            Args:
+                basic_files ([str]): names of the basic files
+                max_errors (int): stop after this many problems, None checks the whole files
+
+            Returns:
+                diagnostics ([ps.Diagnostic]): file, line number and message of every problem
+        """
+        return ps.validate(basic_files, max_errors)
+
+    @reads_dictionary
+    def dump(self, f, output_format="sgjp", relationships=True):
+        """
+        Function that writes all paradigms of the dictionary in a single pass over the positional ids
+
+        Lexemes are written in the order of the basic files, lexemes added since the last build follow and
+        removed ones are skipped. Forms are decoded lexeme by lexeme, so the memory used does not depend
+        on the size of the dictionary. Changes of the dictionary wait until the whole dump is written.
+
+            Args:
+                f (file object): text stream for the paradigms
+                output_format (str): "sgjp" - lines of the basic files, they build the same dictionary again,
+                                     "tsv" - a line per form with its tags, "jsonl" - a JSON object per lexeme,
+                                     see wr.WRITERS
+                relationships (bool): write related words of every form, "sgjp" never writes them
+
+            Raises:
+                ValueError: unknown output format
+
+            Returns:
+                lexemes (int): number of written lexemes
+        """
+        if output_format not in wr.WRITERS:
+            raise ValueError("Unknown output format {}, expected one of {}".format(output_format, list(wr.WRITERS)))
+
+        names = {}
+        if relationships and output_format != "sgjp":
+            names = {relationship_id: name for name, relationship_id in self.lexical_relationships.items()}
+        return wr.WRITERS[output_format](self.__paradigms__(names), f)
+
+    def __lexeme_slots__(self):
+        """
+        Function that returns lexemes visible in the dictionary in the order of their ids
+
+            Returns:
+                lexemes (iterator): (id of the infinitive, label, [slots of the derivatives]),
+                                    see gr.TemplateGraph.lexemes
+        """
+        if self.overlay is None:
+            yield from self.word_graph.lexemes()
+            return
+
+        removed = self.overlay.removed
+        for lexem_id, label, slots in self.overlay.base.lexemes():
+            if lexem_id not in removed:
+                yield lexem_id, label, slots
+        for lexem_id, (_, label, derivatives) in self.overlay.lexemes.items():
+            if lexem_id not in removed:
+                yield lexem_id, label, [slot for slot, derivative in enumerate(derivatives, 1)
+                                        if derivative != "#" and derivative != "##"]
+
+    def __paradigms__(self, relationship_names):
+        """
+        Function that decodes all lexemes in the order of their ids
+
+            Args:
+                relationship_names (dict): relationship id -> name of the relationships to decode
+
+            Returns:
+                paradigms (generator(tuple)): (infinitive, label, forms) of every lexeme, forms are
+                                              (form, slot, gender, case, relationships) of the infinitive
+                                              and its present derivatives, relationships is
+                                              name -> [related words] or None
+        """
+        restore_key, key_ids, base_size = self.trie.restore_key, self.key_ids, len(self.key_ids)
+        cursors = []
+        for relationship_id, name in relationship_names.items():
+            vertices = self.word_graph.relationships.get(relationship_id) or {}
+            if not isinstance(vertices, gr.ArrayGraph.relationship_index):
+                vertices = sorted(vertices)
+            vertices = iter(vertices)
+            cursors.append([name, relationship_id, vertices, next(vertices, None)])
+
+        for lexem_id, label, slots in self.__lexeme_slots__():
+            end = lexem_id + len(slots) + 1
+            if lexem_id < base_size:
+                words = [restore_key(key_id) for key_id in key_ids[lexem_id:end]]
+            else:
+                words = self.overlay.words[lexem_id - base_size:end - base_size]
+            related = self.__related_words__(cursors, lexem_id, end) if cursors else {}
+
+            forms = []
+            for word_id, word, slot in zip(range(lexem_id, end), words, [0] + slots):
+                gender, case = self.word_graph.get_inflection(word_id)
+                forms.append((word, slot, gender, case, related.get(word_id)))
+            yield words[0], label, forms
+
+    def __related_words__(self, cursors, begin, end):
+        """
+        Function that decodes relationships of the ids begin..end - 1, advancing cursors over sorted related vertices
+
+            Args:
+                cursors ([list]): [name, relationship id, iterator of the remaining vertices, next vertex]
+                begin (int): first id
+                end (int): id after the last one
+
+            Returns:
+                related (dict): id -> {relationship name -> [related words]}
+        """
+        related = {}
+        for cursor in cursors:
+            name, relationship_id, vertices, vertex = cursor
+            while vertex is not None and vertex < end:
+                if vertex >= begin:
+                    related_ids = self.word_graph.get_word_by_relationship(vertex, relationship_id)
+                    if related_ids:
+                        related.setdefault(vertex, {})[name] = [self.__word__(x) for x in related_ids]
+                vertex = next(vertices, None)
+            cursor[3] = vertex
+        return related
+
     @staticmethod
     def export_dict(dictionary, file: str):
         """
@@ -0,0 +1,29 @@
+from time import perf_counter
+import argparse
+import sys
+
+import src.dict.dictionary as dc
+import src.dict.subclasses.writers as wr
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Writes all paradigms of a stored grammatical dictionary")
+    parser.add_argument("dictionary", help="directory of a dictionary stored by Dictionary.save")
+    parser.add_argument("--output", help="file for the paradigms, written to the standard output by default")
+    parser.add_argument("--format", choices=list(wr.WRITERS), default="sgjp", help="format of the paradigms")
+    parser.add_argument("--no-relationships", action="store_true", help="do not write related words")
+    options = parser.parse_args(arguments)
+
+    dictionary = dc.Dictionary.open(options.dictionary)
+    start = perf_counter()
+    if options.output is None:
+        lexemes = dictionary.dump(sys.stdout, options.format, not options.no_relationships)
+    else:
+        with open(options.output, "w", encoding="utf8") as f:
+            lexemes = dictionary.dump(f, options.format, not options.no_relationships)
+    print("{} lexemes in {:.2f}s".format(lexemes, perf_counter() - start), file=sys.stderr)
+    return lexemes
+
+
+if __name__ == '__main__':
+    main()
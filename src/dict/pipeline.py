@@ -0,0 +1,349 @@
+from time import perf_counter
+import argparse
+import collections
+import concurrent.futures
+import itertools
+import json
+import re
+import sys
+
+import src.dict.dictionary as dc
+import src.dict.subclasses.exceptions as ex
+
+# words, including hyphenated compounds such as biało-czerwony
+TOKEN_PATTERN = re.compile(r"\w+(?:-\w+)*")
+
+# number of characters read from a text file at once
+CHUNK_SIZE = 1 << 20
+
+# number of tokens looked up by a single get_parent_many call
+BATCH_SIZE = 4096
+
+# label of the records of multisegments
+MULTISEGMENT_LABEL = "WS"
+
+
+def read_chunks(file, chunk_size=CHUNK_SIZE, whole_lines=False):
+    """
+    Function that reads a text file in chunks that do not split words
+
+        Args:
+            file (str): name of an UTF-8 text file
+            chunk_size (int): approximate number of characters in a chunk
+            whole_lines (bool): end chunks at line breaks where possible, so that multisegments
+                                within a line are not split
+
+        Returns:
+            chunks (generator(str)): consecutive parts of the text
+    """
+    with open(file, "r", encoding="utf8") as f:
+        rest = ""
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            data = rest + data
+
+            end = data.rfind("\n") + 1 if whole_lines else 0
+            if end == 0:
+                end = max(data.rfind(" "), data.rfind("\n"), data.rfind("\t")) + 1
+            if end == 0:
+                # a single word longer than a chunk
+                end = len(data)
+            yield data[:end]
+            rest = data[end:]
+        if rest:
+            yield rest
+
+
+def tokenize(chunks):
+    """
+    Function that splits text into words, dropping punctuation and numbers
+
+        Args:
+            chunks (iterable(str)): text in parts that do not split words
+
+        Returns:
+            tokens (generator(str)): words in the order of the text
+    """
+    for chunk in chunks:
+        for match in TOKEN_PATTERN.finditer(chunk):
+            if not match.group().isdigit():
+                yield match.group()
+
+
+def write_tsv(records, f):
+    """
+    Function that writes records as tab separated lines: token, lemma, label, ambiguity separated with "|"
+    """
+    for token, lemma, label, ambiguity in records:
+        f.write("{}\t{}\t{}\t{}\n".format(token, lemma or "", label or "", "|".join(ambiguity or [])))
+
+
+def write_jsonl(records, f):
+    """
+    Function that writes records as JSON objects, one per line
+    """
+    for token, lemma, label, ambiguity in records:
+        f.write(json.dumps({"token": token, "lemma": lemma, "label": label, "ambiguity": ambiguity},
+                           ensure_ascii=False) + "\n")
+
+
+WRITERS = {"tsv": write_tsv, "jsonl": write_jsonl}
+
+
+class Lemmatizer:
+    """
+    Streaming lemmatizer of texts of any size
+
+    Text is read in chunks and looked up in batches with get_parent_many, so the memory used
+    does not depend on the size of the text. Windows of consecutive tokens are checked with
+    get_parent_multisegmented, the longest multisegment starting at a token wins, but only
+    tokens that can begin a multisegment are checked. With workers, chunks ending at line breaks
+    are lemmatized by worker processes that memory-map the same stored dictionary, records are
+    still produced in the order of the text; a multisegment spanning two chunks is then not found.
+
+        Args:
+            dictionary (Dictionary or str): dictionary, or directory of a dictionary stored by save
+            workers (int): number of worker processes, needs a stored dictionary;
+                           None or 1 lemmatizes in this process
+            chunk_size (int): number of characters read at once
+            batch_size (int): number of tokens looked up at once
+            lowercase (bool): look up unknown tokens once more in lower case, e.g. at the beginning of sentences
+
+        Attributes:
+            tokens (int): number of lemmatized tokens, words of a multisegment included
+            unknown (int): number of tokens missing from the dictionary
+            multisegments (int): number of found multisegments
+            seconds (float): time spent on lemmatization and on the consumer of the records
+    """
+
+    def __init__(self, dictionary, workers=None, chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE, lowercase=True):
+        if workers is not None and workers > 1 and not isinstance(dictionary, str):
+            raise ValueError("Worker processes need the directory of a stored dictionary")
+
+        self.path = dictionary if isinstance(dictionary, str) else None
+        self.dictionary = dc.Dictionary.open(dictionary) if isinstance(dictionary, str) else dictionary
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.lowercase = lowercase
+        self.tokens = 0
+        self.unknown = 0
+        self.multisegments = 0
+        self.seconds = 0.0
+
+    def stats(self):
+        """
+        Function that returns counters of the lemmatized text
+
+            Returns:
+                stats (dict): tokens, unknown tokens, multisegments, seconds and tokens per second
+        """
+        return {
+            "tokens": self.tokens,
+            "unknown": self.unknown,
+            "multisegments": self.multisegments,
+            "seconds": self.seconds,
+            "tokens_per_second": self.tokens / self.seconds if self.seconds else 0.0,
+        }
+
+    def lemmatize_tokens(self, tokens):
+        """
+        Function that lemmatizes a stream of tokens
+
+            Args:
+                tokens (iterable(str)): words in the order of the text
+
+            Returns:
+                records (generator(tuple)): (token, lemma, label, ambiguity) for every token or multisegment,
+                                            ambiguity are the possible_matches of get_parent, an infinitive
+                                            is its own lemma; lemma, label and ambiguity are None
+                                            for unknown tokens
+        """
+        starts, length = self.dictionary.get_multisegmented_starts()
+        # the last tokens of a batch wait for the next one, as they can begin a multisegment
+        lookahead = max(length - 1, 0)
+        tokens = iter(tokens)
+        pending = []
+        start = perf_counter()
+        while True:
+            batch = list(itertools.islice(tokens, self.batch_size))
+            pending += batch
+            last = not batch
+            ready = len(pending) if last else len(pending) - lookahead
+            if ready > 0:
+                consumed = yield from self.__lemmatize_batch__(pending, ready, starts, length)
+                del pending[:consumed]
+            self.seconds += perf_counter() - start
+            start = perf_counter()
+            if last:
+                return
+
+    def __lemmatize_batch__(self, tokens, ready, starts, length):
+        """
+        Function that lemmatizes tokens of a batch
+
+            Args:
+                tokens ([str]): tokens of the batch followed by the lookahead
+                ready (int): number of tokens that can begin a record
+                starts (set(str)): words that can begin a multisegment
+                length (int): number of words of the longest multisegment
+
+            Returns:
+                records (generator(tuple)): records of the tokens, returns the number of tokens used
+        """
+        parents = self.dictionary.get_parent_many(tokens[:ready], infinitives=True)
+        if self.lowercase:
+            unknown = [index for index, parent in enumerate(parents) if parent[0] is None and
+                       tokens[index] != tokens[index].lower()]
+            for index, parent in zip(unknown, self.dictionary.get_parent_many(
+                    [tokens[index].lower() for index in unknown], infinitives=True)):
+                parents[index] = parent
+
+        index = 0
+        while index < ready:
+            multisegment = None
+            if tokens[index] in starts:
+                multisegment = self.__find_multisegment__(tokens, index, length)
+            if multisegment is not None:
+                words, lemma = multisegment
+                self.tokens += words
+                self.multisegments += 1
+                yield " ".join(tokens[index:index + words]), lemma, MULTISEGMENT_LABEL, []
+                index += words
+                continue
+
+            lemma, label, ambiguity = parents[index]
+            self.tokens += 1
+            if lemma is None:
+                self.unknown += 1
+            yield tokens[index], lemma, label, ambiguity
+            index += 1
+        return index
+
+    def __find_multisegment__(self, tokens, index, length):
+        for words in range(min(length, len(tokens) - index), 1, -1):
+            try:
+                parent = self.dictionary.get_parent_multisegmented(" ".join(tokens[index:index + words]))
+            except ex.Key_Missing:
+                continue
+            if parent is not None:
+                return words, parent[0]
+        return None
+
+    def lemmatize_text(self, chunks):
+        """
+        Function that lemmatizes text given in parts
+
+            Args:
+                chunks (iterable(str)): text in parts that do not split words
+
+            Returns:
+                records (generator(tuple)): records as returned by lemmatize_tokens
+        """
+        return self.lemmatize_tokens(tokenize(chunks))
+
+    def lemmatize_file(self, file):
+        """
+        Function that lemmatizes an UTF-8 text file, in the worker processes if there are any
+
+            Args:
+                file (str): name of the text file
+
+            Returns:
+                records (generator(tuple)): records as returned by lemmatize_tokens
+        """
+        if self.workers is None or self.workers <= 1:
+            return self.lemmatize_text(read_chunks(file, self.chunk_size))
+        return self.__lemmatize_in_workers__(file)
+
+    def __lemmatize_in_workers__(self, file):
+        options = (self.path, self.batch_size, self.lowercase)
+        with concurrent.futures.ProcessPoolExecutor(self.workers, initializer=open_worker,
+                                                    initargs=options) as executor:
+            # at most two chunks per worker are read ahead, so memory stays bounded
+            submitted = collections.deque()
+            chunks = read_chunks(file, self.chunk_size, whole_lines=True)
+            start = perf_counter()
+            while True:
+                for chunk in itertools.islice(chunks, 2 * self.workers - len(submitted)):
+                    submitted.append(executor.submit(lemmatize_chunk, chunk))
+                if not submitted:
+                    return
+
+                records, counters = submitted.popleft().result()
+                self.tokens += counters["tokens"]
+                self.unknown += counters["unknown"]
+                self.multisegments += counters["multisegments"]
+                yield from records
+                self.seconds += perf_counter() - start
+                start = perf_counter()
+
+    def write(self, file, output, output_format="tsv"):
+        """
+        Function that lemmatizes a text file and writes its records
+
+            Args:
+                file (str): name of the UTF-8 text file
+                output (file object): text stream for the records
+                output_format (str): "tsv" or "jsonl"
+
+            Raises:
+                ValueError: unknown output format
+
+            Returns:
+                stats (dict): counters of the lemmatized text, see stats
+        """
+        if output_format not in WRITERS:
+            raise ValueError("Unknown output format {}, expected one of {}".format(output_format, list(WRITERS)))
+        WRITERS[output_format](self.lemmatize_file(file), output)
+        return self.stats()
+
+
+# lemmatizer of a worker process, created by open_worker
+worker_lemmatizer = None
+
+
+def open_worker(path, batch_size, lowercase):
+    global worker_lemmatizer
+    worker_lemmatizer = Lemmatizer(path, batch_size=batch_size, lowercase=lowercase)
+
+
+def lemmatize_chunk(chunk):
+    """
+    Function that lemmatizes a chunk of text in a worker process
+
+        Returns:
+            records ([tuple]): records of the chunk
+            counters (dict): tokens, unknown tokens and multisegments of the chunk
+    """
+    before = worker_lemmatizer.stats()
+    records = list(worker_lemmatizer.lemmatize_text([chunk]))
+    after = worker_lemmatizer.stats()
+    return records, {name: after[name] - before[name] for name in ["tokens", "unknown", "multisegments"]}
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Lemmatizes a text file with a stored grammatical dictionary")
+    parser.add_argument("dictionary", help="directory of a dictionary stored by Dictionary.save")
+    parser.add_argument("input", help="UTF-8 text file")
+    parser.add_argument("--output", help="file for the records, written to the standard output by default")
+    parser.add_argument("--format", choices=list(WRITERS), default="tsv", help="format of the records")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes sharing the dictionary")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="characters read at once")
+    options = parser.parse_args(arguments)
+
+    lemmatizer = Lemmatizer(options.dictionary, options.workers, options.chunk_size)
+    if options.output is None:
+        stats = lemmatizer.write(options.input, sys.stdout, options.format)
+    else:
+        with open(options.output, "w", encoding="utf8") as f:
+            stats = lemmatizer.write(options.input, f, options.format)
+    print("{tokens} tokens, {unknown} unknown, {multisegments} multisegments in {seconds:.2f}s, "
+          "{tokens_per_second:.0f} tokens/s".format(**stats), file=sys.stderr)
+    return stats
+
+
+if __name__ == '__main__':
+    main()
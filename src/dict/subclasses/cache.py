@@ -0,0 +1,121 @@
+from collections import OrderedDict
+import threading
+
+
+class ResultCache:
+    """
+    Bounded cache of query results
+
+        Args:
+            size (int): maximal number of cached results
+            policy (str): eviction policy, "lru" evicts the least recently used result,
+                          "fifo" evicts the oldest inserted result
+
+        Attributes:
+            hits (int): number of lookups that found a result
+            misses (int): number of lookups that did not find a result
+            evictions (int): number of results removed to make space for new ones
+            invalidations (int): number of times the whole cache was cleared
+
+        All methods can be called from many threads at once.
+    """
+    POLICIES = ["lru", "fifo"]
+
+    def __init__(self, size, policy="lru"):
+        if size <= 0:
+            raise ValueError("Cache size must be positive, got {}".format(size))
+        if policy not in self.POLICIES:
+            raise ValueError("Unknown eviction policy {}, expected one of {}".format(policy, self.POLICIES))
+
+        self.size = size
+        self.policy = policy
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["entries"] = OrderedDict()
+        state.pop("lock")
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Function that returns a cached result
+
+            Args:
+                key (tuple): hashable description of the query
+
+            Returns:
+                found (bool): True if the result was cached
+                result: cached result or None
+        """
+        with self.lock:
+            try:
+                result = self.entries[key]
+            except KeyError:
+                self.misses += 1
+                return False, None
+
+            self.hits += 1
+            if self.policy == "lru":
+                self.entries.move_to_end(key)
+            return True, result
+
+    def put(self, key, result):
+        """
+        Function that caches a result, evicting another one if the cache is full
+
+            Args:
+                key (tuple): hashable description of the query
+                result: result of the query
+
+            Returns:
+                None
+        """
+        with self.lock:
+            self.entries[key] = result
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Function that removes all cached results, called whenever the cached data changes
+        """
+        with self.lock:
+            self.entries.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        """
+        Function that returns cache counters
+
+            Returns:
+                stats (dict): hits, misses, evictions, invalidations, hit rate, current and maximal size
+        """
+        with self.lock:
+            return self.__stats__()
+
+    def __stats__(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "size": self.size,
+            "policy": self.policy,
+        }
@@ -14,3 +14,24 @@ class Key_Missing(Error):
     pass
 
 
+
+class Unsupported_format(Error):
+    pass
+
+
+class Parse_error(Error):
+    """
+    Malformed line of a basic file
+
+        Attributes:
+            message (str): description of the problem
+            file (str): name of the file or None
+            line_number (int): number of the line counted from 1 or None
+    """
+
+    def __init__(self, message, file=None, line_number=None):
+        location = ":".join(str(part) for part in [file, line_number] if part is not None)
+        super().__init__("{}: {}".format(location, message) if location else message)
+        self.message = message
+        self.file = file
+        self.line_number = line_number
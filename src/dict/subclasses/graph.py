@@ -1,5 +1,11 @@
 import src.dict.subclasses.exceptions as ex
+import src.dict.subclasses.storage as st
+from collections.abc import Mapping
 from enum import Enum
+import array
+import bisect
+import itertools
+import sys
 
 class Genders(Enum):
     MASCULINE = 1
@@ -71,6 +77,10 @@ class Graph:
         self.nodes[from_v].relationships[relationship_id].append(to_v)
         self.nodes[to_v].relationships[relationship_id].append(from_v)
 
+    def add_relationship_edges(self, relationship_id, sources, targets):
+        for from_v, to_v in zip(sources, targets):
+            self.add_relationship_edge(from_v, to_v, relationship_id)
+
     def get_inflection(self, id):
         return [self.nodes[id].gender, self.nodes[id].case]
 
@@ -94,3 +104,908 @@ class Graph:
 
     def get_word_by_relationship(self, id, relationship_id):
         return self.nodes[id].relationships.get(relationship_id)
+
+    def memory_footprint(self):
+        """
+        Function that returns an estimate of the memory held by the graph
+
+            Returns:
+                size (int): Number of bytes used by the nodes and their containers
+        """
+        size = sys.getsizeof(self.nodes)
+        for index, node in self.nodes.items():
+            size += sys.getsizeof(index) + sys.getsizeof(node) + sys.getsizeof(node.__dict__)
+            size += sys.getsizeof(node.relationships)
+            size += sum(sys.getsizeof(targets) for targets in node.relationships.values())
+            if node.children is not None:
+                size += sys.getsizeof(node.children)
+            if isinstance(node, self.gender_node) and node.gender_children is not None:
+                size += sys.getsizeof(node.gender_children)
+        return size
+
+
+def index_typecode(size):
+    """
+    Function that returns the array typecode able to store every index lower than size and -1
+
+        Args:
+            size (int): number of vertices
+
+        Returns:
+            typecode (str): array.array typecode
+    """
+    return "i" if size < 1 << 31 else "q"
+
+
+# packed inflections are lower than this number
+INFLECTION_CODES = 1 << 6
+
+
+def inflection_code(gender, case):
+    return gender.value << 3 | case.value
+
+
+# packed inflection -> [gender, case], decoding with the Enum constructors is several times slower
+INFLECTIONS = {inflection_code(gender, case): (gender, case) for gender in Genders for case in Cases}
+
+
+def lexeme_vertices_with_inflection(graph, lexem_id, gender=None, case=None):
+    """
+    Function that returns vertices of a single lexeme with a given gender and case
+
+        Args:
+            graph (CompactGraph or Graph): graph of the lexeme
+            lexem_id (int): id of the infinitive of the lexeme
+            gender (Genders): gender of the vertices, None for any
+            case (Cases): case of the vertices, None for any
+
+        Returns:
+            vertices ([int]): the infinitive and its children with gender that match, in the order of ids
+    """
+    vertices = []
+    for vertex in [lexem_id] + (graph.get_children(lexem_id) or []):
+        if graph.has_gender(vertex):
+            vertex_gender, vertex_case = graph.get_inflection(vertex)
+            if (gender is None or vertex_gender == gender) and (case is None or vertex_case == case):
+                vertices.append(vertex)
+    return vertices
+
+
+def gender_children_by_inflection(graph, id):
+    """
+    Function that indexes gender children of a vertex by their gender and case
+
+        Args:
+            graph (CompactGraph or Graph): graph of the vertex
+            id (int): vertex with gender
+
+        Returns:
+            offset (int): number added to the values of the index to get ids
+            children (dict): packed inflection, see inflection_code -> [gender children with it], in the order
+                             of ids, may be shared and must not be modified, None if the vertex has no gender children
+    """
+    children = graph.get_gender_children(id)
+    if children is None:
+        return 0, None
+    index = {}
+    for child in children:
+        index.setdefault(inflection_code(*graph.get_inflection(child)), []).append(child)
+    return 0, index
+
+
+class ArrayGraph:
+    """
+    Base of the graphs kept in flat arrays, with relationships and the index of vertices by inflection
+
+        Args:
+            size (int): number of vertices
+
+        Attributes:
+            relationships (dict): relationship id -> {vertex: [related vertices]}, relationships of a stored
+                                  graph are relationship_index mappings decoded per vertex until changed
+            inflection_index (ArrayGraph.csr_adjacency): vertices grouped by packed inflection, None until
+                                                         the first get_vertices_with_inflection, built by
+                                                         __inflection_index__ of a subclass
+    """
+    NO_VERTEX = 0
+    PLAIN_VERTEX = 1
+    GENDER_VERTEX = 2
+
+    class csr_adjacency:
+        def __init__(self, size, typecode):
+            self.size = size
+            self.typecode = typecode
+            self.offsets = array.array(typecode, bytes(array.array(typecode).itemsize * (size + 1)))
+            self.targets = array.array(typecode)
+            self.pending_sources = array.array(typecode)
+            self.pending_targets = array.array(typecode)
+
+        def add(self, source, target):
+            self.pending_sources.append(source)
+            self.pending_targets.append(target)
+
+        def finalize(self):
+            """
+            Function that merges pending edges into offsets and targets, keeping the order of insertion
+            """
+            if not self.pending_sources:
+                return
+
+            counts = [0] * (self.size + 1)
+            offsets = self.offsets
+            for source in range(self.size):
+                counts[source + 1] = offsets[source + 1] - offsets[source]
+            for source in self.pending_sources:
+                counts[source + 1] += 1
+            for index in range(self.size):
+                counts[index + 1] += counts[index]
+
+            targets = array.array(self.typecode, bytes(self.targets.itemsize * counts[-1]))
+            fill = counts[:-1]
+            for source in range(self.size):
+                for target in self.targets[offsets[source]:offsets[source + 1]]:
+                    targets[fill[source]] = target
+                    fill[source] += 1
+            for source, target in zip(self.pending_sources, self.pending_targets):
+                targets[fill[source]] = target
+                fill[source] += 1
+
+            self.offsets = array.array(self.typecode, counts)
+            self.targets = targets
+            self.pending_sources = array.array(self.typecode)
+            self.pending_targets = array.array(self.typecode)
+
+        @classmethod
+        def from_parents(cls, parents, typecode, size=None):
+            """
+            Function that builds the adjacency lists of edges parent -> vertex, children in the order of ids,
+            size is the number of parents, len(parents) by default
+            """
+            size = len(parents) if size is None else size
+            adjacency = cls(size, typecode)
+            counts = [0] * (size + 1)
+            for parent in parents:
+                if parent >= 0:
+                    counts[parent + 1] += 1
+            for index in range(size):
+                counts[index + 1] += counts[index]
+
+            targets = array.array(typecode, bytes(array.array(typecode).itemsize * counts[-1]))
+            fill = counts[:-1]
+            for vertex, parent in enumerate(parents):
+                if parent >= 0:
+                    targets[fill[parent]] = vertex
+                    fill[parent] += 1
+            adjacency.offsets = array.array(typecode, counts)
+            adjacency.targets = targets
+            return adjacency
+
+        def get(self, source):
+            if self.pending_sources:
+                self.finalize()
+            begin, end = self.offsets[source], self.offsets[source + 1]
+            if begin == end:
+                return None
+            return list(self.targets[begin:end])
+
+        def nbytes(self):
+            return sum(buffer.itemsize * len(buffer) for buffer in
+                       [self.offsets, self.targets, self.pending_sources, self.pending_targets])
+
+        def __getstate__(self):
+            state = dict(self.__dict__)
+            state["offsets"] = st.to_array(self.offsets)
+            state["targets"] = st.to_array(self.targets)
+            return state
+
+    class relationship_index(Mapping):
+        """
+        Read-only relationship, vertex -> [related vertices], decoded per vertex
+
+        Relationships loaded in bulk and relationships of a stored graph are kept in three flat arrays
+        instead of a list per vertex.
+
+            Args:
+                vertices (array): sorted vertices with related vertices
+                offsets (array): targets[offsets[i]:offsets[i + 1]] are related to vertices[i]
+                targets (array): related vertices
+        """
+
+        def __init__(self, vertices, offsets, targets):
+            self.vertices = vertices
+            self.offsets = offsets
+            self.targets = targets
+
+        @classmethod
+        def from_mapping(cls, vertices):
+            """
+            Function that converts a relationship kept as vertex -> [related vertices]
+            """
+            sources = array.array(index_typecode(max(vertices, default=0) + 1), sorted(vertices))
+            related = list(map(vertices.__getitem__, sources))
+            offsets = array.array(index_typecode(sum(map(len, related)) + 1), [0])
+            offsets.extend(itertools.accumulate(map(len, related)))
+            targets = array.array("q", itertools.chain.from_iterable(related))
+            return cls(sources, offsets, array.array(index_typecode(max(targets, default=0) + 1), targets))
+
+        def __getitem__(self, index):
+            related = self.get(index)
+            if related is None:
+                raise KeyError(index)
+            return related
+
+        def get(self, index, default=None):
+            position = bisect.bisect_left(self.vertices, index)
+            if position == len(self.vertices) or self.vertices[position] != index:
+                return default
+            return list(self.targets[self.offsets[position]:self.offsets[position + 1]])
+
+        def nbytes(self):
+            return sum(buffer.itemsize * len(buffer) for buffer in [self.vertices, self.offsets, self.targets])
+
+        def __getstate__(self):
+            return {name: st.to_array(buffer) for name, buffer in self.__dict__.items()}
+
+        def __iter__(self):
+            return iter(self.vertices)
+
+        def __len__(self):
+            return len(self.vertices)
+
+    def __init__(self, size):
+        self.size = size
+        self.relationships = {}
+        self.inflection_index = None
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["relationships"] = dict(self.relationships)
+        return state
+
+    def __extend_relationships__(self, other, shift):
+        for relationship_id, vertices in other.relationships.items():
+            shifted = self.relationships.get(relationship_id)
+            shifted = self.relationships[relationship_id] = dict(shifted or {})
+            for index, targets in vertices.items():
+                shifted.setdefault(index + shift, []).extend(target + shift for target in targets)
+
+    def __relationship_buffers__(self, buffers):
+        for relationship_id, vertices in self.relationships.items():
+            if not isinstance(vertices, self.relationship_index):
+                vertices = self.relationship_index.from_mapping(vertices)
+            name = "graph.relationships.{}.".format(relationship_id)
+            buffers[name + "vertices"] = vertices.vertices
+            buffers[name + "offsets"] = vertices.offsets
+            buffers[name + "targets"] = vertices.targets
+
+    def __open_relationships__(self, buffers, meta):
+        for relationship_id in meta["relationships"]:
+            name = "graph.relationships.{}.".format(relationship_id)
+            self.relationships[relationship_id] = self.relationship_index(
+                buffers[name + "vertices"], buffers[name + "offsets"], buffers[name + "targets"])
+
+    def add_relationship_edge(self, from_v, to_v, relationship_id):
+        vertices = self.relationships.get(relationship_id)
+        if not isinstance(vertices, dict):
+            vertices = self.relationships[relationship_id] = dict(vertices or {})
+        vertices.setdefault(from_v, []).append(to_v)
+        vertices.setdefault(to_v, []).append(from_v)
+
+    def add_relationship_edges(self, relationship_id, sources, targets):
+        """
+        Function that adds many undirected relationship edges at once and indexes the whole relationship
+
+        The result is the same as the one of add_relationship_edge called for every edge in order, but lists
+        of related vertices exist only while the edges are added, the relationship is kept as a relationship_index.
+
+            Args:
+                relationship_id (int): id of the relationship
+                sources (array): first vertex of every edge
+                targets (array): second vertex of every edge
+
+            Returns:
+                None
+        """
+        vertices = {index: list(related) for index, related in (self.relationships.get(relationship_id) or {}).items()}
+        for from_v, to_v in zip(sources, targets):
+            vertices.setdefault(from_v, []).append(to_v)
+            vertices.setdefault(to_v, []).append(from_v)
+        self.relationships[relationship_id] = self.relationship_index.from_mapping(vertices)
+
+    def get_vertices_with_inflection(self, gender=None, case=None):
+        """
+        Function that returns vertices with a given gender and case
+
+        Vertices are grouped by their packed inflection in an index built on first use,
+        so the time depends only on the number of returned vertices.
+
+            Args:
+                gender (Genders): gender of the vertices, None for any
+                case (Cases): case of the vertices, None for any
+
+            Returns:
+                vertices (iterable(int)): vertices ordered by gender, then case, then id
+        """
+        index = self.__inflection_index__()
+        codes = [inflection_code(vertex_gender, vertex_case)
+                 for vertex_gender in (Genders if gender is None else [gender])
+                 for vertex_case in (Cases if case is None else [case])]
+        return itertools.chain.from_iterable(index.targets[index.offsets[code]:index.offsets[code + 1]]
+                                             for code in codes)
+
+    def get_word_by_relationship(self, id, relationship_id):
+        return self.relationships.get(relationship_id, {}).get(id)
+
+    def __relationships_footprint__(self):
+        size = sys.getsizeof(self.relationships)
+        for vertices in self.relationships.values():
+            if not isinstance(vertices, dict):
+                size += vertices.nbytes()
+                continue
+            size += sys.getsizeof(vertices)
+            size += sum(sys.getsizeof(index) + sys.getsizeof(targets) for index, targets in vertices.items())
+        return size
+
+
+class CompactGraph(ArrayGraph):
+    """
+    Columnar replacement for Graph with the same interface
+
+    Vertices are the dense ids 0..size-1. Parents, packed inflections and interned labels are kept in
+    flat arrays, children and gender children in CSR adjacency lists.
+
+        Args:
+            size (int): number of vertices
+
+        Attributes:
+            kinds (array): NO_VERTEX, PLAIN_VERTEX or GENDER_VERTEX for every id
+            parents (array): parent of every vertex, -1 if there is none
+            gender_parents (array): gender parent of every vertex, -1 if there is none
+            inflections (array): gender.value << 3 | case.value for gender vertices, 0 otherwise
+            label_ids (array): index in labels increased by one, 0 for vertices without label
+            labels ([str]): distinct labels
+            children (ArrayGraph.csr_adjacency): children of every vertex
+            gender_children (ArrayGraph.csr_adjacency): gender children of every vertex
+            relationships (dict): see ArrayGraph
+            inflection_index (ArrayGraph.csr_adjacency): see ArrayGraph
+    """
+
+    def __init__(self, size):
+        super().__init__(size)
+        typecode = index_typecode(size)
+        self.kinds = array.array("B", bytes(size))
+        self.parents = array.array(typecode, [-1]) * size
+        self.gender_parents = array.array(typecode, [-1]) * size
+        self.inflections = array.array("B", bytes(size))
+        self.label_ids = array.array("H", bytes(2 * size))
+        self.labels = []
+        self.__label_index__ = {}
+        self.children = self.csr_adjacency(size, typecode)
+        self.gender_children = self.csr_adjacency(size, typecode)
+
+    @classmethod
+    def from_graph(cls, graph, size):
+        """
+        Function that converts an object based Graph into a CompactGraph
+
+            Args:
+                graph (Graph): graph to convert
+                size (int): number of vertices, greater than every index in the graph
+
+            Returns:
+                compact_graph (CompactGraph): graph with the same vertices, edges and relationships
+        """
+        compact_graph = cls(size)
+        for index, node in sorted(graph.nodes.items()):
+            if isinstance(node, graph.gender_node):
+                compact_graph.add_gender_vertex(index, node.label, node.case, node.gender)
+            else:
+                compact_graph.add_vertex(index, node.label)
+
+        for index, node in sorted(graph.nodes.items()):
+            for child in node.children or []:
+                compact_graph.add_edge(index, child)
+            if isinstance(node, graph.gender_node):
+                for child in node.gender_children or []:
+                    compact_graph.add_gender_edge(index, child)
+            for relationship_id, targets in node.relationships.items():
+                compact_graph.relationships.setdefault(relationship_id, {})[index] = list(targets)
+
+        compact_graph.finalize()
+        return compact_graph
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        for name in ["kinds", "parents", "gender_parents", "inflections", "label_ids"]:
+            state[name] = st.to_array(state[name])
+        return state
+
+    def to_graph(self):
+        """
+        Function that converts the graph back into an object based Graph
+
+            Returns:
+                graph (Graph): graph with the same vertices, edges and relationships
+        """
+        graph = Graph()
+        for index in range(self.size):
+            if self.kinds[index] == self.GENDER_VERTEX:
+                gender, case = self.get_inflection(index)
+                graph.add_gender_vertex(index, self.get_label(index), case, gender)
+            elif self.kinds[index] == self.PLAIN_VERTEX:
+                graph.add_vertex(index, self.get_label(index))
+
+        for index in range(self.size):
+            for child in self.get_children(index) or []:
+                graph.add_edge(index, child)
+            for child in self.get_gender_children(index) or []:
+                graph.add_gender_edge(index, child)
+
+        for relationship_id, vertices in self.relationships.items():
+            for index, targets in vertices.items():
+                graph.nodes[index].relationships[relationship_id] = list(targets)
+        return graph
+
+    def __set_label__(self, vertex_index, label):
+        if label is None:
+            self.label_ids[vertex_index] = 0
+            return
+        if label not in self.__label_index__:
+            self.labels.append(label)
+            self.__label_index__[label] = len(self.labels)
+        self.label_ids[vertex_index] = self.__label_index__[label]
+
+    def add_vertex(self, vertex_index, label):
+        self.kinds[vertex_index] = self.PLAIN_VERTEX
+        self.inflections[vertex_index] = 0
+        self.__set_label__(vertex_index, label)
+
+    def add_gender_vertex(self, vertex_index, label, case, gender):
+        self.kinds[vertex_index] = self.GENDER_VERTEX
+        self.inflections[vertex_index] = inflection_code(gender, case)
+        self.__set_label__(vertex_index, label)
+
+    def add_edge(self, from_v, to_v):
+        self.children.add(from_v, to_v)
+        self.parents[to_v] = from_v
+
+    def add_gender_edge(self, from_v, to_v):
+        self.gender_children.add(from_v, to_v)
+        self.gender_parents[to_v] = from_v
+
+    def finalize(self):
+        """
+        Function that packs the edges added so far, called lazily by the first query otherwise
+        """
+        self.children.finalize()
+        self.gender_children.finalize()
+
+    def __inflection_index__(self):
+        if self.inflection_index is None:
+            self.inflection_index = self.csr_adjacency.from_parents(self.inflections, index_typecode(self.size),
+                                                                    INFLECTION_CODES)
+        return self.inflection_index
+
+    def get_lexeme_vertices_with_inflection(self, lexem_id, gender=None, case=None):
+        return lexeme_vertices_with_inflection(self, lexem_id, gender, case)
+
+    def get_gender_children_by_inflection(self, id):
+        return gender_children_by_inflection(self, id)
+
+    def get_inflection(self, id):
+        inflection = self.inflections[id]
+        if inflection == 0:
+            return [None, None]
+        return list(INFLECTIONS[inflection])
+
+    def get_children(self, id):
+        return self.children.get(id)
+
+    def get_parent(self, id):
+        parent = self.parents[id]
+        return None if parent < 0 else parent
+
+    def get_gender_parent(self, id):
+        parent = self.gender_parents[id]
+        return None if parent < 0 else parent
+
+    def get_gender_children(self, id):
+        return self.gender_children.get(id)
+
+    def has_gender(self, id):
+        return self.kinds[id] == self.GENDER_VERTEX
+
+    def get_label(self, id):
+        label_id = self.label_ids[id]
+        return None if label_id == 0 else self.labels[label_id - 1]
+
+    def memory_footprint(self):
+        """
+        Function that returns an estimate of the memory held by the graph
+
+            Returns:
+                size (int): Number of bytes used by the arrays, labels and relationships
+        """
+        size = sum(buffer.itemsize * len(buffer) for buffer in
+                   [self.kinds, self.parents, self.gender_parents, self.inflections, self.label_ids])
+        size += self.children.nbytes() + self.gender_children.nbytes()
+        if self.inflection_index is not None:
+            size += self.inflection_index.nbytes()
+        size += sys.getsizeof(self.labels) + sum(sys.getsizeof(label) for label in self.labels)
+        return size + self.__relationships_footprint__()
+
+class ParadigmTemplate:
+    """
+    Vertices, tags and edges shared by all lexemes with the same label and slots of derivatives
+
+    Vertices of a template are the positions of the forms in a lexeme, the infinitive is at position 0.
+
+        Args:
+            label (str): flexographic label
+            slots (iterable(int)): slot of every derivative in its line
+            kinds (iterable(int)): NO_VERTEX, PLAIN_VERTEX or GENDER_VERTEX at every position
+            inflections (iterable(int)): packed inflection at every position, 0 for vertices without gender
+            parents (iterable(int)): position of the parent at every position, -1 if there is none
+            gender_parents (iterable(int)): position of the gender parent at every position, -1 if there is none
+
+        Attributes:
+            size (int): number of forms of a lexeme, the infinitive included
+            children (dict): position -> [positions of its children], in the order of positions
+            gender_children (dict): position -> [positions of its gender children], in the order of positions
+            inflection_positions (dict): (gender, case) -> [positions of the vertices with them], filled
+                                         by positions_with_inflection
+            inflection_children (dict): position -> {packed inflection -> [positions of its gender children
+                                        with it]}, filled by gender_children_by_inflection
+    """
+
+    def __init__(self, label, slots, kinds, inflections, parents, gender_parents):
+        self.label = label
+        self.slots = tuple(slots)
+        self.kinds = bytes(kinds)
+        self.inflections = bytes(inflections)
+        self.parents = tuple(parents)
+        self.gender_parents = tuple(gender_parents)
+        self.size = len(self.kinds)
+        self.children = {}
+        self.gender_children = {}
+        self.inflection_positions = {}
+        self.inflection_children = {}
+        for position in range(self.size):
+            if self.parents[position] >= 0:
+                self.children.setdefault(self.parents[position], []).append(position)
+            if self.gender_parents[position] >= 0:
+                self.gender_children.setdefault(self.gender_parents[position], []).append(position)
+
+    @classmethod
+    def from_graph(cls, label, slots, graph):
+        """
+        Function that creates the template of a lexeme built into a CompactGraph of its own, from vertex 0
+        """
+        return cls(label, slots, graph.kinds, graph.inflections, graph.parents, graph.gender_parents)
+
+    def key(self):
+        return self.label, self.slots
+
+    def positions_with_inflection(self, gender=None, case=None):
+        """
+        Function that returns positions of the vertices with a given gender and case, None for any,
+        computed once per template
+        """
+        positions = self.inflection_positions.get((gender, case))
+        if positions is None:
+            positions = []
+            for position, inflection in enumerate(self.inflections):
+                if inflection != 0:
+                    vertex_gender, vertex_case = INFLECTIONS[inflection]
+                    if (gender is None or vertex_gender == gender) and (case is None or vertex_case == case):
+                        positions.append(position)
+            self.inflection_positions[(gender, case)] = positions
+        return positions
+
+    def gender_children_by_inflection(self, position):
+        """
+        Function that returns positions of the gender children of a position by their packed inflection,
+        computed once per template, None if the position has no gender children
+        """
+        index = self.inflection_children.get(position)
+        if index is None and position in self.gender_children:
+            index = {}
+            for child in self.gender_children[position]:
+                index.setdefault(self.inflections[child], []).append(child)
+            self.inflection_children[position] = index
+        return index
+
+    def memory_footprint(self):
+        size = sys.getsizeof(self) + sys.getsizeof(self.__dict__)
+        size += sum(sys.getsizeof(value) for value in [self.slots, self.kinds, self.inflections, self.parents,
+                                                         self.gender_parents, self.children, self.gender_children,
+                                                         self.inflection_positions, self.inflection_children])
+        size += sum(sys.getsizeof(index) + sum(sys.getsizeof(positions) for positions in index.values())
+                    for index in self.inflection_children.values())
+        return size + sum(sys.getsizeof(positions) for positions in itertools.chain(
+            self.children.values(), self.gender_children.values(), self.inflection_positions.values()))
+
+
+class TemplateGraph(ArrayGraph):
+    """
+    Graph of lexemes laid out by build_graph, with the query interface of CompactGraph
+
+    Every lexeme is a run of ids starting with its infinitive. Lexemes with the same label and slots
+    of derivatives share a ParadigmTemplate with their vertices, tags and edges, so a form is kept as
+    the template of its lexeme and its position in the lexeme instead of the arrays and adjacency
+    lists of a CompactGraph. Vertices are added a whole lexeme at a time, see add_lexeme.
+
+        Attributes:
+            templates ([ParadigmTemplate]): distinct templates in the order of their first lexeme
+            template_ids (array): index in templates of the template of every vertex
+            positions (array): position of every vertex in its lexeme, the lexeme starts at id - position
+            relationships (dict): see ArrayGraph
+            inflection_index (ArrayGraph.csr_adjacency): see ArrayGraph
+    """
+
+    def __init__(self):
+        super().__init__(0)
+        self.templates = []
+        self.__template_index__ = {}
+        self.template_ids = array.array("H")
+        self.positions = array.array("H")
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["template_ids"] = st.to_array(self.template_ids)
+        state["positions"] = st.to_array(self.positions)
+        return state
+
+    def template_id(self, label, slots):
+        """
+        Function that returns the index of the template of a given label and slots, None if it was not added
+        """
+        return self.__template_index__.get((label, slots))
+
+    def add_template(self, template):
+        """
+        Function that adds a template unless an equal one was already added
+
+            Args:
+                template (ParadigmTemplate): template of a lexeme
+
+            Returns:
+                template_id (int): index of the template in templates
+        """
+        template_id = self.__template_index__.get(template.key())
+        if template_id is None:
+            template_id = self.__template_index__[template.key()] = len(self.templates)
+            self.templates.append(template)
+            if template_id == 1 << 16:
+                self.template_ids = array.array("I", self.template_ids)
+        return template_id
+
+    def add_lexeme(self, template_id):
+        """
+        Function that adds the vertices of a lexeme after the last vertex
+
+            Args:
+                template_id (int): index of the template of the lexeme
+
+            Returns:
+                lexem_id (int): id of the infinitive of the lexeme
+        """
+        lexem_id = self.size
+        size = self.templates[template_id].size
+        self.template_ids.extend(itertools.repeat(template_id, size))
+        self.positions.extend(range(size))
+        self.size += size
+        self.inflection_index = None
+        return lexem_id
+
+    def extend(self, other):
+        """
+        Function that appends the lexemes of another graph after the lexemes of this one
+
+            Args:
+                other (TemplateGraph): graph whose vertex i becomes vertex self.size + i
+
+            Returns:
+                None
+        """
+        shift = self.size
+        template_map = [self.add_template(template) for template in other.templates]
+        if template_map == list(range(len(template_map))):
+            self.template_ids += array.array(self.template_ids.typecode, other.template_ids)
+        else:
+            self.template_ids += array.array(self.template_ids.typecode,
+                                             [template_map[template_id] for template_id in other.template_ids])
+        self.positions += other.positions
+        self.__extend_relationships__(other, shift)
+        self.size += other.size
+        self.inflection_index = None
+
+    def __lexeme_templates__(self):
+        """
+        Function that returns the lexemes of the graph in the order of ids
+
+            Returns:
+                lexemes (iterator): (id of the infinitive, ParadigmTemplate) of every lexeme
+        """
+        template_ids, templates = self.template_ids, self.templates
+        lexem_id = 0
+        while lexem_id < self.size:
+            template = templates[template_ids[lexem_id]]
+            yield lexem_id, template
+            lexem_id += template.size
+
+    def lexemes(self):
+        """
+        Function that returns the lexemes of the graph with the slots of their templates
+
+            Returns:
+                lexemes (iterator): (id of the infinitive, label, [slots of the derivatives]) in the order of ids
+        """
+        for lexem_id, template in self.__lexeme_templates__():
+            yield lexem_id, template.label, list(template.slots)
+
+    def to_buffers(self):
+        """
+        Function that returns the graph as flat arrays, see from_buffers
+
+        Templates are stored one after another, offsets give the first position of every template.
+
+            Returns:
+                buffers (dict): name -> array
+                meta (dict): JSON serializable part of the graph
+        """
+        templates = self.templates
+        labels = list(dict.fromkeys(template.label for template in templates))
+        label_index = {label: index for index, label in enumerate(labels)}
+        offsets = array.array("I", [0])
+        offsets.extend(itertools.accumulate(template.size for template in templates))
+        buffers = {
+            "graph.template_ids": self.template_ids,
+            "graph.positions": self.positions,
+            "graph.templates.offsets": offsets,
+            "graph.templates.label_ids": array.array("H", [label_index[template.label] for template in templates]),
+            "graph.templates.slots": array.array("H", itertools.chain.from_iterable((0,) + template.slots
+                                                                                    for template in templates)),
+            "graph.templates.kinds": array.array("B", b"".join(template.kinds for template in templates)),
+            "graph.templates.inflections": array.array("B", b"".join(template.inflections for template in templates)),
+            "graph.templates.parents": array.array("i", itertools.chain.from_iterable(
+                template.parents for template in templates)),
+            "graph.templates.gender_parents": array.array("i", itertools.chain.from_iterable(
+                template.gender_parents for template in templates)),
+            "graph.inflection_index.offsets": self.__inflection_index__().offsets,
+            "graph.inflection_index.targets": self.__inflection_index__().targets,
+        }
+        self.__relationship_buffers__(buffers)
+        return buffers, {"size": self.size, "labels": labels, "templates": len(templates),
+                         "relationships": list(self.relationships)}
+
+    @classmethod
+    def from_buffers(cls, buffers, meta):
+        """
+        Function that creates a graph over arrays returned by to_buffers, possibly memory-mapped
+
+        Only the templates are copied, template ids and positions of the vertices are used as they are.
+
+            Args:
+                buffers (dict): name -> array or memoryview
+                meta (dict): JSON serializable part of the graph
+
+            Returns:
+                template_graph (TemplateGraph): graph using the given buffers
+        """
+        template_graph = cls()
+        template_graph.size = meta["size"]
+        template_graph.template_ids = buffers["graph.template_ids"]
+        template_graph.positions = buffers["graph.positions"]
+
+        offsets = buffers["graph.templates.offsets"]
+        label_ids, slots = buffers["graph.templates.label_ids"], buffers["graph.templates.slots"]
+        kinds, inflections = buffers["graph.templates.kinds"], buffers["graph.templates.inflections"]
+        parents, gender_parents = buffers["graph.templates.parents"], buffers["graph.templates.gender_parents"]
+        for template_id in range(meta["templates"]):
+            begin, end = offsets[template_id], offsets[template_id + 1]
+            template = ParadigmTemplate(meta["labels"][label_ids[template_id]], slots[begin + 1:end],
+                                        kinds[begin:end], inflections[begin:end], parents[begin:end],
+                                        gender_parents[begin:end])
+            template_graph.__template_index__[template.key()] = template_id
+            template_graph.templates.append(template)
+
+        template_graph.inflection_index = cls.csr_adjacency(INFLECTION_CODES, index_typecode(template_graph.size))
+        template_graph.inflection_index.offsets = buffers["graph.inflection_index.offsets"]
+        template_graph.inflection_index.targets = buffers["graph.inflection_index.targets"]
+        template_graph.__open_relationships__(buffers, meta)
+        return template_graph
+
+    def to_compact(self):
+        """
+        Function that converts the graph into a CompactGraph
+
+            Returns:
+                compact_graph (CompactGraph): graph with the same vertices, edges and relationships
+        """
+        compact_graph = CompactGraph(self.size)
+        for lexem_id, template in self.__lexeme_templates__():
+            for position, kind in enumerate(template.kinds):
+                vertex = lexem_id + position
+                label = template.label if position == 0 else None
+                if kind == self.GENDER_VERTEX:
+                    gender, case = INFLECTIONS[template.inflections[position]]
+                    compact_graph.add_gender_vertex(vertex, label, case, gender)
+                elif kind == self.PLAIN_VERTEX:
+                    compact_graph.add_vertex(vertex, label)
+                if template.parents[position] >= 0:
+                    compact_graph.add_edge(lexem_id + template.parents[position], vertex)
+                if template.gender_parents[position] >= 0:
+                    compact_graph.add_gender_edge(lexem_id + template.gender_parents[position], vertex)
+        compact_graph.finalize()
+        compact_graph.relationships = dict(self.relationships)
+        return compact_graph
+
+    def to_graph(self):
+        return self.to_compact().to_graph()
+
+    def __inflection_index__(self):
+        if self.inflection_index is None:
+            inflections = b"".join(template.inflections for _, template in self.__lexeme_templates__())
+            self.inflection_index = self.csr_adjacency.from_parents(inflections, index_typecode(self.size),
+                                                                    INFLECTION_CODES)
+        return self.inflection_index
+
+    def get_inflection(self, id):
+        inflection = self.templates[self.template_ids[id]].inflections[self.positions[id]]
+        if inflection == 0:
+            return [None, None]
+        return list(INFLECTIONS[inflection])
+
+    def get_children(self, id):
+        position = self.positions[id]
+        children = self.templates[self.template_ids[id]].children.get(position)
+        if children is None:
+            return None
+        lexem_id = id - position
+        return [lexem_id + child for child in children]
+
+    def get_parent(self, id):
+        position = self.positions[id]
+        parent = self.templates[self.template_ids[id]].parents[position]
+        return None if parent < 0 else id - position + parent
+
+    def get_gender_parent(self, id):
+        position = self.positions[id]
+        parent = self.templates[self.template_ids[id]].gender_parents[position]
+        return None if parent < 0 else id - position + parent
+
+    def get_gender_children(self, id):
+        position = self.positions[id]
+        children = self.templates[self.template_ids[id]].gender_children.get(position)
+        if children is None:
+            return None
+        lexem_id = id - position
+        return [lexem_id + child for child in children]
+
+    def get_lexeme_vertices_with_inflection(self, lexem_id, gender=None, case=None):
+        positions = self.templates[self.template_ids[lexem_id]].positions_with_inflection(gender, case)
+        return [lexem_id + position for position in positions]
+
+    def get_gender_children_by_inflection(self, id):
+        position = self.positions[id]
+        return id - position, self.templates[self.template_ids[id]].gender_children_by_inflection(position)
+
+    def has_gender(self, id):
+        return self.templates[self.template_ids[id]].kinds[self.positions[id]] == self.GENDER_VERTEX
+
+    def get_label(self, id):
+        return self.templates[self.template_ids[id]].label if self.positions[id] == 0 else None
+
+    def memory_footprint(self):
+        """
+        Function that returns an estimate of the memory held by the graph
+
+            Returns:
+                size (int): Number of bytes used by the arrays, templates and relationships
+        """
+        size = sum(buffer.itemsize * len(buffer) for buffer in [self.template_ids, self.positions])
+        size += sys.getsizeof(self.templates) + sum(template.memory_footprint() for template in self.templates)
+        if self.inflection_index is not None:
+            size += self.inflection_index.nbytes()
+        return size + self.__relationships_footprint__()
@@ -0,0 +1,49 @@
+import threading
+
+
+class ReadersWriterLock:
+    """
+    Lock held by many readers or a single writer at a time
+
+    A waiting writer blocks readers that come after it, so a stream of queries cannot starve
+    a loading relationship file. The lock is not reentrant, a thread holding it must not
+    acquire it again.
+
+        Attributes:
+            readers (int): number of threads holding the lock for reading
+            writer (bool): True if a thread holds the lock for writing
+            waiting_writers (int): number of threads waiting to write
+    """
+
+    def __init__(self):
+        # readers take only the mutex, the condition built on it is used only for waiting
+        self.mutex = threading.Lock()
+        self.condition = threading.Condition(self.mutex)
+        self.readers = 0
+        self.writer = False
+        self.waiting_writers = 0
+
+    def acquire_read(self):
+        with self.mutex:
+            while self.writer or self.waiting_writers:
+                self.condition.wait()
+            self.readers += 1
+
+    def release_read(self):
+        with self.mutex:
+            self.readers -= 1
+            if not self.readers:
+                self.condition.notify_all()
+
+    def acquire_write(self):
+        with self.mutex:
+            self.waiting_writers += 1
+            while self.writer or self.readers:
+                self.condition.wait()
+            self.waiting_writers -= 1
+            self.writer = True
+
+    def release_write(self):
+        with self.mutex:
+            self.writer = False
+            self.condition.notify_all()
@@ -0,0 +1,204 @@
+from time import perf_counter
+import bisect
+import contextlib
+import threading
+
+# upper bounds of the latency buckets in seconds, queries take from a microsecond to a second
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 1e-2, 0.1, 1.0)
+
+# upper bounds of the buckets of candidate combinations of multisegment queries
+COUNT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 256, 1024, 4096, 16384, 65536)
+
+
+class Histogram:
+    """
+    Counts of observed values in buckets with fixed upper bounds
+
+        Args:
+            bounds (tuple(float)): increasing upper bounds of the buckets, a last bucket without a bound follows
+
+        Attributes:
+            counts ([int]): number of values in every bucket, not cumulative
+            count (int): number of observed values
+            sum (float): sum of observed values
+    """
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self):
+        """
+        Function that returns the histogram with cumulative buckets, as in the Prometheus format
+
+            Returns:
+                histogram (dict): count, sum and buckets, [upper bound, number of values not greater than it],
+                                  the last bound is "+Inf"
+        """
+        buckets = []
+        cumulative = 0
+        for bound, count in zip(list(self.bounds) + ["+Inf"], self.counts):
+            cumulative += count
+            buckets.append([bound, cumulative])
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+
+class Metrics:
+    """
+    Opt-in instrumentation of a Dictionary
+
+    Public methods record their calls and latencies, lock waits included. Trie lookups and decoding of
+    positional ids into word forms are recorded as steps, the rest of a query is spent in the graph.
+    Multisegment queries record the number of candidate combinations of their segments. Builds record
+    the time of their phases.
+
+        Attributes:
+            latencies (dict): method name -> Histogram of call times in seconds
+            steps (dict): step name -> [calls, seconds, items]
+            candidates (dict): method name -> Histogram of candidate combinations
+            phases (dict): build phase name -> seconds, summed over builds
+
+        All methods can be called from many threads at once.
+    """
+
+    def __init__(self):
+        self.latencies = {}
+        self.steps = {}
+        self.candidates = {}
+        self.phases = {}
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop("lock")
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def reset(self):
+        with self.lock:
+            self.latencies = {}
+            self.steps = {}
+            self.candidates = {}
+            self.phases = {}
+
+    def observe_call(self, name, seconds):
+        with self.lock:
+            histogram = self.latencies.get(name)
+            if histogram is None:
+                histogram = self.latencies[name] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def observe_step(self, name, start, items=1):
+        """
+        Function that records a step of a query that started at a given time
+
+            Args:
+                name (str): name of the step, e.g. "trie_lookup"
+                start (float): perf_counter at the beginning of the step
+                items (int): number of handled items, e.g. decoded words
+        """
+        seconds = perf_counter() - start
+        with self.lock:
+            step = self.steps.get(name)
+            if step is None:
+                step = self.steps[name] = [0, 0.0, 0]
+            step[0] += 1
+            step[1] += seconds
+            step[2] += items
+
+    def observe_candidates(self, name, combinations):
+        with self.lock:
+            histogram = self.candidates.get(name)
+            if histogram is None:
+                histogram = self.candidates[name] = Histogram(COUNT_BUCKETS)
+            histogram.observe(combinations)
+
+    def add_phase(self, name, seconds):
+        with self.lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, perf_counter() - start)
+
+    def to_dict(self):
+        """
+        Function that returns all recorded values
+
+            Returns:
+                metrics (dict): "calls" (method name -> latency histogram in seconds),
+                                "steps" (step name -> calls, seconds and items),
+                                "multisegment_candidates" (method name -> histogram of combinations),
+                                "build_phases" (phase name -> seconds)
+        """
+        with self.lock:
+            return {
+                "calls": {name: histogram.to_dict() for name, histogram in sorted(self.latencies.items())},
+                "steps": {name: {"calls": step[0], "seconds": step[1], "items": step[2]}
+                          for name, step in sorted(self.steps.items())},
+                "multisegment_candidates": {name: histogram.to_dict()
+                                            for name, histogram in sorted(self.candidates.items())},
+                "build_phases": dict(sorted(self.phases.items())),
+            }
+
+    def to_prometheus(self, prefix="dictionary"):
+        """
+        Function that returns all recorded values in the Prometheus text exposition format
+
+            Args:
+                prefix (str): prefix of the metric names
+
+            Returns:
+                text (str): metric families separated with new lines
+        """
+        metrics = self.to_dict()
+        lines = []
+        write_histograms(lines, prefix + "_call_seconds", "Latency of dictionary methods", "method",
+                         metrics["calls"])
+        write_histograms(lines, prefix + "_multisegment_candidates",
+                         "Candidate combinations of multisegment queries", "method",
+                         metrics["multisegment_candidates"])
+
+        for field, kind, help_text in [("calls", "counter", "Number of query steps"),
+                                       ("seconds", "counter", "Time spent in query steps"),
+                                       ("items", "counter", "Items handled by query steps")]:
+            name = "{}_step_{}_total".format(prefix, field)
+            lines += ["# HELP {} {}".format(name, help_text), "# TYPE {} {}".format(name, kind)]
+            for step, values in metrics["steps"].items():
+                lines.append('{}{{step="{}"}} {}'.format(name, step, values[field]))
+
+        name = prefix + "_build_phase_seconds"
+        lines += ["# HELP {} Time spent in build phases".format(name), "# TYPE {} gauge".format(name)]
+        for phase, seconds in metrics["build_phases"].items():
+            lines.append('{}{{phase="{}"}} {}'.format(name, phase, seconds))
+        return "\n".join(lines) + "\n"
+
+
+def write_histograms(lines, name, help_text, label, histograms):
+    lines += ["# HELP {} {}".format(name, help_text), "# TYPE {} histogram".format(name)]
+    for value, histogram in histograms.items():
+        for bound, count in histogram["buckets"]:
+            lines.append('{}_bucket{{{}="{}",le="{}"}} {}'.format(name, label, value, bound, count))
+        lines.append('{}_sum{{{}="{}"}} {}'.format(name, label, value, histogram["sum"]))
+        lines.append('{}_count{{{}="{}"}} {}'.format(name, label, value, histogram["count"]))
+
+
+def phase(metrics, name):
+    """
+    Function that returns a context manager recording a build phase, doing nothing if metrics is None
+    """
+    return contextlib.nullcontext() if metrics is None else metrics.phase(name)
@@ -1,19 +1,353 @@
+import array
+import bisect
+import itertools
+
+import src.dict.subclasses.graph as gr
+import src.dict.subclasses.storage as st
+
+
+def swap_interchangeable(ids, interchangeable):
+    """
+    Function that returns ids of a multisegment with its interchangeable segments, counted from 1, swapped
+    """
+    tmp = list(ids)
+    tmp[interchangeable[0]-1],tmp[interchangeable[1]-1] = tmp[interchangeable[1]-1],tmp[interchangeable[0]-1]
+    return tuple(tmp)
+
+
 class multisegmented_module:
-    def __init__(self):
-        self.multisegmented = {}
+    """
+    Multisegments with an index that prunes candidate combinations segment by segment
+
+    The index is a trie kept level by level in flat arrays, so that a stored index is memory-mapped
+    instead of rebuilt. Added multisegments are staged and indexed all at once by build, queries
+    only read the index and do not see staged multisegments until build is called.
+
+        Args:
+            infos (list): distinct [stable_list, interchangeable] of the indexed multisegments
+            labels ([array]): ids of the segments of every level of the trie, the i-th level holds i-th segments,
+                              sorted among the children of a node
+            ends ([array]): index in infos of the multisegment ending at a node of every level, -1 if none
+            offsets ([array]): children of the j-th node of a level are nodes offsets[j]:offsets[j + 1]
+                               of the next level
+            buckets (array): first segments with id >> shift equal to b are nodes buckets[b]:buckets[b + 1]
+                             of the first level, which is much larger than the ranges of children
+            shift (int): number of low bits of the ids of first segments in a single bucket
+
+        Attributes:
+            staged (list): (ids, info) added since the last build, in the order of addition
+    """
+
+    def __init__(self, infos=None, labels=None, ends=None, offsets=None, buckets=None, shift=0):
+        self.infos = infos or []
+        self.labels = labels or []
+        self.ends = ends or []
+        self.offsets = offsets or []
+        self.buckets = array.array("i") if buckets is None else buckets
+        self.shift = shift
+        self.staged = []
 
     def add_multisegmented(self, ids, stable_list, interchangeable):
-        if ids not in self.multisegmented:
-            self.multisegmented[ids] = [stable_list, interchangeable]
+        """
+        Function that stages a multisegment, and the multisegment with the interchangeable segments swapped;
+        a multisegment that was added before keeps its first info
+        """
+        self.add_entry(ids, [stable_list, interchangeable])
+        if interchangeable is not None:
+            self.add_entry(swap_interchangeable(ids, interchangeable), [stable_list, interchangeable])
+
+    def add_multisegmented_many(self, multisegments):
+        """
+        Function that stages many multisegments, as add_multisegmented called for each of them in order
+
+            Args:
+                multisegments (iterable(tuple)): (ids, stable_list, interchangeable) of every multisegment
 
+            Returns:
+                None
+        """
+        infos = {}
+        for ids, stable_list, interchangeable in multisegments:
+            key = (tuple(stable_list), None if interchangeable is None else tuple(interchangeable))
+            info = infos.get(key)
+            if info is None:
+                info = infos[key] = [stable_list, interchangeable]
+            self.staged.append((ids, info))
             if interchangeable is not None:
-                tmp = list(ids)
-                tmp[interchangeable[0]-1],tmp[interchangeable[1]-1] = tmp[interchangeable[1]-1],tmp[interchangeable[0]-1]
-                other_ids = tuple(tmp)
-                self.multisegmented[other_ids] = [stable_list, interchangeable]
+                self.staged.append((swap_interchangeable(ids, interchangeable), info))
+
+    def add_entry(self, ids, info):
+        """
+        Function that stages a single multisegment, without adding the swapped order
+
+            Args:
+                ids (tuple(int)): ids of the segments
+                info (list): [stable_list, interchangeable]
+
+            Returns:
+                None
+        """
+        self.staged.append((tuple(ids), info))
+
+    def build(self):
+        """
+        Function that indexes staged multisegments together with the indexed ones
+
+        Every multisegment is sorted once and its trie nodes are appended level by level,
+        the time is linear in the number of segments apart from the sort.
+
+            Returns:
+                None
+        """
+        if not self.staged:
+            return
+
+        # infos are shared by many multisegments, they are compared by value once per distinct object
+        info_objects = {}
+        info_index = {}
+        infos = []
+        entries = {}
+        for ids, info in itertools.chain(self.entries(), self.staged):
+            if ids in entries or not ids:
+                continue
+            position = info_objects.get(id(info))
+            if position is None:
+                key = (tuple(info[0]), None if info[1] is None else tuple(info[1]))
+                if key not in info_index:
+                    info_index[key] = len(infos)
+                    infos.append([list(info[0]), None if info[1] is None else list(info[1])])
+                position = info_objects[id(info)] = info_index[key]
+            entries[ids] = position
+
+        depth = max(map(len, entries), default=0)
+        labels = [array.array("q") for _ in range(depth)]
+        ends = [array.array("q") for _ in range(depth)]
+        offsets = [array.array("q") for _ in range(depth)]
+        previous = ()
+        for ids in sorted(entries):
+            common = 0
+            while common < len(previous) and common < len(ids) and previous[common] == ids[common]:
+                common += 1
+            for level in range(common, len(ids)):
+                labels[level].append(ids[level])
+                ends[level].append(-1)
+                offsets[level].append(len(labels[level + 1]) if level + 1 < depth else 0)
+            ends[len(ids) - 1][-1] = entries[ids]
+            previous = ids
+
+        for level in range(depth):
+            offsets[level].append(len(labels[level + 1]) if level + 1 < depth else 0)
+        self.infos = infos
+        self.labels = [array.array(gr.index_typecode(max(level_labels) + 1), level_labels) for level_labels in labels]
+        self.ends = [array.array(gr.index_typecode(len(infos)), level_ends) for level_ends in ends]
+        self.offsets = [array.array(gr.index_typecode(level_offsets[-1] + 1), level_offsets)
+                        for level_offsets in offsets]
+        self.buckets, self.shift = self.__first_buckets__(self.labels[0] if self.labels else [])
+        self.staged = []
+
+    @staticmethod
+    def __first_buckets__(first_labels):
+        """
+        Function that groups sorted ids of first segments into about as many buckets as there are ids
+
+            Returns:
+                buckets (array): first ids with id >> shift equal to b are first_labels[buckets[b]:buckets[b + 1]]
+                shift (int): number of low bits of the ids in a single bucket
+        """
+        if not first_labels:
+            return array.array("i"), 0
+        shift = max(0, first_labels[-1].bit_length() - len(first_labels).bit_length())
+        counts = array.array("q", [0]) * ((first_labels[-1] >> shift) + 2)
+        for label in first_labels:
+            counts[(label >> shift) + 1] += 1
+        return array.array(gr.index_typecode(len(first_labels) + 1), itertools.accumulate(counts)), shift
+
+    def __first_node__(self, segment_id):
+        """
+        Function that returns the node of a first segment, None if no multisegment starts with it
+        """
+        bucket = segment_id >> self.shift
+        if bucket + 1 >= len(self.buckets):
+            return None
+        labels = self.labels[0]
+        node = bisect.bisect_left(labels, segment_id, self.buckets[bucket], self.buckets[bucket + 1])
+        if node == self.buckets[bucket + 1] or labels[node] != segment_id:
+            return None
+        return node
+
+    def entries(self):
+        """
+        Function that returns indexed multisegments, staged ones are not included
+
+            Returns:
+                entries (generator(tuple)): (ids, info) of every multisegment, in the order of ids
+        """
+        if not self.labels:
+            return
+        ids = []
+        stack = [(0, 0, len(self.labels[0]))]
+        while stack:
+            level, node, end = stack[-1]
+            del ids[level:]
+            if node == end:
+                stack.pop()
+                continue
+
+            stack[-1] = (level, node + 1, end)
+            ids.append(self.labels[level][node])
+            if self.ends[level][node] >= 0:
+                yield tuple(ids), self.infos[self.ends[level][node]]
+            offsets = self.offsets[level]
+            if offsets[node] < offsets[node + 1]:
+                stack.append((level + 1, offsets[node], offsets[node + 1]))
+
+    def __find_node__(self, ids):
+        """
+        Function that returns the trie node of the last segment of ids
+
+            Returns:
+                node (int): index of the node in the level of len(ids) - 1, None if there is no such node
+        """
+        if not ids or len(ids) > len(self.labels):
+            return None
+        node = self.__first_node__(ids[0])
+        for level in range(1, len(ids)):
+            if node is None:
+                return None
+            labels = self.labels[level]
+            low, high = self.offsets[level - 1][node], self.offsets[level - 1][node + 1]
+            node = bisect.bisect_left(labels, ids[level], low, high)
+            if node == high or labels[node] != ids[level]:
+                return None
+        return node
 
     def is_multisegmented(self, ids):
-        return ids in self.multisegmented.keys()
+        return self.get_multitsegmented_info(ids) is not None
 
     def get_multitsegmented_info(self, ids):
-        return self.multisegmented.get(ids)
\ No newline at end of file
+        node = self.__find_node__(ids)
+        if node is None:
+            return None
+        info = self.ends[len(ids) - 1][node]
+        return None if info < 0 else self.infos[info]
+
+    def first_segments(self):
+        """
+        Function that returns ids of the first segments of all multisegments, without repetitions
+        """
+        return list(self.labels[0]) if self.labels else []
+
+    def max_length(self):
+        """
+        Function that returns the number of segments of the longest multisegment, 0 if there are none
+        """
+        return len(self.labels)
+
+    def find_multisegmented(self, possible_ids_list):
+        """
+        Function that returns the first multisegment made of the given candidates
+
+        Candidates are checked in the order of itertools.product(*possible_ids_list), but a prefix
+        that does not start any multisegment is never extended.
+
+            Args:
+                possible_ids_list ([iterable(int)]): candidate ids for every segment
+
+            Returns:
+                ids (tuple(int)): ids of the multisegment, None if no combination is a multisegment
+        """
+        return self.find_multisegmented_info(possible_ids_list)[0]
+
+    def find_multisegmented_info(self, possible_ids_list):
+        """
+        Function that returns the first multisegment made of the given candidates, as find_multisegmented,
+        together with its info
+
+            Returns:
+                ids (tuple(int)): ids of the multisegment, None if no combination is a multisegment
+                info (list): [stable_list, interchangeable] of the multisegment or None
+        """
+        candidates = [list(possible_ids) for possible_ids in possible_ids_list]
+        labels = self.labels
+        if not candidates or len(candidates) > len(labels):
+            return None, None
+
+        last = len(candidates) - 1
+        combination = [None] * len(candidates)
+        buckets, shift, first_labels = self.buckets, self.shift, labels[0]
+        for first_id in candidates[0]:
+            # __first_node__, inlined as it is called for every candidate
+            if first_id is None or (first_id >> shift) + 1 >= len(buckets):
+                continue
+            high = buckets[(first_id >> shift) + 1]
+            node = bisect.bisect_left(first_labels, first_id, buckets[first_id >> shift], high)
+            if node == high or first_labels[node] != first_id:
+                continue
+            combination[0] = first_id
+            if last == 0:
+                if self.ends[0][node] >= 0:
+                    return tuple(combination), self.infos[self.ends[0][node]]
+                continue
+
+            # every following level keeps the range of the children of the chosen prefix
+            # and the candidates left to check
+            stack = [(self.offsets[0][node], self.offsets[0][node + 1], iter(candidates[1]))]
+            while stack:
+                level = len(stack)
+                low, high, remaining = stack[-1]
+                level_labels = labels[level]
+                for segment_id in remaining:
+                    if segment_id is not None:
+                        node = bisect.bisect_left(level_labels, segment_id, low, high)
+                        if node != high and level_labels[node] == segment_id:
+                            break
+                else:
+                    stack.pop()
+                    continue
+
+                combination[level] = segment_id
+                if level == last:
+                    if self.ends[level][node] >= 0:
+                        return tuple(combination), self.infos[self.ends[level][node]]
+                else:
+                    offsets = self.offsets[level]
+                    stack.append((offsets[node], offsets[node + 1], iter(candidates[level + 1])))
+        return None, None
+
+    def to_buffers(self):
+        """
+        Function that returns the indexed multisegments as flat arrays and a JSON serializable part
+
+            Returns:
+                buffers (dict): name -> array
+                meta (dict): infos and number of levels
+        """
+        buffers = {}
+        for level in range(len(self.labels)):
+            name = "multisegmented.{}.".format(level)
+            buffers[name + "labels"] = self.labels[level]
+            buffers[name + "ends"] = self.ends[level]
+            buffers[name + "offsets"] = self.offsets[level]
+        buffers["multisegmented.buckets"] = self.buckets
+        return buffers, {"infos": self.infos, "levels": len(self.labels), "shift": self.shift}
+
+    @classmethod
+    def from_buffers(cls, buffers, meta):
+        """
+        Function that creates the index over arrays returned by to_buffers, possibly memory-mapped
+        """
+        names = ["multisegmented.{}.".format(level) for level in range(meta["levels"])]
+        return cls(meta["infos"], [buffers[name + "labels"] for name in names],
+                   [buffers[name + "ends"] for name in names], [buffers[name + "offsets"] for name in names],
+                   buffers["multisegmented.buckets"], meta["shift"])
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in ["labels", "ends", "offsets"]:
+            state[name] = list(map(st.to_array, state[name]))
+        state["buckets"] = st.to_array(state["buckets"])
+        return state
+
+    def nbytes(self):
+        return sum(buffer.itemsize * len(buffer)
+                   for buffer in itertools.chain(self.labels, self.ends, self.offsets, [self.buckets]))
@@ -0,0 +1,200 @@
+import itertools
+import sys
+
+import src.dict.subclasses.graph as gr
+
+
+class Overlay:
+    """
+    Mutable layer of lexemes added to or removed from a static dictionary, with the interface of CompactGraph
+
+    Ids lower than base_size belong to the static graph, added forms get the following ids and their
+    vertices are kept in an object based Graph. Removed lexemes stay in both graphs, their ids are
+    only hidden from lookups.
+
+        Args:
+            base (gr.TemplateGraph): graph of the static dictionary
+            base_size (int): number of positional ids of the static dictionary
+
+        Attributes:
+            graph (gr.Graph): vertices of the added forms
+            words ([str]): added word forms, the form with id base_size + i is words[i]
+            forms (dict): added word form -> ids of its occurrences, in the order of addition
+            lexemes (dict): id of an added infinitive -> (infinitive, label, derivatives) of its line
+            removed (frozenset): ids of all forms of removed lexemes
+            version (int): number of changes, compared by compaction
+    """
+
+    def __init__(self, base, base_size):
+        self.base = base
+        self.base_size = base_size
+        self.graph = gr.Graph()
+        self.words = []
+        self.forms = {}
+        self.lexemes = {}
+        self.removed = frozenset()
+        self.version = 0
+
+    @property
+    def relationships(self):
+        return self.base.relationships
+
+    def next_id(self):
+        return self.base_size + len(self.words)
+
+    def add_forms(self, infinitive, label, derivatives, forms):
+        """
+        Function that adds the word forms of a lexeme whose vertices were already added to graph
+
+            Args:
+                infinitive (str): infinitive of the lexeme
+                label (str): flexographic label
+                derivatives ([str]): derivatives as in the basic file, "#" and "##" mark missing forms
+                forms ([str]): infinitive and present derivatives, they get ids from next_id() on
+
+            Returns:
+                lexem_id (int): id of the infinitive
+        """
+        lexem_id = self.next_id()
+        self.words += forms
+        for form_id, form in enumerate(forms, lexem_id):
+            # a new list is published, so that readers never see a half updated one
+            self.forms[form] = self.forms.get(form, []) + [form_id]
+        self.lexemes[lexem_id] = (infinitive, label, derivatives)
+        self.version += 1
+        return lexem_id
+
+    def remove_ids(self, ids):
+        self.removed = self.removed | frozenset(ids)
+        self.version += 1
+
+    def ids(self, word, base_ids):
+        """
+        Function that returns ids of a word form visible through the overlay
+
+            Args:
+                word (str): word form
+                base_ids ([int]): ids of the form in the static dictionary
+
+            Returns:
+                ids ([int]): ids that are not removed, static ones first, None if there are none
+        """
+        ids = base_ids + self.forms.get(word, [])
+        if self.removed:
+            ids = [word_id for word_id in ids if word_id not in self.removed]
+        return ids or None
+
+    def word(self, word_id):
+        return self.words[word_id - self.base_size]
+
+    def lexeme_size(self, lexem_id):
+        """
+        Function that returns the number of ids of a lexeme, including forms without a vertex
+
+            Args:
+                lexem_id (int): id of the infinitive
+
+            Returns:
+                size (int): the lexeme has ids lexem_id..lexem_id + size - 1
+        """
+        if lexem_id >= self.base_size:
+            _, _, derivatives = self.lexemes[lexem_id]
+            return 1 + sum(1 for derivative in derivatives if derivative != "#" and derivative != "##")
+
+        end = lexem_id + 1
+        while end < self.base_size and self.base.get_label(end) is None:
+            end += 1
+        return end - lexem_id
+
+    def add_vertex(self, vertex_index, label):
+        self.graph.add_vertex(vertex_index, label)
+
+    def add_gender_vertex(self, vertex_index, label, case, gender):
+        self.graph.add_gender_vertex(vertex_index, label, case, gender)
+
+    def add_edge(self, from_v, to_v):
+        self.graph.add_edge(from_v, to_v)
+
+    def add_gender_edge(self, from_v, to_v):
+        self.graph.add_gender_edge(from_v, to_v)
+
+    def add_relationship_edge(self, from_v, to_v, relationship_id):
+        self.base.add_relationship_edge(from_v, to_v, relationship_id)
+
+    def add_relationship_edges(self, relationship_id, sources, targets):
+        self.base.add_relationship_edges(relationship_id, sources, targets)
+
+    def get_inflection(self, id):
+        if id < self.base_size:
+            return self.base.get_inflection(id)
+        if id not in self.graph.nodes or not self.graph.has_gender(id):
+            return [None, None]
+        return self.graph.get_inflection(id)
+
+    def get_children(self, id):
+        if id < self.base_size:
+            return self.base.get_children(id)
+        return self.graph.get_children(id) if id in self.graph.nodes else None
+
+    def get_parent(self, id):
+        if id < self.base_size:
+            return self.base.get_parent(id)
+        return self.graph.get_parent(id) if id in self.graph.nodes else None
+
+    def get_gender_parent(self, id):
+        if id < self.base_size:
+            return self.base.get_gender_parent(id)
+        return self.graph.get_gender_parent(id) if self.has_gender(id) else None
+
+    def get_gender_children(self, id):
+        if id < self.base_size:
+            return self.base.get_gender_children(id)
+        return self.graph.get_gender_children(id) if self.has_gender(id) else None
+
+    def get_vertices_with_inflection(self, gender=None, case=None):
+        vertices = self.base.get_vertices_with_inflection(gender, case)
+        if self.removed:
+            vertices = (vertex for vertex in vertices if vertex not in self.removed)
+        added = [vertex for vertex, node in sorted(self.graph.nodes.items())
+                 if isinstance(node, gr.Graph.gender_node) and vertex not in self.removed
+                 and (gender is None or node.gender == gender) and (case is None or node.case == case)]
+        return itertools.chain(vertices, added)
+
+    def get_lexeme_vertices_with_inflection(self, lexem_id, gender=None, case=None):
+        if lexem_id < self.base_size:
+            return self.base.get_lexeme_vertices_with_inflection(lexem_id, gender, case)
+        return gr.lexeme_vertices_with_inflection(self, lexem_id, gender, case)
+
+    def get_gender_children_by_inflection(self, id):
+        if id < self.base_size:
+            return self.base.get_gender_children_by_inflection(id)
+        return gr.gender_children_by_inflection(self, id)
+
+    def has_gender(self, id):
+        if id < self.base_size:
+            return self.base.has_gender(id)
+        return id in self.graph.nodes and self.graph.has_gender(id)
+
+    def get_label(self, id):
+        if id < self.base_size:
+            return self.base.get_label(id)
+        return self.graph.get_label(id) if id in self.graph.nodes else None
+
+    def get_word_by_relationship(self, id, relationship_id):
+        related_ids = self.base.get_word_by_relationship(id, relationship_id)
+        if related_ids is None or not self.removed:
+            return related_ids
+        return [related_id for related_id in related_ids if related_id not in self.removed] or None
+
+    def memory_footprint(self):
+        """
+        Function that returns an estimate of the memory held by the static graph and the overlay
+
+            Returns:
+                size (int): Number of bytes
+        """
+        size = self.base.memory_footprint() + self.graph.memory_footprint()
+        size += sys.getsizeof(self.words) + sum(sys.getsizeof(word) for word in self.words)
+        size += sys.getsizeof(self.forms) + sum(sys.getsizeof(ids) for ids in self.forms.values())
+        size += sys.getsizeof(self.lexemes) + sys.getsizeof(self.removed)
+        return size
@@ -0,0 +1,91 @@
+import array
+import os
+
+import marisa_trie
+
+import src.dict.subclasses.storage as st
+
+# separator of the forms of a paradigm, it cannot occur in a basic file line
+SEPARATOR = "\t"
+
+TRIE_FILE = "paradigms.marisa"
+
+
+class ParadigmStore:
+    """
+    Derivatives of chosen infinitives kept as pre-joined strings
+
+    The paradigm of the infinitive with key id k of trie is the UTF-8 text
+    data[offsets[k]:offsets[k + 1]], its forms separated with SEPARATOR, so a lookup costs
+    a single decode and split instead of restoring every form from the trie of all forms.
+
+        Args:
+            paradigms (dict): infinitive -> list of its derivatives, as returned by get_children
+
+        Attributes:
+            trie (marisa_trie.Trie): stored infinitives
+            offsets (array): start of the paradigm of every key id in data, followed by the end of data
+            data (array or memoryview): joined paradigms encoded in UTF-8
+    """
+
+    def __init__(self, paradigms):
+        self.trie = marisa_trie.Trie(paradigms.keys())
+        encoded = [b""] * len(self.trie)
+        for word, forms in paradigms.items():
+            encoded[self.trie.key_id(word)] = SEPARATOR.join(forms).encode("utf8")
+
+        self.data = array.array("B", b"".join(encoded))
+        self.offsets = array.array("I" if len(self.data) < 1 << 32 else "Q", [0])
+        for paradigm in encoded:
+            self.offsets.append(self.offsets[-1] + len(paradigm))
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["offsets"] = st.to_array(self.offsets)
+        state["data"] = st.to_array(self.data)
+        return state
+
+    def __len__(self):
+        return len(self.trie)
+
+    def get(self, word):
+        """
+        Function that returns the stored derivatives of an infinitive
+
+            Args:
+                word (str): infinitive
+
+            Returns:
+                forms ([str]): new list of derivatives, None if the paradigm of the word is not stored
+        """
+        key_id = self.trie.get(word)
+        if key_id is None:
+            return None
+        return str(self.data[self.offsets[key_id]:self.offsets[key_id + 1]], "utf8").split(SEPARATOR)
+
+    def words(self):
+        return self.trie.keys()
+
+    def to_buffers(self):
+        return {"paradigm_offsets": self.offsets, "paradigm_data": self.data}
+
+    def save(self, path):
+        self.trie.save(os.path.join(path, TRIE_FILE))
+
+    @classmethod
+    def open(cls, path, buffers):
+        """
+        Function that creates a store over files written by save and arrays returned by to_buffers
+
+            Args:
+                path (str): directory of the stored dictionary
+                buffers (dict): name -> array or memoryview, possibly memory-mapped
+
+            Returns:
+                store (ParadigmStore): store using the given buffers without copying them
+        """
+        store = cls.__new__(cls)
+        store.trie = marisa_trie.Trie().mmap(os.path.join(path, TRIE_FILE))
+        store.offsets = buffers["paradigm_offsets"]
+        store.data = buffers["paradigm_data"]
+        return store
@@ -0,0 +1,206 @@
+import collections
+import re
+
+import src.dict.subclasses.exceptions as ex
+
+LABEL_PATTERN = re.compile(r"\*?[A-Z]+")
+
+# derivatives of gendered lexemes are arranged in seven cases of every gender, see graph.Genders and graph.Cases,
+# adjectives list more forms, but the ones past this slot are not added to the graph
+MAX_GENDERED_SLOT = 7 * 5 - 1
+
+# slots and sizes of lexemes are stored as unsigned shorts
+MAX_DERIVATIVES = (1 << 16) - 2
+
+Diagnostic = collections.namedtuple("Diagnostic", ["file", "line_number", "message"])
+
+
+def format_diagnostic(diagnostic):
+    location = ":".join(str(part) for part in diagnostic[:2] if part is not None)
+    return "{}: {}".format(location, diagnostic.message)
+
+
+def parse_line(line):
+    """
+    Function that splits a single line of a basic file and checks that it can be built
+
+    The line is split once, derivatives are stripped only if there is whitespace, as for str.strip,
+    between the label and the last colon.
+
+        Args:
+            line (str): <infinitive>:<flexographic label>:<derivatives separated with colon>:
+
+        Raises:
+            Parse_error: malformed line, without its location
+
+        Returns:
+            infinitive (str): Infinitive of the lexeme
+            flexographic_label (str): Sequence of capital letters, optionally with an asterisk at the beginning
+            derivatives ([str]): Derivatives in the fixed order of the label, "#" and "##" mark missing forms
+    """
+    fields = line.split(":")
+    if len(fields) < 3:
+        raise ex.Parse_error("expected <infinitive>:<label>:<derivatives>:, found {} colons".format(len(fields) - 1))
+
+    infinitive = fields[0].strip()
+    label = fields[1].strip()
+    if not infinitive:
+        raise ex.Parse_error("missing infinitive")
+    if LABEL_PATTERN.fullmatch(label) is None:
+        raise ex.Parse_error("invalid flexographic label {!r}".format(label))
+    if fields[-1] and not fields[-1].isspace():
+        raise ex.Parse_error("line does not end with a colon, its last form would be lost")
+
+    word_type = label[1] if label[0] == "*" else label[0]
+    if word_type == "C" or word_type == "D":
+        derivatives = fields[3:9] + fields[16:-3]
+    else:
+        derivatives = fields[3:-1]
+        if word_type == "A" and len(derivatives) > MAX_GENDERED_SLOT:
+            raise ex.Parse_error("{} derivatives of a noun, at most {} have a case and gender".format(
+                len(derivatives), MAX_GENDERED_SLOT))
+    if len(derivatives) > MAX_DERIVATIVES:
+        raise ex.Parse_error("{} derivatives, at most {} are supported".format(len(derivatives), MAX_DERIVATIVES))
+
+    # every character removed by str.strip other than the space is not printable
+    start, end = len(fields[0]) + len(fields[1]) + 2, len(line) - len(fields[-1])
+    if line.find(" ", start, end) != -1 or not line[start:end].isprintable():
+        derivatives = [derivative.strip() for derivative in derivatives]
+    return infinitive, label, derivatives
+
+
+def parse_lines(lines, file=None, first_line=1):
+    """
+    Function that parses lines of a basic file, skipping blank lines
+
+        Args:
+            lines (iterable(str)): lines of the file
+            file (str): name of the file, reported with errors
+            first_line (int): number of the first given line
+
+        Raises:
+            Parse_error: malformed line, with its location
+
+        Returns:
+            lexemes (generator(tuple)): result of parse_line for every line that is not blank
+    """
+    for line_number, line in enumerate(lines, first_line):
+        if line.isspace():
+            continue
+        try:
+            yield parse_line(line)
+        except ex.Parse_error as error:
+            raise ex.Parse_error(error.message, file, line_number) from None
+
+
+def parse_multisegmented_line(line):
+    """
+    Function that splits a single line of a multisegment file
+
+        Args:
+            line (str): <words>;<* or - for every segment>;<unused>;<positions of interchangeable segments>;
+
+        Raises:
+            Parse_error: malformed line, without its location
+
+        Returns:
+            words ([str]): segments, words with an asterisk are not segments
+            stable_list ([bool]): True for every segment that is not inflected
+            interchangeable ([int]): positions of two segments, counted from 1, that may be swapped, or None
+    """
+    fields = line.split(";")
+    if len(fields) < 5:
+        raise ex.Parse_error("expected <words>;<segments>;;<interchangeable>;, found {} semicolons".format(
+            len(fields) - 1))
+
+    words = fields[0].strip("# \t").split()
+    if "*" in fields[0]:
+        words = [word for word in words if "*" not in word]
+    stable_list = [flag == "-" for flag in fields[1] if flag == "*" or flag == "-"]
+    if not words:
+        raise ex.Parse_error("missing words")
+    if len(stable_list) < len(words):
+        raise ex.Parse_error("{} segments marked with * or -, expected {}".format(len(stable_list), len(words)))
+
+    interchangeable = None
+    positions = fields[3].strip()
+    if positions:
+        if len(positions) != 2 or not positions.isdigit() or not all(
+                1 <= int(position) <= len(words) for position in positions):
+            raise ex.Parse_error("invalid interchangeable segments {!r}".format(positions))
+        interchangeable = [int(positions[0]), int(positions[1])]
+    return words, stable_list, interchangeable
+
+
+def parse_multisegmented_lines(lines, file=None):
+    """
+    Function that parses lines of a multisegment file, skipping blank lines
+
+        Raises:
+            Parse_error: malformed line, with its location
+
+        Returns:
+            multisegments (generator(tuple)): result of parse_multisegmented_line for every line that is not blank
+    """
+    for line_number, line in enumerate(lines, 1):
+        if line.isspace():
+            continue
+        try:
+            yield parse_multisegmented_line(line)
+        except ex.Parse_error as error:
+            raise ex.Parse_error(error.message, file, line_number) from None
+
+
+def line_number_at(file, offset):
+    """
+    Function that returns the number of the line beginning at a byte offset of a file,
+    lines end as in str.splitlines, like the lines of a build
+    """
+    with open(file, "rb") as f:
+        return len(f.read(offset).decode("utf8", "replace").splitlines()) + 1
+
+
+def validate(files, max_errors=None):
+    """
+    Function that checks basic files without building a dictionary
+
+    Every line is split and parsed as by a build, so a build of files without diagnostics does not fail
+    on their format and both report the same line numbers. Nothing else is built, which makes a check
+    several times faster than a build.
+
+        Args:
+            files ([str]): names of the basic files
+            max_errors (int): stop after this many diagnostics, None checks the whole files
+
+        Returns:
+            diagnostics ([Diagnostic]): file, line number and message of every problem, in the order of the files
+    """
+    diagnostics = []
+    for file in files:
+        try:
+            f = open(file, "rb")
+        except OSError as error:
+            diagnostics.append(Diagnostic(file, None, error.strerror))
+            continue
+
+        with f:
+            # the file is read in chunks ending with b"\n", which str.splitlines may split further
+            line_number = 1
+            for data in f:
+                try:
+                    lines = data.decode("utf8").splitlines(True)
+                except UnicodeDecodeError as error:
+                    diagnostics.append(Diagnostic(file, line_number, "invalid UTF-8 at byte {}".format(error.start)))
+                    line_number += len(data.decode("utf8", "replace").splitlines())
+                    lines = []
+                for line in lines:
+                    if not line.isspace():
+                        try:
+                            parse_line(line)
+                        except ex.Parse_error as error:
+                            diagnostics.append(Diagnostic(file, line_number, error.message))
+                    line_number += 1
+                if max_errors is not None and len(diagnostics) >= max_errors:
+                    return diagnostics[:max_errors]
+    return diagnostics
+
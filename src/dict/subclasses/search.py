@@ -0,0 +1,97 @@
+def alphabet(words, known=""):
+    """
+    Function that returns all characters used in words
+
+        Args:
+            words (iterable(str)): word forms
+            known (str): characters already known to be used
+
+        Returns:
+            characters (str): sorted distinct characters
+    """
+    return "".join(sorted(set(known).union("".join(words))))
+
+
+def has_prefix(trie, prefix):
+    # marisa_trie deprecates has_keys_with_prefix, the first key is found just as fast
+    return next(trie.iterkeys(prefix), None) is not None
+
+
+def shortest_first(words):
+    """
+    Function that sorts words by length, words of the same length alphabetically
+
+        Args:
+            words ([str]): words to sort, the list is sorted in place
+
+        Returns:
+            words ([str]): the sorted list
+    """
+    words.sort()
+    words.sort(key=len)
+    return words
+
+
+def next_row(row, char, word):
+    """
+    Function that returns the next row of the Levenshtein distance table
+
+        Args:
+            row ([int]): distances between a prefix and every prefix of word
+            char (str): character appended to the prefix
+            word (str): searched word
+
+        Returns:
+            row ([int]): distances between the longer prefix and every prefix of word
+    """
+    new_row = [row[0] + 1]
+    for j, word_char in enumerate(word, 1):
+        new_row.append(min(new_row[j - 1] + 1, row[j] + 1, row[j - 1] + (word_char != char)))
+    return new_row
+
+
+def distance(key, word):
+    row = list(range(len(word) + 1))
+    for char in key:
+        row = next_row(row, char, word)
+    return row[-1]
+
+
+def similar_keys(trie, word, max_distance, characters):
+    """
+    Function that finds keys of a trie within a Levenshtein distance of a word
+
+    The trie is walked from the root with a row of the distance table per visited prefix.
+    Prefixes whose row exceeds max_distance everywhere are not extended. When the smallest
+    distance in the row equals max_distance, no further edit is allowed, so the only keys left
+    below the prefix are the prefix followed by a suffix of word, they are looked up directly
+    instead of walking the subtree.
+
+        Args:
+            trie (marisa_trie.Trie): searched keys
+            word (str): searched word
+            max_distance (int): maximal number of inserted, deleted or substituted characters
+            characters (str): all characters used in the keys, see alphabet
+
+        Returns:
+            keys ([(str, int)]): keys with their distance to word, in no particular order
+    """
+    keys = []
+    stack = [("", list(range(len(word) + 1)))]
+    while stack:
+        prefix, row = stack.pop()
+        if min(row) == max_distance:
+            for j, cost in enumerate(row):
+                if cost == max_distance and prefix + word[j:] in trie:
+                    keys.append((prefix + word[j:], cost))
+            continue
+
+        if row[-1] <= max_distance and prefix in trie:
+            keys.append((prefix, row[-1]))
+        for char in characters:
+            child = prefix + char
+            if has_prefix(trie, child):
+                child_row = next_row(row, char, word)
+                if min(child_row) <= max_distance:
+                    stack.append((child, child_row))
+    return keys
@@ -0,0 +1,126 @@
+import array
+import json
+import mmap
+import os
+import sys
+import codecs
+
+import src.dict.subclasses.exceptions as ex
+
+FORMAT_NAME = "grammatical-dictionary-of-polish"
+FORMAT_VERSION = 4
+ALIGNMENT = 8
+
+META_FILE = "meta.json"
+ARRAYS_FILE = "arrays.bin"
+
+
+def write_meta(path, meta):
+    """
+    Function that writes the description of a stored dictionary
+
+        Args:
+            path (str): directory of the stored dictionary
+            meta (dict): JSON serializable description, format name and version are added to it
+
+        Returns:
+            None
+    """
+    meta = dict(meta, format=FORMAT_NAME, version=FORMAT_VERSION, byteorder=sys.byteorder)
+    with codecs.open(os.path.join(path, META_FILE), "w", encoding="utf8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+
+def read_meta(path):
+    """
+    Function that reads and checks the description of a stored dictionary
+
+        Args:
+            path (str): directory of the stored dictionary
+
+        Raises:
+            Unsupported_format: directory does not contain a dictionary in the current format
+
+        Returns:
+            meta (dict): description written by write_meta
+    """
+    try:
+        with codecs.open(os.path.join(path, META_FILE), "r", encoding="utf8") as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        raise ex.Unsupported_format("{} does not contain {}".format(path, META_FILE))
+
+    if meta.get("format") != FORMAT_NAME or meta.get("version") != FORMAT_VERSION:
+        raise ex.Unsupported_format("Unsupported dictionary format {} version {}".format(meta.get("format"),
+                                                                                         meta.get("version")))
+    if meta.get("byteorder") != sys.byteorder:
+        raise ex.Unsupported_format("Dictionary was stored with {} byte order".format(meta.get("byteorder")))
+    return meta
+
+
+def write_arrays(path, arrays):
+    """
+    Function that writes flat arrays one after another into a single file
+
+        Args:
+            path (str): directory of the stored dictionary
+            arrays (dict): name -> array.array or memoryview
+
+        Returns:
+            layout (dict): name -> [typecode, offset in bytes, number of items]
+    """
+    layout = {}
+    offset = 0
+    with open(os.path.join(path, ARRAYS_FILE), "wb") as f:
+        for name, buffer in arrays.items():
+            typecode = buffer.typecode if isinstance(buffer, array.array) else buffer.format
+            padding = -offset % ALIGNMENT
+            f.write(bytes(padding))
+            offset += padding
+            data = memoryview(buffer).cast("B")
+            f.write(data)
+            layout[name] = [typecode, offset, len(buffer)]
+            offset += len(data)
+    return layout
+
+
+def map_arrays(path, layout):
+    """
+    Function that memory-maps arrays written by write_arrays
+
+        Args:
+            path (str): directory of the stored dictionary
+            layout (dict): layout returned by write_arrays
+
+        Returns:
+            mapping (mmap.mmap or None): read-only mapping that has to stay referenced while arrays are used
+            arrays (dict): name -> memoryview over the mapping
+    """
+    with open(os.path.join(path, ARRAYS_FILE), "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None, {name: array.array(typecode) for name, (typecode, _, _) in layout.items()}
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(mapping)
+    arrays = {}
+    for name, (typecode, offset, length) in layout.items():
+        itemsize = array.array(typecode).itemsize
+        arrays[name] = view[offset:offset + itemsize * length].cast(typecode)
+    return mapping, arrays
+
+
+def to_array(buffer):
+    """
+    Function that copies a memory-mapped buffer into a private array
+
+        Args:
+            buffer (array.array or memoryview): flat buffer
+
+        Returns:
+            copy (array.array): array with the same typecode and items
+    """
+    if isinstance(buffer, array.array):
+        return buffer
+    copy = array.array(buffer.format)
+    copy.frombytes(buffer.cast("B"))
+    return copy
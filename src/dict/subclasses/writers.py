@@ -0,0 +1,101 @@
+import json
+
+# a line of an adjective or adverb has 7 fields between its first 6 derivatives and the rest
+# and 2 fields after them, parse_line does not read them
+SPLIT_DERIVATIVES = 6
+SKIPPED_FIELDS = 7
+TRAILING_FIELDS = 2
+
+
+def tag_name(member):
+    return None if member is None else member.name.lower()
+
+
+def sgjp_line(infinitive, label, forms):
+    """
+    Function that formats a lexeme as a line of the basic files
+
+        Args:
+            infinitive (str): infinitive of the lexeme
+            label (str): flexographic label
+            forms ([tuple]): (form, slot, gender, case, relationships) of the infinitive and its derivatives,
+                             slots increasing
+
+        Returns:
+            line (str): line read by parse_line as the same lexeme, missing slots are "#"
+    """
+    derivatives = ["#"] * forms[-1][1]
+    for form in forms[1:]:
+        derivatives[form[1] - 1] = form[0]
+
+    word_type = label[1] if label[0] == "*" else label[0]
+    if word_type == "C" or word_type == "D":
+        derivatives += ["#"] * (SPLIT_DERIVATIVES - len(derivatives))
+        derivatives = (derivatives[:SPLIT_DERIVATIVES] + ["#"] * SKIPPED_FIELDS + derivatives[SPLIT_DERIVATIVES:]
+                       + ["#"] * TRAILING_FIELDS)
+    return ":".join([infinitive, label, infinitive] + derivatives) + ":\n"
+
+
+def write_sgjp(paradigms, f):
+    """
+    Function that writes paradigms as lines of the basic files, relationships are not written
+
+        Args:
+            paradigms (iterable(tuple)): (infinitive, label, forms) of every lexeme
+            f (file object): text stream
+
+        Returns:
+            lexemes (int): number of written lexemes
+    """
+    lexemes = 0
+    for infinitive, label, forms in paradigms:
+        f.write(sgjp_line(infinitive, label, forms))
+        lexemes += 1
+    return lexemes
+
+
+def format_relationships(relationships):
+    if relationships is None:
+        return ""
+    return "|".join("{}={}".format(name, word) for name, words in relationships.items() for word in words)
+
+
+def write_tsv(paradigms, f):
+    """
+    Function that writes paradigms as tab separated lines, one per form: infinitive, label, form, gender, case
+    and related words as name=word pairs separated with "|"; gender and case are empty for forms without them
+
+        Returns:
+            lexemes (int): number of written lexemes
+    """
+    lexemes = 0
+    for infinitive, label, forms in paradigms:
+        f.write("".join("{}\t{}\t{}\t{}\t{}\t{}\n".format(infinitive, label, form, tag_name(gender) or "",
+                                                          tag_name(case) or "", format_relationships(relationships))
+                        for form, _, gender, case, relationships in forms))
+        lexemes += 1
+    return lexemes
+
+
+def write_jsonl(paradigms, f):
+    """
+    Function that writes paradigms as JSON objects, one per lexeme: lemma, label and forms, every form
+    with its gender and case, and its related words by relationship name if it has any
+
+        Returns:
+            lexemes (int): number of written lexemes
+    """
+    lexemes = 0
+    for infinitive, label, forms in paradigms:
+        records = []
+        for form, _, gender, case, relationships in forms:
+            record = {"form": form, "gender": tag_name(gender), "case": tag_name(case)}
+            if relationships is not None:
+                record["relationships"] = relationships
+            records.append(record)
+        f.write(json.dumps({"lemma": infinitive, "label": label, "forms": records}, ensure_ascii=False) + "\n")
+        lexemes += 1
+    return lexemes
+
+
+WRITERS = {"sgjp": write_sgjp, "tsv": write_tsv, "jsonl": write_jsonl}
@@ -0,0 +1,21 @@
+import argparse
+import sys
+
+import src.dict.subclasses.parser as ps
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Checks basic files of a grammatical dictionary without building it")
+    parser.add_argument("files", nargs="+", help="basic files")
+    parser.add_argument("--max-errors", type=int, default=100, help="stop after this many problems, 0 for no limit")
+    options = parser.parse_args(arguments)
+
+    diagnostics = ps.validate(options.files, options.max_errors or None)
+    for diagnostic in diagnostics:
+        print(ps.format_diagnostic(diagnostic))
+    print("{} problems found".format(len(diagnostics)), file=sys.stderr)
+    return 1 if diagnostics else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+from time import perf_counter
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import tracemalloc
+
+from src.dict import dictionary
+from src.test import synthetic
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+
+def peak_rss_kb():
+    """
+    Function that returns the peak resident set size of the process in kilobytes
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def measure(query, arguments, repeat):
+    """
+    Function that times a query over all arguments, repeat times
+
+        Args:
+            query (callable): function of a single argument
+            arguments (list): arguments of the calls in a single round
+            repeat (int): number of rounds
+
+        Returns:
+            result (dict): number of calls per round and per call times of the rounds in microseconds
+    """
+    if not arguments:
+        return {"calls": 0}
+
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for argument in arguments:
+            query(argument)
+        times.append((perf_counter() - start) / len(arguments) * 1e6)
+    return {
+        "calls": len(arguments),
+        "best_us": min(times),
+        "median_us": statistics.median(times),
+        "mean_us": statistics.mean(times),
+    }
+
+
+def measure_once(function, repeat):
+    """
+    Function that times a call without arguments, repeat times
+
+        Returns:
+            result (dict): times of the calls in seconds
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = perf_counter()
+        result = function()
+        times.append(perf_counter() - start)
+    return {"best_s": min(times), "median_s": statistics.median(times)}, result
+
+
+def run_size(forms_count, repeat, build_repeat, workers, trace_memory):
+    """
+    Function that runs all benchmarks on a synthetic corpus of a given size
+
+        Returns:
+            results (dict): benchmark name -> result
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = synthetic.create_corpus(directory, forms_count)
+        results["corpus"] = {"forms": corpus["forms"], "lexemes": corpus["lexemes"],
+                             "file_bytes": os.path.getsize(corpus["basic_file"])}
+
+        if trace_memory:
+            tracemalloc.start()
+        rss_before = peak_rss_kb()
+        results["build"], test_dict = measure_once(
+            lambda: dictionary.Dictionary([corpus["basic_file"]], workers=workers), build_repeat)
+        results["build"]["peak_rss_kb"] = peak_rss_kb()
+        results["build"]["peak_rss_growth_kb"] = peak_rss_kb() - rss_before
+        if trace_memory:
+            results["build"]["traced_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+        results["build"]["graph_bytes"] = test_dict.word_graph.memory_footprint()
+
+        results["add_gradation_relationship"], _ = measure_once(
+            lambda: test_dict.add_gradation_relationship(corpus["gradation_file"]), 1)
+        results["add_generic_relationship"], _ = measure_once(
+            lambda: test_dict.add_generic_relationship(corpus["synonym_file"], "synonym"), 1)
+        results["add_multisegmented"], _ = measure_once(
+            lambda: test_dict.add_multisegmented([corpus["multisegmented_file"]]), 1)
+
+        results["get_parent"] = measure(test_dict.get_parent, corpus["forms_sample"], repeat)
+        results["get_parent_many"] = measure(test_dict.get_parent_many, [corpus["forms_sample"]], repeat)
+        results["get_parent_many"]["calls"] = len(corpus["forms_sample"])
+        results["get_parent_many"].update({name: value / len(corpus["forms_sample"]) for name, value
+                                           in results["get_parent_many"].items() if name.endswith("_us")})
+        results["get_children"] = measure(test_dict.get_children, corpus["lemmas_sample"], repeat)
+        test_dict.enable_metrics()
+        results["get_parent_instrumented"] = measure(test_dict.get_parent, corpus["forms_sample"], repeat)
+        results["get_parent_instrumented"]["steps"] = test_dict.metrics_stats()["steps"]
+        test_dict.disable_metrics()
+        results["get_form"] = measure(lambda word: test_dict.get_form(word, "genitive"), corpus["lemmas_sample"],
+                                      repeat)
+        results["find_forms_first"], _ = measure_once(lambda: test_dict.find_forms("genitive", "feminine", 100), 1)
+        results["find_forms_100"] = measure(lambda case: test_dict.find_forms(case, "feminine", 100),
+                                            ["genitive", "dative", "locative"], repeat)
+        results["pin_paradigms"], _ = measure_once(lambda: test_dict.pin_paradigms(corpus["lemmas_sample"]), 1)
+        results["get_children_pinned"] = measure(test_dict.get_children, corpus["lemmas_sample"], repeat)
+        results["get_word_by_relationship"] = measure(lambda word: test_dict.get_word_by_relationship("hst", word),
+                                                      corpus["relationship_sample"], repeat)
+        results["get_parent_multisegmented"] = measure(test_dict.get_parent_multisegmented,
+                                                       corpus["multisegmented_sample"], repeat)
+        parents = [test_dict.get_parent_multisegmented(phrase) for phrase in corpus["multisegmented_sample"]]
+        phrases = [parent[0] for parent in parents if parent is not None]
+        results["get_children_multisegmented"] = measure(test_dict.get_children_multisegmented, phrases, repeat)
+
+        prefixes = [form[:3] for form in corpus["forms_sample"][:200]]
+        results["complete"] = measure(test_dict.complete, prefixes, repeat)
+        results["complete_long_prefix"] = measure(test_dict.complete, [form[:-2] for form in corpus["forms_sample"]],
+                                                  repeat)
+        typos = [form[:2] + form[3:] for form in corpus["forms_sample"][:200]]
+        results["find_similar"] = measure(test_dict.find_similar, typos, repeat)
+        results["find_similar_distance_2"] = measure(lambda word: test_dict.find_similar(word, 2), typos[:50], 1)
+
+        new_lines = [synthetic.paradigm_line("nowy" + synthetic.synthetic_stem(number).lower(), label)
+                     for number, label in enumerate(["AA", "C", "B", "AD", "F"] * 20)]
+        results["add_lexeme"] = measure(test_dict.update_lexeme, new_lines, 1)
+        results["get_parent_with_overlay"] = measure(test_dict.get_parent, corpus["forms_sample"], repeat)
+        results["compact"], _ = measure_once(test_dict.compact, 1)
+
+        dump_file = os.path.join(directory, "paradigms.jsonl")
+        for output_format in ["sgjp", "jsonl"]:
+            with open(dump_file, "w", encoding="utf8") as f:
+                results["dump_" + output_format], _ = measure_once(lambda: test_dict.dump(f, output_format), 1)
+            results["dump_" + output_format]["bytes"] = os.path.getsize(dump_file)
+
+        pickle_file = os.path.join(directory, "dictionary.pickle")
+        stored_directory = os.path.join(directory, "dictionary")
+        results["export_dict"], _ = measure_once(lambda: dictionary.Dictionary.export_dict(test_dict, pickle_file),
+                                                 build_repeat)
+        results["import_dict"], _ = measure_once(lambda: dictionary.Dictionary.import_dict(pickle_file),
+                                                 build_repeat)
+        results["save"], _ = measure_once(lambda: test_dict.save(stored_directory), build_repeat)
+        results["open"], _ = measure_once(lambda: dictionary.Dictionary.open(stored_directory), build_repeat)
+        results["export_dict"]["bytes"] = os.path.getsize(pickle_file)
+        results["save"]["bytes"] = sum(os.path.getsize(os.path.join(stored_directory, name))
+                                       for name in os.listdir(stored_directory))
+    return results
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Benchmarks of the grammatical dictionary on synthetic corpora")
+    parser.add_argument("--forms", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="numbers of word forms of the generated corpora, e.g. 10000 5000000")
+    parser.add_argument("--repeat", type=int, default=5, help="rounds of every query benchmark")
+    parser.add_argument("--build-repeat", type=int, default=1, help="rounds of build, export and import benchmarks")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes of the build")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="report the peak of memory allocated by Python during the build, slows the build down")
+    parser.add_argument("--output", help="file for the JSON results, printed to the standard output by default")
+    options = parser.parse_args(arguments)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": options.repeat,
+        "workers": options.workers,
+        "sizes": {},
+    }
+    for forms_count in options.forms:
+        report["sizes"][str(forms_count)] = run_size(forms_count, options.repeat, options.build_repeat,
+                                                     options.workers, options.trace_memory)
+
+    if options.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(options.output, "w", encoding="utf8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+from time import perf_counter
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+
+from src.dict import async_dictionary
+from src.dict import dictionary
+from src.test import synthetic
+
+
+def percentile(latencies, fraction):
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def serve(query, requests, rate):
+    """
+    Function that sends requests at a fixed rate and returns latencies of requests by query name,
+    measured from the arrival of a request, so they include time spent waiting for the event loop
+    """
+    latencies = {}
+    tasks = []
+
+    async def handle(name, argument, arrival):
+        await query(name, argument)
+        latencies.setdefault(name, []).append(perf_counter() - arrival)
+
+    start = perf_counter()
+    for number, (name, argument) in enumerate(requests):
+        arrival = start + number / rate
+        delay = arrival - perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(handle(name, argument, arrival)))
+    await asyncio.gather(*tasks)
+    return latencies
+
+
+async def main(test_dict, requests, rate):
+    async def blocking(name, argument):
+        return getattr(test_dict, name)(argument)
+
+    results = {"sync calls in the event loop": await serve(blocking, requests, rate)}
+    for offload_all in [False, True]:
+        async with async_dictionary.AsyncDictionary(test_dict, offload_all=offload_all) as async_dict:
+            async def offloaded(name, argument):
+                return await getattr(async_dict, name)(argument)
+
+            name = "AsyncDictionary" + (", all queries offloaded" if offload_all else "")
+            results[name] = await serve(offloaded, requests, rate)
+            print(name + ": coalesced requests " + str(async_dict.stats()["coalesced"]))
+
+    for name, latencies_by_query in results.items():
+        for query, latencies in latencies_by_query.items():
+            print(name + ", " + query + ": p50 " + str(statistics.median(latencies) * 1e3) + "ms, p99 "
+                  + str(percentile(latencies, 0.99) * 1e3) + "ms")
+
+
+if __name__ == '__main__':
+    forms_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    requests_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    rate = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = synthetic.create_corpus(directory, forms_count)
+        test_dict = dictionary.Dictionary([corpus["basic_file"]])
+
+    random.seed(0)
+    forms = corpus["forms_sample"]
+    weights = [1 / rank for rank in range(1, len(forms) + 1)]
+    requests = []
+    for _ in range(requests_count):
+        if random.random() < 0.01:
+            requests.append(("get_children_many", tuple(random.sample(corpus["lemmas_sample"], 200))))
+        else:
+            requests.append(("get_parent", random.choices(forms, weights)[0]))
+    print("Number of requests: " + str(requests_count) + ", requests/s: " + str(rate))
+    asyncio.run(main(test_dict, requests, rate))
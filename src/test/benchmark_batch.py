@@ -0,0 +1,36 @@
+from time import perf_counter
+import os
+import random
+import sys
+import tempfile
+
+from src.dict import dictionary
+from src.test import synthetic
+
+if __name__ == '__main__':
+    lexemes_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    tokens_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "synthetic.txt")
+        synthetic.create_synthetic_file(filename, lexemes_count)
+        test_dict = dictionary.Dictionary([filename])
+
+    random.seed(0)
+    forms = [synthetic.synthetic_line(number).split(":")[3 + number % 13] for number in range(lexemes_count)]
+    weights = [1 / rank for rank in range(1, len(forms) + 1)]
+    tokens = random.choices(forms, weights, k=tokens_count)
+    print("Number of tokens: " + str(tokens_count) + ", distinct: " + str(len(set(tokens))))
+
+    start = perf_counter()
+    looped = [test_dict.get_parent(token) for token in tokens]
+    looped_time = perf_counter() - start
+
+    start = perf_counter()
+    batched = test_dict.get_parent_many(tokens)
+    batched_time = perf_counter() - start
+
+    assert looped == batched
+    print("get_parent loop: " + str(tokens_count / looped_time) + " tokens/s")
+    print("get_parent_many: " + str(tokens_count / batched_time) + " tokens/s")
+    print("Speedup: " + str(looped_time / batched_time))
@@ -0,0 +1,24 @@
+import os
+import sys
+import tempfile
+
+from src.dict import dictionary
+from src.test import synthetic
+
+if __name__ == '__main__':
+    lexemes_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "synthetic.txt")
+        forms_count = synthetic.create_synthetic_file(filename, lexemes_count)
+        test_dict = dictionary.Dictionary([filename])
+
+    compact_size = test_dict.word_graph.memory_footprint()
+    object_size = test_dict.word_graph.to_graph().memory_footprint()
+
+    print("Number of word forms: " + str(forms_count))
+    print("Object graph: " + str(object_size // 1024) + "KB, "
+          + str(object_size / forms_count) + " bytes per form")
+    print("Compact graph: " + str(compact_size // 1024) + "KB, "
+          + str(compact_size / forms_count) + " bytes per form")
+    print("Ratio: " + str(object_size / compact_size))
@@ -0,0 +1,44 @@
+from time import perf_counter
+import itertools
+import random
+import sys
+
+from src.dict.subclasses import multisegmented
+
+
+def product_lookup(module, possible_ids_list):
+    for combination in itertools.product(*possible_ids_list):
+        if module.is_multisegmented(combination):
+            return combination
+    return None
+
+
+if __name__ == '__main__':
+    ambiguity = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    max_segments = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    random.seed(0)
+
+    module = multisegmented.multisegmented_module()
+    for _ in range(100000):
+        length = random.randint(2, max_segments)
+        module.add_multisegmented(tuple(random.randrange(1000000) for _ in range(length)), [False] * length, None)
+
+    for segments in range(2, max_segments + 1):
+        # worst case: every segment is ambiguous and the only matching phrase is the last combination
+        phrase = tuple(random.randrange(1000000, 2000000) for _ in range(segments))
+        module.add_multisegmented(phrase, [False] * segments, None)
+        module.build()
+        possible_ids_list = [[random.randrange(1000000, 2000000) for _ in range(ambiguity - 1)] + [segment_id]
+                             for segment_id in phrase]
+
+        start = perf_counter()
+        assert module.find_multisegmented(possible_ids_list) == phrase
+        indexed_time = perf_counter() - start
+        line = str(segments) + " segments, " + str(ambiguity ** segments) + " combinations: indexed " \
+            + str(indexed_time) + "s"
+
+        if ambiguity ** segments <= 10 ** 6:
+            start = perf_counter()
+            assert product_lookup(module, possible_ids_list) == phrase
+            line += ", itertools.product " + str(perf_counter() - start) + "s"
+        print(line)
@@ -0,0 +1,32 @@
+from time import perf_counter
+import os
+import sys
+import tempfile
+
+from src.dict import dictionary
+from src.test import synthetic
+
+if __name__ == '__main__':
+    lexemes_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "synthetic.txt")
+        forms_count = synthetic.create_synthetic_file(filename, lexemes_count)
+        print("Number of word forms: " + str(forms_count))
+
+        reference = None
+        workers = 1
+        while workers <= max_workers:
+            start = perf_counter()
+            dictionary.read_basic_files([filename], workers)
+            parsed = perf_counter()
+            test_dict = dictionary.Dictionary([filename], workers=workers)
+            end = perf_counter()
+
+            if reference is None:
+                reference = test_dict
+            assert test_dict == reference
+            print(str(workers) + " workers: parsing and graph " + str(parsed - start) + "s, whole build "
+                  + str(end - parsed) + "s")
+            workers *= 2
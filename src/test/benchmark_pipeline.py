@@ -0,0 +1,41 @@
+import os
+import random
+import sys
+import tempfile
+
+from src.dict import dictionary
+from src.dict import pipeline
+from src.test import synthetic
+
+if __name__ == '__main__':
+    forms_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    tokens_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = synthetic.create_corpus(directory, forms_count)
+        test_dict = dictionary.Dictionary([corpus["basic_file"]])
+        test_dict.add_multisegmented([corpus["multisegmented_file"]])
+        stored_directory = os.path.join(directory, "dictionary")
+        test_dict.save(stored_directory)
+
+        random.seed(0)
+        words = corpus["forms_sample"] + corpus["multisegmented_sample"] + ["i", "w", "na", "że"]
+        weights = [1 / rank for rank in range(1, len(words) + 1)]
+        random.shuffle(weights)
+        text = os.path.join(directory, "text.txt")
+        with open(text, "w", encoding="utf8") as f:
+            written = 0
+            while written < tokens_count:
+                line = random.choices(words, weights, k=12)
+                written += len(line)
+                f.write(" ".join(line) + ".\n")
+        print("Text: " + str(os.path.getsize(text) >> 20) + "MB")
+
+        for name, lemmatizer in [("in process", pipeline.Lemmatizer(test_dict)),
+                                 ("stored, in process", pipeline.Lemmatizer(stored_directory)),
+                                 (str(workers) + " workers", pipeline.Lemmatizer(stored_directory, workers))]:
+            with open(os.devnull, "w") as output:
+                stats = lemmatizer.write(text, output, "tsv")
+            print(name + ": " + str(int(stats["tokens_per_second"])) + " tokens/s, "
+                  + str(stats["multisegments"]) + " multisegments")
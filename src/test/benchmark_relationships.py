@@ -0,0 +1,62 @@
+from time import perf_counter
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+from src.dict import dictionary
+from src.test import synthetic
+
+
+def write_relationship_file(file, lemmas, lines, related, seed=0):
+    """
+    Function that writes a generic relationship file relating random infinitives
+
+        Args:
+            file (str): name of the created file
+            lemmas ([(str, str)]): infinitives with their labels
+            lines (int): number of lines
+            related (int): number of related infinitives in every line
+
+        Returns:
+            None
+    """
+    random.seed(seed)
+    with open(file, "w", encoding="utf8") as f:
+        for lemma, label in random.sample(lemmas, min(lines, len(lemmas))):
+            f.write("{}:{}:{}:\n".format(lemma, label, ":".join(lemma for lemma, _ in random.sample(lemmas, related))))
+
+
+if __name__ == '__main__':
+    forms_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = synthetic.create_corpus(directory, forms_count)
+        with open(corpus["basic_file"], encoding="utf8") as f:
+            lemmas = [(line.split(":")[0].strip(), line.split(":")[1].strip()) for line in f]
+        relationship_file = os.path.join(directory, "related.txt")
+        write_relationship_file(relationship_file, lemmas, lines, 5)
+        test_dict = dictionary.Dictionary([corpus["basic_file"]])
+
+        graph_bytes = test_dict.word_graph.memory_footprint()
+        start = perf_counter()
+        test_dict.add_generic_relationship(relationship_file, "related")
+        load_time = perf_counter() - start
+        relationship_bytes = test_dict.word_graph.memory_footprint() - graph_bytes
+
+        # tracing slows allocations down, so the peak is measured by loading the file once more
+        tracemalloc.start()
+        test_dict.add_generic_relationship(relationship_file, "traced")
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        edges = sum(map(len, test_dict.word_graph.relationships[test_dict.lexical_relationships["related"]].values()))
+        print("add_generic_relationship of " + str(edges // 2) + " edges: " + str(load_time) + "s, traced peak: "
+              + str(peak // 1024) + "KB, relationship: " + str(relationship_bytes // 1024) + "KB")
+
+        words = [lemma for lemma, _ in random.sample(lemmas, 10000)]
+        start = perf_counter()
+        for word in words:
+            test_dict.get_word_by_relationship("related", word)
+        print("get_word_by_relationship: " + str((perf_counter() - start) / len(words) * 1e6) + "us")
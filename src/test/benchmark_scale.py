@@ -0,0 +1,32 @@
+from time import perf_counter
+import os
+import sys
+import tempfile
+
+from src.dict import dictionary
+from src.test import synthetic
+
+if __name__ == '__main__':
+    lexemes_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "synthetic.txt")
+        forms_count = synthetic.create_synthetic_file(filename, lexemes_count)
+        print("Number of word forms: " + str(forms_count))
+
+        start_of_building = perf_counter()
+        test_dict = dictionary.Dictionary([filename])
+        end_of_building = perf_counter()
+
+    print("Id format: " + test_dict.id_format)
+    print("Building time: " + str(end_of_building - start_of_building) + "s")
+
+    start_of_checking = perf_counter()
+    for number in range(0, lexemes_count, max(1, lexemes_count // 1000)):
+        line = synthetic.synthetic_line(number).split(":")
+        lemma = line[0].strip()
+        assert test_dict.get_children(lemma) == line[3:-1], lemma
+        for form in line[3:-1]:
+            assert test_dict.get_parent(form)[0] == lemma, form
+    end_of_checking = perf_counter()
+    print("Round-trip check time: " + str(end_of_checking - start_of_checking) + "s")
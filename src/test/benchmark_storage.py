@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from src.dict import dictionary
+from src.test import synthetic
+
+LOAD_SCRIPT = """
+import sys
+from time import perf_counter
+from src.dict import dictionary
+
+def rss():
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            fields[name] = value.split()[0] if value.split() else "0"
+    return int(fields.get("RssAnon", 0)), int(fields.get("RssFile", 0))
+
+anon_before, _ = rss()
+start = perf_counter()
+if sys.argv[1] == "pickle":
+    test_dict = dictionary.Dictionary.import_dict(sys.argv[2])
+else:
+    test_dict = dictionary.Dictionary.open(sys.argv[2])
+end = perf_counter()
+test_dict.get_parent(sys.argv[3])
+anon_after, file_after = rss()
+print(end - start, anon_after - anon_before, file_after)
+"""
+
+
+def measure(method, path, word):
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    output = subprocess.run([sys.executable, "-c", LOAD_SCRIPT, method, path, word], cwd=root,
+                            env=dict(os.environ, PYTHONPATH=root), capture_output=True, text=True, check=True)
+    load_time, private_kb, shared_kb = output.stdout.split()
+    return float(load_time), int(private_kb), int(shared_kb)
+
+
+if __name__ == '__main__':
+    lexemes_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "synthetic.txt")
+        forms_count = synthetic.create_synthetic_file(filename, lexemes_count)
+        test_dict = dictionary.Dictionary([filename])
+        print("Number of word forms: " + str(forms_count))
+
+        pickle_path = os.path.join(directory, "dictionary.pickle")
+        stored_path = os.path.join(directory, "dictionary")
+        dictionary.Dictionary.export_dict(test_dict, pickle_path)
+        test_dict.save(stored_path)
+
+        word = synthetic.synthetic_line(lexemes_count - 1).split(":")[3]
+        for method, path in [("pickle", pickle_path), ("mmap", stored_path)]:
+            load_time, private_kb, shared_kb = measure(method, path, word)
+            print(method + " load time: " + str(load_time) + "s, private memory: " + str(private_kb)
+                  + "KB, file backed (shareable) memory: " + str(shared_kb) + "KB")
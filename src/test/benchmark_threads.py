@@ -0,0 +1,62 @@
+from time import perf_counter
+import os
+import random
+import sys
+import tempfile
+import threading
+
+from src.dict import dictionary
+from src.test import synthetic
+
+
+def run_threads(query, tokens, threads_count, background=None):
+    """
+    Function that splits tokens between threads running query and returns the number of queries per second
+    """
+    chunks = [tokens[number::threads_count] for number in range(threads_count)]
+    threads = [threading.Thread(target=lambda chunk=chunk: [query(token) for token in chunk]) for chunk in chunks]
+    if background is not None:
+        threads.append(threading.Thread(target=background))
+
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(tokens) / (perf_counter() - start)
+
+
+if __name__ == '__main__':
+    forms_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    tokens_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    max_threads = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+    gil_enabled = sys._is_gil_enabled() if hasattr(sys, "_is_gil_enabled") else True
+    print("Python " + sys.version.split()[0] + ", GIL " + ("enabled" if gil_enabled else "disabled")
+          + ", CPUs: " + str(os.cpu_count()))
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = synthetic.create_corpus(directory, forms_count)
+        test_dict = dictionary.Dictionary([corpus["basic_file"]])
+        random.seed(0)
+        tokens = random.choices(corpus["forms_sample"], k=tokens_count)
+
+        test_dict.add_gradation_relationship(corpus["gradation_file"])
+        related = random.choices(corpus["relationship_sample"], k=tokens_count)
+
+        threads_count = 1
+        while threads_count <= max_threads:
+            print(str(threads_count) + " threads, get_parent: "
+                  + str(run_threads(test_dict.get_parent, tokens, threads_count)) + " queries/s, "
+                  + "get_word_by_relationship: "
+                  + str(run_threads(lambda word: test_dict.get_word_by_relationship("hst", word), related,
+                                    threads_count)) + " queries/s")
+            threads_count *= 2
+
+        def load_relationships():
+            for number in range(max_threads):
+                test_dict.add_gradation_relationship(corpus["gradation_file"])
+                test_dict.add_multisegmented([corpus["multisegmented_file"]])
+
+        print(str(max_threads) + " threads, get_parent while loading relationship files: "
+              + str(run_threads(test_dict.get_parent, tokens, max_threads, load_relationships)) + " queries/s")
@@ -0,0 +1,181 @@
+import os
+import random
+import string
+
+from src.dict import dictionary
+
+NOUN_SUFFIXES = ["", "y", "a", "ów", "owi", "om", "a", "y", "em", "ami", "u", "ach", "u", "y"]
+
+
+def synthetic_stem(number, width=6):
+    """
+    Function that returns an unique, word-like stem for a given number
+
+        Args:
+            number (int): number of the lexeme
+            width (int): number of letters in the stem, all stems have the same length
+                         so that no word form of one lexeme is a word form of another
+
+        Returns:
+            stem (str): capitalized stem, different for every number
+    """
+    letters = string.ascii_lowercase
+    stem = ""
+    for _ in range(width):
+        number, rest = divmod(number, len(letters))
+        stem += letters[rest]
+    return stem.capitalize()
+
+
+def synthetic_line(number):
+    """
+    Function that returns a single noun entry in the dictionary file format
+
+        Args:
+            number (int): number of the lexeme
+
+        Returns:
+            line (str): <infinitive> :  AA:<derivatives separated with colon>:
+    """
+    stem = synthetic_stem(number)
+    forms = [stem + suffix for suffix in NOUN_SUFFIXES]
+    return "{} :  AA:{}:\n".format(forms[0], ":".join(forms))
+
+
+def create_synthetic_file(filename, lexemes_count):
+    """
+    Function that writes a dictionary file with synthetic nouns
+
+        Args:
+            filename (str): name of the created file
+            lexemes_count (int): number of lexemes, every lexeme has len(NOUN_SUFFIXES) word forms
+
+        Returns:
+            forms_count (int): number of word forms in the created file
+    """
+    with open(filename, "w", encoding="utf8") as f:
+        for number in range(lexemes_count):
+            f.write(synthetic_line(number))
+    return lexemes_count * len(NOUN_SUFFIXES)
+
+
+# suffixes of all columns following the label, the first one is the infinitive
+PARADIGMS = {
+    "AA": ["", "", "y", "a", "ów", "owi", "om", "a", "ów", "em", "ami", "ie", "ach", "ie", "y"],
+    "AB": ["", "", "y", "a", "ów", "owi", "om", "a", "y", "em", "ami", "u", "ach", "u", "y"],
+    "AC": ["", "", "y", "u", "ów", "owi", "om", "", "y", "em", "ami", "ie", "ach", "ie", "y"],
+    "AD": ["a", "a", "y", "y", "", "ie", "om", "ę", "y", "ą", "ami", "ie", "ach", "o", "y"],
+    "AF": ["o", "o", "a", "a", "", "u", "om", "o", "a", "em", "ami", "ie", "ach", "o", "a"],
+    "B": ["ać", "ać", "am", "asz", "a", "amy", "acie", "ają", "ał", "ała", "ało", "ali", "ały", "aj", "ajmy",
+          "ajcie", "any", "ana", "ane", "ani", "anie"],
+    "C": ["y", "y", "ego", "emu", "ego", "ym", "ym", "y",
+          "szy", "szego", "szemu", "szego", "szym", "szym", "szy",
+          "a", "ej", "ej", "ą", "ą", "ej", "a",
+          "e", "ego", "emu", "e", "ym", "ym", "e",
+          "i", "ych", "ym", "ych", "ymi", "ych", "i",
+          "e", "ych", "ym", "e", "ymi", "ych", "e",
+          "o", "ie"],
+    "F": ["o", "o", "iej"],
+}
+
+# share of lexemes with a given flexographic label, similar to the one in SGJP
+LABEL_MIX = [("AA", 8), ("AB", 8), ("AC", 16), ("AD", 14), ("AF", 9), ("B", 20), ("C", 20), ("F", 5)]
+
+
+def paradigm_line(stem, label):
+    """
+    Function that returns a lexeme in the dictionary file format
+
+        Args:
+            stem (str): stem of every form
+            label (str): flexographic label, optionally with an asterisk, the rest must be a key of PARADIGMS
+
+        Returns:
+            line (str): <infinitive> :  <label>:<derivatives separated with colon>:
+    """
+    forms = [stem + suffix for suffix in PARADIGMS[label.strip("*")]]
+    return "{} :  {}:{}:\n".format(forms[0], label, ":".join(forms[1:]))
+
+
+def create_corpus(directory, forms_count, seed=0):
+    """
+    Function that writes a synthetic corpus in the SGJP based formats read by Dictionary
+
+    Lexemes get labels according to LABEL_MIX, a small part of them are homographs of other lexemes,
+    some adjectives have separate comparative and superlative lexemes, some nouns have a synonym
+    and some adjective-noun pairs form multisegments.
+
+        Args:
+            directory (str): directory for the created files
+            forms_count (int): minimal number of word forms in the basic file
+            seed (int): seed of the generator, the same seed gives the same corpus
+
+        Returns:
+            corpus (dict): names of the created files, numbers of forms and lexemes
+                           and samples of words to query
+    """
+    rng = random.Random(seed)
+    labels = [label for label, weight in LABEL_MIX for _ in range(weight)]
+    corpus = {
+        "basic_file": os.path.join(directory, "basic.txt"),
+        "gradation_file": os.path.join(directory, "gradation.txt"),
+        "synonym_file": os.path.join(directory, "synonyms.txt"),
+        "multisegmented_file": os.path.join(directory, "multisegmented.txt"),
+        "forms": 0,
+        "lexemes": 0,
+        "forms_sample": [],
+        "lemmas_sample": [],
+        "relationship_sample": [],
+        "multisegmented_sample": [],
+    }
+    nouns = []
+    adjectives = []
+
+    with open(corpus["basic_file"], "w", encoding="utf8") as basic, \
+            open(corpus["gradation_file"], "w", encoding="utf8") as gradation:
+        number = 0
+        while corpus["forms"] < forms_count:
+            label = rng.choice(labels)
+            stem = synthetic_stem(number).lower()
+            if nouns and rng.random() < 0.02:
+                stem = rng.choice(nouns)[0]
+            number += 1
+
+            lexemes = [(stem, label)]
+            if label == "C" and rng.random() < 0.3:
+                lexemes += [(stem + "sz", label), ("naj" + stem + "sz", label)]
+                gradation.write("{}:{}:{}:\n".format(*[lexeme_stem + "y" for lexeme_stem, _ in lexemes]))
+                corpus["relationship_sample"].append("naj" + stem + "szy")
+
+            for lexeme_stem, lexeme_label in lexemes:
+                if rng.random() < 0.1:
+                    lexeme_label = "*" + lexeme_label
+                line = paradigm_line(lexeme_stem, lexeme_label)
+                basic.write(line)
+                forms = [form for form in dictionary.parse_line(line)[2] if form not in ["#", "##"]]
+                corpus["forms"] += len(forms) + 1
+                corpus["lexemes"] += 1
+                if rng.random() < 0.05:
+                    corpus["lemmas_sample"].append(line.split(":")[0].strip())
+                    corpus["forms_sample"].append(rng.choice(forms))
+
+            if label.startswith("A"):
+                nouns.append((stem, label))
+            elif label == "C":
+                adjectives.append((stem, label))
+
+    with open(corpus["synonym_file"], "w", encoding="utf8") as synonyms:
+        for stem, label in rng.sample(nouns, len(nouns) // 20):
+            other_stem, other_label = rng.choice(nouns)
+            synonyms.write("{}:{}:{}:\n".format(stem + PARADIGMS[label][0], label,
+                                                other_stem + PARADIGMS[other_label][0]))
+
+    with open(corpus["multisegmented_file"], "w", encoding="utf8") as multisegmented:
+        pairs = set()
+        for _ in range(min(len(nouns), len(adjectives)) // 10):
+            pairs.add((rng.choice(adjectives)[0], rng.choice(nouns)))
+        for adjective_stem, (noun_stem, noun_label) in sorted(pairs):
+            multisegmented.write("{}y {};**;;;\n".format(adjective_stem, noun_stem + PARADIGMS[noun_label][0]))
+            corpus["multisegmented_sample"].append("{}ego {}".format(adjective_stem,
+                                                                     noun_stem + PARADIGMS[noun_label][3]))
+    return corpus
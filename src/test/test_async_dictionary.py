@@ -0,0 +1,60 @@
+import asyncio
+import unittest
+
+from src.dict import async_dictionary
+from src.dict import dictionary
+from src.dict.subclasses import exceptions
+
+
+class AsyncDictionaryTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+
+    async def test_same_results_as_dictionary(self):
+        async with async_dictionary.AsyncDictionary(self.test_dict) as async_dict:
+            self.assertEqual(await async_dict.get_parent("raki"), self.test_dict.get_parent("raki"))
+            self.assertEqual(await async_dict.get_children("Gdańsk"), self.test_dict.get_children("Gdańsk"))
+            self.assertEqual(await async_dict.get_parent_many(["raki", "Gdańska", "xyz"]),
+                             self.test_dict.get_parent_many(["raki", "Gdańska", "xyz"]))
+            self.assertEqual(await async_dict.get_children_many(iter(["Gdańsk", "xyz"])),
+                             self.test_dict.get_children_many(["Gdańsk", "xyz"]))
+            with self.assertRaises(exceptions.Key_Missing):
+                await async_dict.get_parent("xyz")
+
+    async def test_coalesce_identical_queries(self):
+        async with async_dictionary.AsyncDictionary(self.test_dict, max_pending=2, offload_all=True) as async_dict:
+            results = await asyncio.gather(*[async_dict.get_children("Gdańsk") for _ in range(10)],
+                                           *[async_dict.get_parent(word) for word in ["raki", "Gdańska", "raki"]])
+            self.assertEqual(results[:10], [self.test_dict.get_children("Gdańsk")] * 10)
+            self.assertEqual(results[10], self.test_dict.get_parent("raki"))
+            self.assertIsNot(results[0], results[1])
+            self.assertEqual(async_dict.stats()["requests"], 13)
+            self.assertEqual(async_dict.stats()["coalesced"], 10)
+            self.assertEqual(async_dict.stats()["in_flight"], 0)
+
+            failed = await asyncio.gather(*[async_dict.get_children("xyz") for _ in range(3)], return_exceptions=True)
+            self.assertTrue(all(isinstance(error, exceptions.Key_Missing) for error in failed))
+
+    async def test_coalesce_batches(self):
+        async with async_dictionary.AsyncDictionary(self.test_dict) as async_dict:
+            words = ["raki", "Gdańska", "raki"]
+            results = await asyncio.gather(*[async_dict.get_parent_many(words) for _ in range(5)],
+                                           async_dict.get_parent("raki"))
+            self.assertEqual(results[:5], [self.test_dict.get_parent_many(words)] * 5)
+            self.assertIsNot(results[0][0][2], results[1][0][2])
+            self.assertEqual(async_dict.stats()["coalesced"], 4)
+
+    async def test_queries_offloaded_during_compact(self):
+        self.test_dict.remove_lexeme("Gdańsk")
+        async with async_dictionary.AsyncDictionary(self.test_dict) as async_dict:
+            compaction = asyncio.ensure_future(async_dict.compact())
+            await asyncio.sleep(0)
+            self.assertEqual(async_dict.modifying, 1)
+            self.assertEqual(await async_dict.get_parent("raki"), self.test_dict.get_parent("raki"))
+            await compaction
+            self.assertEqual(async_dict.modifying, 0)
+            self.assertIsNone(self.test_dict.overlay)
+
+
+if __name__ == '__main__':
+    unittest.main()
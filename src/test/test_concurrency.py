@@ -0,0 +1,87 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+from src.dict import dictionary
+from src.dict.subclasses import exceptions
+from src.dict.subclasses import locks
+from src.test import synthetic
+
+
+class ConcurrencyTests(unittest.TestCase):
+    def test_readers_writer_lock(self):
+        lock = locks.ReadersWriterLock()
+        lock.acquire_read()
+        lock.acquire_read()
+        self.assertEqual(lock.readers, 2)
+
+        events = []
+        writer = threading.Thread(target=lambda: (lock.acquire_write(), events.append("write"), lock.release_write()))
+        writer.start()
+        while not lock.waiting_writers:
+            pass
+        reader = threading.Thread(target=lambda: (lock.acquire_read(), events.append("read"), lock.release_read()))
+        reader.start()
+        self.assertEqual(events, [])
+
+        lock.release_read()
+        lock.release_read()
+        writer.join()
+        reader.join()
+        self.assertEqual(events, ["write", "read"])
+
+    def test_queries_while_loading_relationships(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = synthetic.create_corpus(directory, 20000)
+            with open(corpus["basic_file"], encoding="utf8") as f:
+                lemmas = [line.split(":")[0].strip() for line in f]
+            relationship_file = os.path.join(directory, "relationship.txt")
+            with open(relationship_file, "w", encoding="utf8") as f:
+                for lemma, other_lemma in zip(lemmas, lemmas[1:]):
+                    f.write("{}:X:{}:\n".format(lemma, other_lemma))
+
+            reference = dictionary.Dictionary([corpus["basic_file"]])
+            reference.add_generic_relationship(relationship_file, "related")
+            expected = [reference.get_word_by_relationship("related", lemma) for lemma in lemmas]
+            test_dict = dictionary.Dictionary([corpus["basic_file"]], cache_size=50)
+
+            errors = []
+            loaded = threading.Event()
+
+            def query():
+                try:
+                    while not loaded.is_set():
+                        try:
+                            results = [test_dict.get_word_by_relationship("related", lemma) for lemma in lemmas]
+                        except exceptions.Relationship_not_found:
+                            continue
+                        # a reader that sees the relationship has to see all of its pairs
+                        self.assertEqual(results, expected)
+                        test_dict.get_parent_many(corpus["forms_sample"])
+                except Exception as error:
+                    errors.append(error)
+
+            # switch threads often, so that readers run in the middle of loading a file
+            switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(1e-6)
+            try:
+                readers = [threading.Thread(target=query) for _ in range(4)]
+                for reader in readers:
+                    reader.start()
+                for number in range(3):
+                    test_dict.add_generic_relationship(relationship_file, "related" if number == 2 else str(number))
+                    test_dict.add_multisegmented([corpus["multisegmented_file"]])
+                loaded.set()
+                for reader in readers:
+                    reader.join()
+            finally:
+                sys.setswitchinterval(switch_interval)
+
+            self.assertEqual(errors, [])
+            self.assertEqual([test_dict.get_word_by_relationship("related", lemma) for lemma in lemmas], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
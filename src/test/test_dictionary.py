@@ -1,6 +1,12 @@
+import os
+import tempfile
 import unittest
 
 from src.dict import dictionary
+from src.dict.subclasses import exceptions
+from src.dict.subclasses import graph
+from src.dict.subclasses import search
+from src.test import synthetic
 
 
 class DictionaryTests(unittest.TestCase):
@@ -10,17 +16,189 @@ class DictionaryTests(unittest.TestCase):
         imported_dict = dictionary.Dictionary.import_dict("test_data/test_file.pickle")
         self.assertEqual(test_dict, imported_dict)
 
+    def test_save_open(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        with tempfile.TemporaryDirectory() as directory:
+            test_dict.save(directory)
+            opened_dict = dictionary.Dictionary.open(directory)
+            self.assertEqual(test_dict, opened_dict)
+            self.assertEqual(opened_dict.get_parent("Gdańska"), test_dict.get_parent("Gdańska"))
+            self.assertEqual(opened_dict.get_children("Gdańsk"), test_dict.get_children("Gdańsk"))
+            del opened_dict
+
+    def test_open_unsupported_format(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(exceptions.Unsupported_format):
+                dictionary.Dictionary.open(directory)
+
+    def test_parallel_build(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = synthetic.create_corpus(directory, 5000)
+            files = ["test_data/test_file.txt", corpus["basic_file"]]
+            sequential, sequential_graph = dictionary.read_basic_files(files)
+            parallel, parallel_graph = dictionary.read_basic_files(files, workers=2, shard_size=1000)
+        self.assertEqual(parallel.keys, sequential.keys)
+        self.assertEqual(parallel.slots, sequential.slots)
+        self.assertEqual([parallel.labels[index] for index in parallel.label_ids],
+                         [sequential.labels[index] for index in sequential.label_ids])
+        self.assertEqual(parallel.sizes, sequential.sizes)
+        self.assertEqual(parallel_graph.to_buffers(), sequential_graph.to_buffers())
+        self.assertEqual(dictionary.Dictionary(["test_data/test_file.txt"], workers=2),
+                         dictionary.Dictionary(["test_data/test_file.txt"]))
+
     def test_get_parent(self):
         test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
         self.assertEqual(test_dict.get_parent("Gdańska")[0], "Gdańsk")
         self.assertEqual(test_dict.get_parent("Gdańska")[1], "AA")
 
+    def test_get_parent_ambiguous(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        self.assertEqual(test_dict.get_parent("raki"), ("rak", "AA", ["raki"]))
+
+    def test_get_parent_unknown_word(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        with self.assertRaises(exceptions.Key_Missing):
+            test_dict.get_parent("Gdańskowie")
+
     def test_get_children(self):
         test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
         print(test_dict.get_children("Gdańsk"))
         self.assertEqual(test_dict.get_children("Gdańsk"), ['Gdański', 'Gdańska', 'Gdańsków', 'Gdańskowi', 'Gdańskom',
                          'Gdańsk', 'Gdański', 'Gdańskiem', 'Gdańskami', 'Gdańsku', 'Gdańskach', 'Gdańsku', 'Gdański'])
 
+    def test_get_parent_many(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        words = ["Gdańska", "raki", "Gdańskowie", "Gdańska"]
+        self.assertEqual(test_dict.get_parent_many(iter(words)),
+                         [test_dict.get_parent("Gdańska"), test_dict.get_parent("raki"), (None, None, None),
+                          test_dict.get_parent("Gdańska")])
+
+    def test_get_children_many(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        self.assertEqual(test_dict.get_children_many(["Gdańsk", "Gdańskowie", "nur"]),
+                         [test_dict.get_children("Gdańsk"), None, test_dict.get_children("nur")])
+
+    def test_pin_paradigms(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        children = test_dict.get_children_many(["Gdańsk", "rak", "Gdańska"])
+        self.assertEqual(test_dict.pin_paradigms(["Gdańsk", "rak", "Gdańska", "xyz"]), 2)
+        self.assertEqual(test_dict.pin_paradigms(["Gdańsk"]), 2)
+        self.assertEqual(test_dict.get_children_many(["Gdańsk", "rak", "Gdańska"]), children)
+        with tempfile.TemporaryDirectory() as directory:
+            test_dict.save(directory)
+            opened_dict = dictionary.Dictionary.open(directory)
+            self.assertEqual(len(opened_dict.paradigms), 2)
+            self.assertEqual(opened_dict.get_children("rak"), children[1])
+            dictionary.Dictionary.export_dict(opened_dict, os.path.join(directory, "dictionary.pickle"))
+            imported_dict = dictionary.Dictionary.import_dict(os.path.join(directory, "dictionary.pickle"))
+            self.assertEqual(imported_dict.get_children("Gdańsk"), children[0])
+            del opened_dict
+
+    def test_get_form(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        self.assertEqual(test_dict.get_form("Gdańsk", graph.Cases.ACCUSATIVE, graph.Genders.MASCULINE), ["Gdańska"])
+        self.assertEqual(test_dict.get_form("Gdańsk", "accusative", "masculine"), ["Gdańska"])
+        self.assertEqual(len(test_dict.get_form("Gdańsk")), len(test_dict.get_children("Gdańsk")) + 1)
+        with self.assertRaises(exceptions.Key_Missing):
+            test_dict.get_form("Gdańska")
+        with self.assertRaises(ValueError):
+            test_dict.get_form("Gdańsk", "ablative")
+
+    def test_find_forms(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        forms = test_dict.find_forms("accusative", "masculine")
+        self.assertIn(("Gdańska", "Gdańsk", "AA"), forms)
+        self.assertEqual(len(forms), 900)
+        self.assertEqual(test_dict.find_forms("accusative", "masculine", limit=3), forms[:3])
+        for form, infinitive, _ in forms:
+            self.assertIn(form, test_dict.get_form(infinitive, "accusative", "masculine"))
+
+    def test_complete(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        self.assertEqual(test_dict.complete("Gdańsk", 3)[1:], [("Gdańska", "Gdańsk", "AA", []),
+                                                              ("Gdański", "Gdańsk", "AA", [])])
+        self.assertEqual(test_dict.complete("ra", 2, lemmas_only=True), [("rak", "rak", "AA", []),
+                                                                        ("raki", "raki", "AA", [])])
+        self.assertEqual(test_dict.complete("Gdańskowie"), [])
+
+    def test_find_similar(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        self.assertEqual(test_dict.find_similar("raky", limit=4)[1:],
+                         [("raka", 1, "rak", "AA", []), ("raki", 1, "rak", "AA", ["raki"]),
+                          ("raku", 1, "rak", "AA", [])])
+        self.assertEqual(test_dict.find_similar("raki", 0), [("raki", 0, "rak", "AA", ["raki"])])
+
+        words = list(test_dict.trie.iterkeys())
+        for word in ["Gdańszka", "rkai", "Amstredamie"]:
+            expected = sorted((form, search.distance(form, word)) for form in words
+                              if search.distance(form, word) <= 2)
+            self.assertEqual([result[:2] for result in test_dict.find_similar(word, 2, len(words))],
+                             sorted(expected, key=lambda result: (result[1], result[0])))
+
+    def test_result_cache(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"], cache_size=2)
+        parent = test_dict.get_parent("Gdańska")
+        parent[2].append("modified")
+        self.assertEqual(test_dict.get_parent("Gdańska"), ("Gdańsk", "AA", []))
+        test_dict.get_children("Gdańsk")
+        test_dict.get_children("nur")
+        self.assertEqual(test_dict.cache_stats()["hits"], 1)
+        self.assertEqual(test_dict.cache_stats()["misses"], 3)
+        self.assertEqual(test_dict.cache_stats()["evictions"], 1)
+
+    def test_result_cache_invalidation(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"], cache_size=100)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "synonyms.txt")
+            with open(filename, "w", encoding="utf8") as f:
+                f.write("nowożeniec:AA:Amsterdam:\n")
+            with self.assertRaises(exceptions.Relationship_not_found):
+                test_dict.get_word_by_relationship("synonym", "nowożeniec")
+            test_dict.add_generic_relationship(filename, "synonym")
+            test_dict.add_generic_relationship(filename, "synonym2")
+
+        self.assertEqual(test_dict.get_word_by_relationship("synonym", "nowożeniec")[0], "Amsterdam")
+        self.assertEqual(test_dict.cache_stats()["invalidations"], 2)
+
+    def test_metrics(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"], instrument=True)
+        self.assertEqual(set(test_dict.metrics_stats()["build_phases"]), {"parse", "graph", "tries"})
+        test_dict.get_parent("Gdańska")
+        test_dict.get_parent("Gdańska")
+        children = test_dict.get_children("Gdańsk")
+        self.assertEqual(test_dict.metrics_stats()["steps"]["decode"]["items"], 2 + len(children))
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "multisegmented.txt")
+            with open(filename, "w", encoding="utf8") as f:
+                f.write("Gdańsk Amsterdam;**;;;\n")
+            test_dict.add_multisegmented([filename])
+        test_dict.get_parent_multisegmented("Gdańska Amsterdamu")
+
+        stats = test_dict.metrics_stats()
+        self.assertEqual(stats["calls"]["get_parent"]["count"], 2)
+        self.assertEqual(stats["calls"]["get_parent"]["buckets"][-1], ["+Inf", 2])
+        self.assertEqual(stats["multisegment_candidates"]["get_parent_multisegmented"]["count"], 1)
+        text = test_dict.metrics_text()
+        self.assertIn('dictionary_call_seconds_count{method="get_parent"} 2\n', text)
+        self.assertIn('dictionary_step_calls_total{step="trie_lookup"}', text)
+        self.assertIn('dictionary_build_phase_seconds{phase="tries"}', text)
+
+        test_dict.disable_metrics()
+        test_dict.get_parent("Gdańska")
+        self.assertIsNone(test_dict.metrics_stats())
+        self.assertIsNone(dictionary.Dictionary(["test_data/test_file.txt"]).metrics_text())
+
+    def test_relationship_with_missing_word(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "synonyms.txt")
+            with open(filename, "w", encoding="utf8") as f:
+                f.write("nowożeniec:AA:Amsterdam:\n\nGdańsk:AA:Gdynia:\n")
+            with self.assertRaises(exceptions.Key_Missing):
+                test_dict.add_generic_relationship(filename, "synonym")
+        self.assertEqual(test_dict.get_all_relationships(), [])
+        self.assertEqual(test_dict.word_graph.relationships, {})
+
     def test_get_all_relationships(self):
         test_dict = dictionary.Dictionary(["test_data/pospolite.txt"])
         test_dict.add_gradation_relationship("test_data/adj.txt")
@@ -44,6 +222,61 @@ class DictionaryTests(unittest.TestCase):
                          ['albo Argusa', 'albo Argusowi', 'albo Argusa', 'albo Argusem', 'albo Argusie',
                           'albo Argusie'])
 
+    def test_children_multisegmented_agree(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "basic.txt")
+            with open(filename, "w", encoding="utf8") as f:
+                f.write(synthetic.paradigm_line("now", "C"))
+                f.write(synthetic.paradigm_line("dom", "AA").replace(":domy:", ":#:", 1))
+            multisegmented_file = os.path.join(directory, "multisegmented.txt")
+            with open(multisegmented_file, "w", encoding="utf8") as f:
+                f.write("nowy dom;**;;;\n")
+            test_dict = dictionary.Dictionary([filename])
+            test_dict.add_multisegmented([multisegmented_file])
+
+        self.assertEqual(test_dict.get_children_multisegmented("nowy dom"),
+                         ["nowemu doma", "nowego domów", "nowym domowi", "nowym domom", "nowy doma"])
+
+    def test_wide_id_format(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "synthetic.txt")
+            forms_count = synthetic.create_synthetic_file(filename, 5000)
+            test_dict = dictionary.Dictionary([filename])
+
+        self.assertGreater(forms_count, 65536)
+        self.assertEqual(test_dict.id_format, "<I")
+        last_line = synthetic.synthetic_line(4999).split(":")
+        self.assertEqual(test_dict.get_parent(last_line[-2])[0], last_line[0].strip())
+        self.assertEqual(test_dict.get_children(last_line[0].strip()), last_line[3:-1])
+
+    def test_id_format_too_narrow(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "synthetic.txt")
+            synthetic.create_synthetic_file(filename, 5000)
+            with self.assertRaises(OverflowError):
+                dictionary.Dictionary([filename], id_format="<H")
+
+    def test_select_id_format(self):
+        self.assertEqual(dictionary.select_id_format(900), "<H")
+        self.assertEqual(dictionary.select_id_format(65535), "<H")
+        self.assertEqual(dictionary.select_id_format(65536), "<I")
+
+    def test_build_tries_id_format_boundary(self):
+        keys = ["w{}".format(index) for index in range(65536)]
+        id_format, trie, key_ids, form_offsets, form_ids = dictionary.build_tries(keys)
+        self.assertEqual(id_format, "<I")
+        self.assertEqual(form_offsets[-1], 65536)
+        self.assertEqual(form_ids[form_offsets[trie.key_id("w65535")]], 65535)
+        self.assertEqual(dictionary.build_tries(keys[:-1])[0], "<H")
+        self.assertRaises(OverflowError, dictionary.build_tries, keys, "<H")
+
+    def test_parse_line(self):
+        self.assertEqual(dictionary.parse_line("pies :  *ABABAB:pies:psa:psu:#:\n"),
+                         ("pies", "*ABABAB", ["psa", "psu", "#"]))
+        adjective = "biały :  CA:" + ":".join("f{}".format(index) for index in range(20)) + ":\n"
+        self.assertEqual(dictionary.parse_line(adjective)[2], ["f1", "f2", "f3", "f4", "f5", "f6", "f14", "f15",
+                                                               "f16", "f17"])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,58 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from src.dict import dictionary
+from src.dict import export
+from src.test import synthetic
+
+
+class ExportTests(unittest.TestCase):
+    def test_dump_builds_same_dictionary(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = synthetic.create_corpus(directory, 5000)
+            test_dict = dictionary.Dictionary([corpus["basic_file"]])
+            dumped_file = os.path.join(directory, "dumped.txt")
+            with open(dumped_file, "w", encoding="utf8") as f:
+                self.assertEqual(test_dict.dump(f), corpus["lexemes"])
+
+            dumped_dict = dictionary.Dictionary([dumped_file])
+            self.assertEqual(dumped_dict, test_dict)
+            rows, dumped_rows = io.StringIO(), io.StringIO()
+            test_dict.dump(rows, "tsv")
+            dumped_dict.dump(dumped_rows, "tsv")
+            self.assertEqual(dumped_rows.getvalue(), rows.getvalue())
+            self.assertEqual(rows.getvalue().count("\n"), corpus["forms"])
+            self.assertRaises(ValueError, test_dict.dump, io.StringIO(), "xml")
+
+    def test_dump_relationships_and_overlay(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = synthetic.create_corpus(directory, 5000)
+            test_dict = dictionary.Dictionary([corpus["basic_file"]])
+            test_dict.add_gradation_relationship(corpus["gradation_file"])
+            test_dict.update_lexeme(synthetic.paradigm_line("nowy", "AD"))
+            test_dict.remove_lexeme(corpus["lemmas_sample"][0])
+
+            output = io.StringIO()
+            test_dict.dump(output, "jsonl")
+            lexemes = [json.loads(line) for line in output.getvalue().splitlines()]
+            self.assertEqual(lexemes[-1]["lemma"], "nowya")
+            self.assertEqual(lexemes[-1]["forms"][1], {"form": "nowyy", "gender": "masculine", "case": "instrumental"})
+            self.assertNotIn(corpus["lemmas_sample"][0], [lexeme["lemma"] for lexeme in lexemes])
+
+            highest = corpus["relationship_sample"][0]
+            equal = test_dict.get_word_by_relationship("hst", highest)[0]
+            forms = [form for lexeme in lexemes if lexeme["lemma"] == equal for form in lexeme["forms"]]
+            self.assertEqual(forms[0]["relationships"]["hst"], [highest])
+
+            test_dict.save(os.path.join(directory, "dictionary"))
+            exported_file = os.path.join(directory, "paradigms.jsonl")
+            export.main([os.path.join(directory, "dictionary"), "--format", "jsonl", "--output", exported_file])
+            with open(exported_file, encoding="utf8") as f:
+                self.assertEqual(f.read(), output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
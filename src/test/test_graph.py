@@ -0,0 +1,139 @@
+import array
+import itertools
+import os
+import pickle
+import random
+import tempfile
+import unittest
+
+from src.dict import dictionary
+from src.dict.subclasses import graph
+from src.test import synthetic
+
+
+class CompactGraphTests(unittest.TestCase):
+    def test_same_interface_as_graph(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        compact_graph = test_dict.word_graph
+        object_graph = compact_graph.to_graph()
+        for index in object_graph.nodes:
+            self.assertEqual(compact_graph.get_parent(index), object_graph.get_parent(index))
+            self.assertEqual(compact_graph.get_children(index), object_graph.get_children(index))
+            self.assertEqual(compact_graph.get_label(index), object_graph.get_label(index))
+            self.assertEqual(compact_graph.has_gender(index), object_graph.has_gender(index))
+            self.assertEqual(compact_graph.get_inflection(index), object_graph.get_inflection(index))
+            self.assertEqual(compact_graph.get_gender_parent(index), object_graph.get_gender_parent(index))
+            self.assertEqual(compact_graph.get_gender_children(index), object_graph.get_gender_children(index))
+
+    def test_vertices_with_inflection(self):
+        compact_graph = dictionary.Dictionary(["test_data/test_file.txt"]).word_graph
+        for gender, case in [(graph.Genders.FEMININE, graph.Cases.GENITIVE), (None, graph.Cases.VOCATIVE),
+                             (graph.Genders.MASCULINE, None)]:
+            expected = sorted(index for index in range(compact_graph.size) if compact_graph.has_gender(index)
+                              and gender in [None, compact_graph.get_inflection(index)[0]]
+                              and case in [None, compact_graph.get_inflection(index)[1]])
+            self.assertEqual(sorted(compact_graph.get_vertices_with_inflection(gender, case)), expected)
+
+        buffers, meta = compact_graph.to_buffers()
+        stored_graph = graph.TemplateGraph.from_buffers(buffers, meta)
+        self.assertEqual(list(stored_graph.get_vertices_with_inflection(None, graph.Cases.DATIVE)),
+                         list(compact_graph.get_vertices_with_inflection(None, graph.Cases.DATIVE)))
+
+    def test_edges_added_after_finalize(self):
+        compact_graph = graph.CompactGraph(4)
+        for index in range(4):
+            compact_graph.add_vertex(index, "B" if index == 0 else None)
+        compact_graph.add_edge(0, 2)
+        self.assertEqual(compact_graph.get_children(0), [2])
+        compact_graph.add_edge(0, 1)
+        compact_graph.add_edge(3, 0)
+        self.assertEqual(compact_graph.get_children(0), [2, 1])
+        self.assertEqual(compact_graph.get_children(3), [0])
+        self.assertIsNone(compact_graph.get_children(1))
+
+    def test_memory_footprint(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        compact_graph = test_dict.word_graph
+        object_graph = compact_graph.to_graph()
+        self.assertLess(compact_graph.memory_footprint() * 4, object_graph.memory_footprint())
+        converted = graph.CompactGraph.from_graph(object_graph, compact_graph.size)
+        self.assertEqual(converted.parents, compact_graph.to_compact().parents)
+        self.assertEqual(converted.inflections, compact_graph.to_compact().inflections)
+
+    def test_templates_same_as_compact_graph(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = synthetic.create_corpus(directory, 20000)
+            lexemes, template_graph = dictionary.read_basic_files([corpus["basic_file"]])
+            compact_graph = template_graph.to_compact()
+            self.assertLess(template_graph.memory_footprint() * 4, compact_graph.memory_footprint())
+            for index in range(template_graph.size):
+                self.assertEqual(template_graph.get_parent(index), compact_graph.get_parent(index))
+                self.assertEqual(template_graph.get_children(index), compact_graph.get_children(index))
+                self.assertEqual(template_graph.get_label(index), compact_graph.get_label(index))
+                self.assertEqual(template_graph.has_gender(index), compact_graph.has_gender(index))
+                self.assertEqual(template_graph.get_inflection(index), compact_graph.get_inflection(index))
+                self.assertEqual(template_graph.get_gender_parent(index), compact_graph.get_gender_parent(index))
+                self.assertEqual(template_graph.get_gender_children(index), compact_graph.get_gender_children(index))
+                offset, children = template_graph.get_gender_children_by_inflection(index)
+                if children is not None:
+                    children = {inflection: [offset + child for child in positions]
+                                for inflection, positions in children.items()}
+                self.assertEqual(children, compact_graph.get_gender_children_by_inflection(index)[1])
+            self.assertEqual(list(template_graph.get_vertices_with_inflection(graph.Genders.NEUTER)),
+                             list(compact_graph.get_vertices_with_inflection(graph.Genders.NEUTER)))
+
+            lexeme_slots = {(lexemes.labels[label_id], tuple(lexemes.slots[lexem_id + 1:lexem_id + size]))
+                            for lexem_id, label_id, size in zip(itertools.accumulate([0] + list(lexemes.sizes)),
+                                                                lexemes.label_ids, lexemes.sizes)}
+            self.assertEqual(len(template_graph.templates), len(lexeme_slots))
+
+            buffers, meta = template_graph.to_buffers()
+            stored_graph = graph.TemplateGraph.from_buffers(buffers, meta)
+            self.assertEqual(list(stored_graph.lexemes()), list(template_graph.lexemes()))
+            self.assertEqual(stored_graph.to_buffers(), (buffers, meta))
+            unpickled_graph = pickle.loads(pickle.dumps(stored_graph))
+            self.assertEqual(unpickled_graph.get_children(0), template_graph.get_children(0))
+
+    def test_bulk_relationship_edges(self):
+        random.seed(0)
+        edges = [(random.randrange(50), random.randrange(50)) for _ in range(300)]
+        single_graph = graph.CompactGraph(50)
+        bulk_graph = graph.CompactGraph(50)
+        for first, second in [(0, 100), (100, 300)]:
+            for from_v, to_v in edges[first:second]:
+                single_graph.add_relationship_edge(from_v, to_v, 1)
+            bulk_graph.add_relationship_edges(1, array.array("q", [edge[0] for edge in edges[first:second]]),
+                                              array.array("q", [edge[1] for edge in edges[first:second]]))
+
+            relationship = bulk_graph.relationships[1]
+            self.assertIsInstance(relationship, graph.ArrayGraph.relationship_index)
+            self.assertEqual(dict(relationship), single_graph.relationships[1])
+            self.assertIsNone(relationship.get(50))
+        self.assertEqual(dict(pickle.loads(pickle.dumps(relationship))), single_graph.relationships[1])
+        self.assertLess(bulk_graph.memory_footprint(), single_graph.memory_footprint())
+
+    def test_stored_relationships(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = synthetic.create_corpus(directory, 20000)
+            test_dict = dictionary.Dictionary([corpus["basic_file"]])
+            test_dict.add_gradation_relationship(corpus["gradation_file"])
+            test_dict.save(os.path.join(directory, "stored"))
+            opened_dict = dictionary.Dictionary.open(os.path.join(directory, "stored"))
+
+            relationships = opened_dict.word_graph.relationships
+            self.assertIsInstance(relationships[opened_dict.lexical_relationships["hr"]],
+                                  graph.ArrayGraph.relationship_index)
+            self.assertEqual({relationship_id: dict(vertices) for relationship_id, vertices in relationships.items()},
+                             test_dict.word_graph.relationships)
+            for word in corpus["relationship_sample"]:
+                self.assertEqual(opened_dict.get_word_by_relationship("hst", word),
+                                 test_dict.get_word_by_relationship("hst", word))
+
+            test_dict.add_gradation_relationship(corpus["gradation_file"])
+            opened_dict.add_gradation_relationship(corpus["gradation_file"])
+            self.assertEqual(relationships, test_dict.word_graph.relationships)
+            del opened_dict, relationships
+
+
+if __name__ == '__main__':
+    unittest.main()
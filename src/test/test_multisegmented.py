@@ -0,0 +1,106 @@
+import itertools
+import os
+import pickle
+import random
+import tempfile
+import unittest
+
+from src.dict import dictionary
+from src.dict.subclasses import exceptions
+from src.dict.subclasses import multisegmented
+from src.test import synthetic
+
+
+class MultisegmentedTests(unittest.TestCase):
+    def test_find_multisegmented_same_as_product(self):
+        random.seed(0)
+        module = multisegmented.multisegmented_module()
+        for _ in range(200):
+            ids = tuple(random.randrange(20) for _ in range(random.randint(1, 4)))
+            module.add_multisegmented(ids, [False] * len(ids), None)
+        module.build()
+
+        for _ in range(500):
+            possible_ids_list = [{random.randrange(20) for _ in range(random.randint(1, 6))}
+                                 for _ in range(random.randint(1, 4))]
+            expected = next((combination for combination in itertools.product(*possible_ids_list)
+                             if module.is_multisegmented(combination)), None)
+            self.assertEqual(module.find_multisegmented(possible_ids_list), expected)
+
+    def test_find_interchangeable(self):
+        module = multisegmented.multisegmented_module()
+        module.add_multisegmented((1, 2, 3), [True, False, False], [2, 3])
+        self.assertIsNone(module.find_multisegmented([{1}, {2}, {3}]))
+        module.build()
+        self.assertEqual(module.find_multisegmented([{1}, {3, 7}, {None, 2}]), (1, 3, 2))
+        self.assertEqual(module.get_multitsegmented_info((1, 3, 2)), [[True, False, False], [2, 3]])
+        self.assertIsNone(module.find_multisegmented([{1}, {3}]))
+
+    def test_first_info_wins(self):
+        module = multisegmented.multisegmented_module()
+        module.add_multisegmented((1, 2), [True, False], None)
+        module.add_multisegmented_many([((1, 2), [False, True], None), ((4, 5), [False, False], None)])
+        module.build()
+        self.assertEqual(module.get_multitsegmented_info((1, 2)), [[True, False], None])
+        module.add_multisegmented((4, 5), [True, True], None)
+        module.build()
+        self.assertEqual(module.get_multitsegmented_info((4, 5)), [[False, False], None])
+        self.assertEqual(len(module.infos), 2)
+
+    def test_get_parent_multisegmented(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "multisegmented.txt")
+            with open(filename, "w", encoding="utf8") as f:
+                f.write("Gdańsk Amsterdam;**;;;\n")
+            test_dict.add_multisegmented([filename])
+
+        self.assertEqual(test_dict.get_parent_multisegmented("Gdańska Amsterdamu"),
+                         ("Gdańsk Amsterdam", [[False, False], None]))
+        self.assertIsNone(test_dict.get_parent_multisegmented("Amsterdamu Gdańska"))
+
+    def test_save_open_multisegmented(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = synthetic.create_corpus(directory, 20000)
+            test_dict = dictionary.Dictionary([corpus["basic_file"]])
+            test_dict.add_multisegmented([corpus["multisegmented_file"]])
+            stored_directory = os.path.join(directory, "dictionary")
+            test_dict.save(stored_directory)
+            opened_dict = dictionary.Dictionary.open(stored_directory)
+            self.assertEqual(list(opened_dict.multisegmented.entries()), list(test_dict.multisegmented.entries()))
+            for phrase in corpus["multisegmented_sample"]:
+                self.assertEqual(opened_dict.get_parent_multisegmented(phrase),
+                                 test_dict.get_parent_multisegmented(phrase))
+            self.assertEqual(opened_dict.get_multisegmented_starts(), test_dict.get_multisegmented_starts())
+
+            unpickled = pickle.loads(pickle.dumps(opened_dict.multisegmented))
+            self.assertEqual(list(unpickled.entries()), list(test_dict.multisegmented.entries()))
+            del opened_dict
+
+    def test_add_multisegmented_stable_segments(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "basic.txt")
+            with open(filename, "w", encoding="utf8") as f:
+                f.write(synthetic.paradigm_line("now", "C") + synthetic.paradigm_line("pis", "B"))
+            test_dict = dictionary.Dictionary([filename])
+            multisegmented_file = os.path.join(directory, "multisegmented.txt")
+            with open(multisegmented_file, "w", encoding="utf8") as f:
+                f.write("nowy pisać;*-;;;\n")
+            test_dict.add_multisegmented([multisegmented_file])
+            self.assertEqual(test_dict.get_parent_multisegmented("nowego pisać"),
+                             ("nowy pisać", [[False, True], None]))
+
+            with open(multisegmented_file, "w", encoding="utf8") as f:
+                f.write("pisać nowy;-*;;;\n\nnowy pisać;**;;;\n")
+            with self.assertRaises(exceptions.Key_Missing):
+                test_dict.add_multisegmented([multisegmented_file])
+            with open(multisegmented_file, "w", encoding="utf8") as f:
+                f.write("pisać nowy;-*;;;\nnowy;;;;\n")
+            with self.assertRaises(exceptions.Parse_error) as context:
+                test_dict.add_multisegmented([multisegmented_file])
+            self.assertEqual(context.exception.line_number, 2)
+            self.assertEqual(len(list(test_dict.multisegmented.entries())), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import random
+import tempfile
+import threading
+import unittest
+
+from src.dict import dictionary
+from src.dict.subclasses import exceptions
+from src.test import synthetic
+
+NEW_LINE = "Gdynia :  AD:Gdynia:Gdynie:Gdyni:Gdyń:Gdyni:Gdyniom:Gdynię:Gdynie:Gdynią:Gdyniami:Gdyni:Gdyniach:Gdynio:Gdynie:\n"
+
+
+
+def queries(test_dict, corpus):
+    results = []
+    for query, words in [(test_dict.get_parent, corpus["forms_sample"]),
+                         (test_dict.get_children, corpus["lemmas_sample"]),
+                         (lambda word: test_dict.get_word_by_relationship("hst", word), corpus["relationship_sample"]),
+                         (test_dict.get_parent_multisegmented, corpus["multisegmented_sample"])]:
+        for word in words:
+            try:
+                results.append(query(word))
+            except exceptions.Key_Missing:
+                results.append("missing")
+    return results
+
+
+class OverlayTests(unittest.TestCase):
+    def test_add_lexeme(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"], cache_size=10)
+        self.assertEqual(test_dict.get_parent("Gdańska"), ("Gdańsk", "AA", []))
+        test_dict.add_lexeme(NEW_LINE)
+        test_dict.add_lexeme("Gdańsk :  B:Gdańsk:Gdańska:\n")
+
+        self.assertEqual(test_dict.get_parent("Gdyni"), ("Gdynia", "AD", []))
+        self.assertEqual(test_dict.get_children("Gdynia"), dictionary.parse_line(NEW_LINE)[2])
+        self.assertEqual(test_dict.get_parent("Gdańska"), ("Gdańsk", "AA", ["Gdańsk"]))
+        self.assertEqual(test_dict.get_parent_many(["Gdyniach", "xyz"]), [("Gdynia", "AD", []), (None, None, None)])
+
+    def test_remove_and_update_lexeme(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        test_dict.remove_lexeme("Gdańsk", "AA")
+        with self.assertRaises(exceptions.Key_Missing):
+            test_dict.get_parent("Gdańska")
+        with self.assertRaises(exceptions.Key_Missing):
+            test_dict.remove_lexeme("Gdańsk")
+
+        test_dict.update_lexeme(NEW_LINE)
+        test_dict.update_lexeme(NEW_LINE.replace("Gdynio:", "Gdynia:"))
+        self.assertEqual(test_dict.get_children("Gdynia")[-2], "Gdynia")
+        with self.assertRaises(exceptions.Key_Missing):
+            test_dict.get_parent("Gdynio")
+        test_dict.remove_lexeme("Gdynia")
+        with self.assertRaises(exceptions.Key_Missing):
+            test_dict.get_children("Gdynia")
+
+    def test_search_overlay(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        test_dict.add_lexeme(NEW_LINE)
+        test_dict.remove_lexeme("Gdańsk", "AA")
+        self.assertEqual(test_dict.complete("Gd", 2), [("Gdyń", "Gdynia", "AD", []), ("Gdyni", "Gdynia", "AD", [])])
+        self.assertEqual(test_dict.find_similar("Gdyniaxh"), [("Gdyniach", 1, "Gdynia", "AD", [])])
+        self.assertEqual(test_dict.find_similar("Gdańska"), [])
+
+    def test_tags_overlay(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        test_dict.add_lexeme(NEW_LINE)
+        test_dict.remove_lexeme("Gdańsk", "AA")
+        self.assertEqual(test_dict.get_form("Gdynia", "accusative", "masculine"), ["Gdyni"])
+        forms = test_dict.find_forms("accusative", "masculine")
+        self.assertEqual(forms[-1], ("Gdyni", "Gdynia", "AD"))
+        self.assertNotIn(("Gdańska", "Gdańsk", "AA"), forms)
+
+    def test_pinned_paradigms_follow_changes(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        test_dict.pin_paradigms(["Gdańsk", "rak"])
+        test_dict.update_lexeme("Gdańsk :  AA:Gdańsk:Gdańska:\n")
+        self.assertEqual(test_dict.get_children("Gdańsk"), ["Gdańska"])
+        test_dict.compact()
+        self.assertEqual(len(test_dict.paradigms), 2)
+        self.assertEqual(test_dict.get_children("Gdańsk"), ["Gdańska"])
+
+    def test_pin_paradigms_during_compact(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        test_dict.pin_paradigms(["rak"])
+        test_dict.add_lexeme(NEW_LINE)
+        build_compacted = test_dict.__build_compacted__
+
+        def pin_during_build(*args):
+            test_dict.pin_paradigms(["Gdańsk"])
+            return build_compacted(*args)
+
+        test_dict.__build_compacted__ = pin_during_build
+        test_dict.compact()
+        self.assertIsNone(test_dict.overlay)
+        self.assertEqual(sorted(test_dict.paradigms.words()), ["Gdańsk", "rak"])
+        self.assertEqual(test_dict.get_children("Gdańsk"), dictionary.Dictionary(["test_data/test_file.txt"])
+                         .get_children("Gdańsk"))
+
+    def test_compact_same_as_rebuild(self):
+        random.seed(0)
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = synthetic.create_corpus(directory, 5000)
+            with open(corpus["basic_file"], encoding="utf8") as f:
+                lines = f.readlines()
+            test_dict = dictionary.Dictionary([corpus["basic_file"]])
+            test_dict.add_gradation_relationship(corpus["gradation_file"])
+            test_dict.add_multisegmented([corpus["multisegmented_file"]])
+
+            added = [synthetic.paradigm_line("nowy" + synthetic.synthetic_stem(number).lower(), label)
+                     for number, label in enumerate(["AA", "*C", "B", "C", "F", "AD"])]
+            removed = random.sample(lines, 10)
+            for line in removed:
+                test_dict.remove_lexeme(line.split(":")[0].strip(), line.split(":")[1].strip())
+            for line in added:
+                test_dict.add_lexeme(line)
+            expected = queries(test_dict, corpus)
+            test_dict.compact()
+            self.assertIsNone(test_dict.overlay)
+
+            edited_file = os.path.join(directory, "edited.txt")
+            with open(edited_file, "w", encoding="utf8") as f:
+                f.writelines([line for line in lines if line not in removed] + added)
+            rebuilt = dictionary.Dictionary([edited_file])
+            self.assertEqual(test_dict, rebuilt)
+            buffers = test_dict.word_graph.to_buffers()[0]
+            self.assertEqual({name: buffer for name, buffer in buffers.items() if "relationships" not in name},
+                             rebuilt.word_graph.to_buffers()[0])
+            self.assertEqual(queries(test_dict, corpus), expected)
+
+    def test_compact_in_background(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = synthetic.create_corpus(directory, 20000)
+            test_dict = dictionary.Dictionary([corpus["basic_file"]])
+            test_dict.add_gradation_relationship(corpus["gradation_file"])
+            test_dict.add_lexeme(NEW_LINE)
+            expected = queries(test_dict, corpus)
+
+            compaction = threading.Thread(target=test_dict.compact)
+            compaction.start()
+            while compaction.is_alive():
+                self.assertEqual(queries(test_dict, corpus), expected)
+                self.assertEqual(test_dict.get_parent("Gdyni"), ("Gdynia", "AD", []))
+            compaction.join()
+            self.assertIsNone(test_dict.overlay)
+            self.assertEqual(queries(test_dict, corpus), expected)
+
+    def test_save_compacts(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        with tempfile.TemporaryDirectory() as directory:
+            test_dict.save(directory)
+            opened_dict = dictionary.Dictionary.open(directory)
+            opened_dict.add_lexeme(NEW_LINE)
+            opened_dict.remove_lexeme("Gdańsk")
+            opened_dict.save(os.path.join(directory, "updated"))
+            updated_dict = dictionary.Dictionary.open(os.path.join(directory, "updated"))
+            self.assertEqual(updated_dict.get_parent("Gdyni"), ("Gdynia", "AD", []))
+            self.assertFalse("Gdańska" in updated_dict.trie)
+            del opened_dict, updated_dict
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+from src.dict import dictionary
+from src.dict.subclasses import exceptions
+from src.dict.subclasses import parser
+
+BAD_LINES = [
+    "pies :  AB:pies:psa:\n",
+    "zły\n",
+    "\n",
+    "kot :  ab:kot:kota:\n",
+    " :  AB:kot:kota:\n",
+    "kot :  AB:kot:kota\n",
+    "kot :  AB:kot:" + "kota:" * 40 + "\n",
+]
+
+
+class ParserTests(unittest.TestCase):
+    def test_parse_line_whitespace(self):
+        self.assertEqual(parser.parse_line("pies :  AB:pies:psa:psu:\n"), ("pies", "AB", ["psa", "psu"]))
+        self.assertEqual(parser.parse_line("pies :  AB:pies: psa :psu\t:\r\n"), ("pies", "AB", ["psa", "psu"]))
+        self.assertEqual(parser.parse_line("pies:AB:pies:psa\x0c:\u3000psu:\n"), ("pies", "AB", ["psa", "psu"]))
+        self.assertEqual(parser.parse_line("pies:AB:pies:psa:psu: \n"), ("pies", "AB", ["psa", "psu"]))
+
+    def test_parse_line_errors(self):
+        for line in BAD_LINES[1:2] + BAD_LINES[3:]:
+            with self.assertRaises(exceptions.Parse_error):
+                parser.parse_line(line)
+
+    def test_parse_multisegmented_line(self):
+        self.assertEqual(parser.parse_multisegmented_line("# Nowy  Dom **;*-;;;\n"),
+                         (["Nowy", "Dom"], [False, True], None))
+        self.assertEqual(parser.parse_multisegmented_line("Nowy Dom;**;;21;\n"),
+                         (["Nowy", "Dom"], [False, False], [2, 1]))
+        for line in ["Nowy Dom;**;;\n", "Nowy Dom;*;;;\n", "Nowy Dom;**;;13;\n", " ;;;;\n"]:
+            with self.assertRaises(exceptions.Parse_error):
+                parser.parse_multisegmented_line(line)
+
+    def test_validate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "basic.txt")
+            with open(filename, "wb") as f:
+                f.write("".join(BAD_LINES).encode("utf8") + b"\xff:AB:\n")
+            diagnostics = parser.validate([filename, os.path.join(directory, "missing.txt")])
+            self.assertEqual([diagnostic.line_number for diagnostic in diagnostics], [2, 4, 5, 6, 7, 8, None])
+            self.assertEqual(parser.format_diagnostic(diagnostics[1]),
+                             "{}:4: invalid flexographic label 'ab'".format(filename))
+            self.assertEqual(len(dictionary.Dictionary.validate([filename], max_errors=2)), 2)
+            self.assertEqual(parser.validate(["test_data/test_file.txt"]), [])
+
+    def test_line_breaks_as_in_build(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "basic.txt")
+            with open(filename, "w", encoding="utf8", newline="") as f:
+                f.write("pies :  AB:pies:psa:\r\nkot :  AB:kot:kota:\x85zły\rkot :  AB:kot:kota:\u2028"
+                        + BAD_LINES[0] * 300 + "zły\n")
+            self.assertEqual([diagnostic.line_number for diagnostic in parser.validate([filename])], [3, 305])
+            with self.assertRaises(exceptions.Parse_error) as context:
+                dictionary.read_basic_files([filename])
+            self.assertEqual(context.exception.line_number, 3)
+
+            with open(filename, "w", encoding="utf8", newline="") as f:
+                f.write((BAD_LINES[0].replace("\n", "\r\n") + "kot :  AB:kot:kota:\x85") * 300 + "zły\u2028")
+            self.assertEqual(parser.validate([filename]),
+                             [(filename, 601, "expected <infinitive>:<label>:<derivatives>:, found 0 colons")])
+            for workers in [None, 2]:
+                with self.assertRaises(exceptions.Parse_error) as context:
+                    dictionary.read_basic_files([filename], workers, shard_size=1000)
+                self.assertEqual(context.exception.line_number, 601)
+
+    def test_build_reports_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "basic.txt")
+            with open(filename, "w", encoding="utf8") as f:
+                f.write("".join(BAD_LINES[:1] * 300 + BAD_LINES[1:2]))
+            for workers in [None, 2]:
+                with self.assertRaises(exceptions.Parse_error) as context:
+                    dictionary.read_basic_files([filename], workers, shard_size=1000)
+                self.assertEqual((context.exception.file, context.exception.line_number), (filename, 301))
+
+
+if __name__ == '__main__':
+    unittest.main()
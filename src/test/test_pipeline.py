@@ -0,0 +1,57 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from src.dict import dictionary
+from src.dict import pipeline
+from src.test import synthetic
+
+
+class PipelineTests(unittest.TestCase):
+    def test_tokenize(self):
+        chunks = list(pipeline.read_chunks("test_data/test_file.txt", chunk_size=100))
+        with open("test_data/test_file.txt", encoding="utf8") as f:
+            self.assertEqual("".join(chunks), f.read())
+        self.assertEqual(list(pipeline.tokenize(["Ala ma 2 biało-czerwone ", "koty."])),
+                         ["Ala", "ma", "biało-czerwone", "koty"])
+
+    def test_lemmatize(self):
+        test_dict = dictionary.Dictionary(["test_data/test_file.txt"])
+        lemmatizer = pipeline.Lemmatizer(test_dict, batch_size=2)
+        self.assertEqual(list(lemmatizer.lemmatize_text(["Raki Gdańska, ", "Gdańsk xyz."])),
+                         [("Raki", "rak", "AA", ["raki"]), ("Gdańska", "Gdańsk", "AA", []),
+                          ("Gdańsk", "Gdańsk", "AA", []), ("xyz", None, None, None)])
+        self.assertEqual(lemmatizer.stats()["tokens"], 4)
+        self.assertEqual(lemmatizer.stats()["unknown"], 1)
+
+    def test_multisegments_and_workers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = synthetic.create_corpus(directory, 5000)
+            test_dict = dictionary.Dictionary([corpus["basic_file"]])
+            test_dict.add_multisegmented([corpus["multisegmented_file"]])
+            phrase = corpus["multisegmented_sample"][0]
+            text = os.path.join(directory, "text.txt")
+            with open(text, "w", encoding="utf8") as f:
+                f.write(("ma " + phrase + ", " + corpus["forms_sample"][0] + "\n") * 50)
+
+            output = io.StringIO()
+            stats = pipeline.Lemmatizer(test_dict, batch_size=3).write(text, output, "jsonl")
+            records = [json.loads(line) for line in output.getvalue().splitlines()]
+            self.assertEqual(records[1], {"token": phrase, "lemma": test_dict.get_parent_multisegmented(phrase)[0],
+                                          "label": pipeline.MULTISEGMENT_LABEL, "ambiguity": []})
+            self.assertEqual(len(records), 150)
+            self.assertEqual(stats["multisegments"], 50)
+            self.assertEqual(stats["tokens"], 200)
+
+            test_dict.save(os.path.join(directory, "dictionary"))
+            parallel_output = io.StringIO()
+            lemmatizer = pipeline.Lemmatizer(os.path.join(directory, "dictionary"), workers=2, chunk_size=64)
+            lemmatizer.write(text, parallel_output, "jsonl")
+            self.assertEqual(parallel_output.getvalue(), output.getvalue())
+            self.assertEqual(lemmatizer.stats()["multisegments"], 50)
+
+
+if __name__ == '__main__':
+    unittest.main()